@@ -1,76 +1,79 @@
+import os
+import sys
+import json
 import streamlit as st
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.charts import DEFAULT_MAX_POINTS
+from src.dashboard_data import NEWS_FILE, STOCK_PATTERN, DashboardData, find_stock_files, load_daily_aggregates
+from src.indicator_cache import file_fingerprint
 
 # Page config
-st.set_page_config(page_title="Solar Dashboard", layout="wide")
+st.set_page_config(page_title="News Sentiment Dashboard", layout="wide")
 
 # Title
-st.title("☀️ Solar Irradiance Dashboard")
-st.markdown("Compare GHI across West African countries and view regional insights.")
-
-# Sidebar country selection
-countries = {
-    "Ghana": r"C:\Users\soswo\OneDrive\Desktop\projects\solar-challenge-week1\data\processed\Ghana_clean.csv",
-    "Benin": r"C:\Users\soswo\OneDrive\Desktop\projects\solar-challenge-week1\data\processed\Benin_clean.csv",
-    "Liberia": r"C:\Users\soswo\OneDrive\Desktop\projects\solar-challenge-week1\data\processed\Liberia_clean.csv"
-}
-
-selected_countries = st.sidebar.multiselect(
-    "Select Countries to Compare",
-    options=list(countries.keys()),
-    default=["Ghana", "Benin", "Liberia"]
-)
-
-# Load and combine selected data
-dfs = []
-for country in selected_countries:
-    path = countries[country]
-    df = pd.read_csv(path)
-    df = df.iloc[1:]  # Drop header row if needed
-    df['GHI'] = pd.to_numeric(df['GHI'], errors='coerce')
-    df['Country'] = country
-    dfs.append(df)
-
-if not dfs:
-    st.warning("Please select at least one country.")
-    st.stop()
-
-df_all = pd.concat(dfs)
-
-# --- Boxplot of GHI ---
-st.subheader("📦 GHI Distribution by Country")
+st.title("📰 News Sentiment & Stock Returns")
+st.markdown("Daily headline sentiment next to each ticker's returns, by trading session.")
 
-fig, ax = plt.subplots(figsize=(10, 5))
-sns.boxplot(data=df_all, x="Country", y="GHI", ax=ax)
-ax.set_ylabel("GHI (W/m²)")
-ax.set_title("Boxplot of Global Horizontal Irradiance (GHI)")
-st.pyplot(fig)
 
-# --- Top Regions Table ---
-st.subheader("📊 Top Regions by Average GHI")
+# The heavy work (CSV parsing, sentiment scoring, session binning) runs once per version of the input files;
+# file fingerprints are part of the cache key, so edited files are picked up on the next rerun.
+@st.cache_data(show_spinner="Aggregating news and prices...")
+def load_daily(stock_files, news_file, fingerprints):
+    return load_daily_aggregates(list(stock_files), news_file)
 
-# Normalize column names (strip spaces, standardize case)
-# --- Top 10 Timestamps with Highest GHI ---
-st.subheader("📍 Top 10 Timestamps with Highest GHI")
 
-# Ensure GHI is numeric and Timestamp is parsed
-df_all['GHI'] = pd.to_numeric(df_all['GHI'], errors='coerce')
-df_all['Timestamp'] = pd.to_datetime(df_all['Timestamp'], errors='coerce')
+# Shared, read-only index over the cached aggregates; rebuilt only when the aggregates change
+@st.cache_resource
+def load_dashboard(stock_files, news_file, fingerprints):
+    return DashboardData(load_daily(stock_files, news_file, fingerprints))
 
-# Drop NaN values in Timestamp and GHI
-df_top_ghi = df_all.dropna(subset=['Timestamp', 'GHI'])
 
-# Sort and select top 10
-top_ghi_times = (
-    df_top_ghi[['Timestamp', 'GHI']]
-    .sort_values(by='GHI', ascending=False)
-    .head(10)
-)
+stock_files = tuple(find_stock_files(st.sidebar.text_input("Stock files", STOCK_PATTERN)))
+news_file = st.sidebar.text_input("News file", NEWS_FILE)
+if not stock_files or not os.path.exists(news_file):
+    st.warning("No stock files or news file found; check the paths in the sidebar.")
+    st.stop()
+fingerprints = json.dumps([file_fingerprint(f) for f in stock_files + (news_file,)], sort_keys=True)
+data = load_dashboard(stock_files, news_file, fingerprints)
+
+# Sidebar filters
+selected = st.sidebar.multiselect("Tickers", options=data.tickers, default=data.tickers)
+dates = st.sidebar.date_input("Date range", value=(data.start.date(), data.end.date()),
+                              min_value=data.start.date(), max_value=data.end.date())
+# While a range is being picked only its first end is set
+start, end = dates if len(dates) == 2 else (dates[0], data.end.date())
+max_points = st.sidebar.slider("Points per chart", min_value=200, max_value=5_000, value=DEFAULT_MAX_POINTS,
+                               step=100)
+
+if not selected:
+    st.warning("Please select at least one ticker.")
+    st.stop()
 
-st.dataframe(top_ghi_times)
+# --- Per-ticker summary ---
+st.subheader("📊 Sentiment and Returns by Ticker")
+summary = data.summary(selected, start, end)
+st.dataframe(summary, hide_index=True, use_container_width=True)
+st.bar_chart(summary.set_index("ticker")[["correlation"]])
+
+# --- Single-ticker charts ---
+st.subheader("📈 Price and Daily Sentiment")
+ticker = st.selectbox("Ticker", options=selected)
+left, right = st.columns(2)
+left.line_chart(data.series(ticker, data.field, start, end, max_points), y=data.field)
+right.line_chart(data.series(ticker, "mean_sentiment", start, end, max_points), y="mean_sentiment")
+
+# --- Top sessions ---
+st.subheader("📍 Top Sessions")
+metrics = {"Headlines": "news_count", "Mean sentiment": "mean_sentiment", "Return": "Return",
+           "Positive headlines": "positive", "Negative headlines": "negative"}
+col_metric, col_n, col_order = st.columns(3)
+metric = metrics[col_metric.selectbox("Rank by", options=list(metrics))]
+top_n = col_n.number_input("Rows", min_value=5, max_value=100, value=10, step=5)
+smallest = col_order.radio("Order", ["Highest", "Lowest"], horizontal=True) == "Lowest"
+top = data.top(metric, int(top_n), selected, start, end, smallest=smallest)
+st.dataframe(top.assign(Date=top["Date"].dt.date), hide_index=True, use_container_width=True)
 
 # --- Footer ---
 st.markdown("---")
-st.markdown("Built with ❤️ using Streamlit | Data: Ghana, Benin, Liberia")
+st.markdown("Built with Streamlit | Data: analyst ratings headlines, yfinance daily prices")
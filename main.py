@@ -1,8 +1,17 @@
-from src.historical import HistoricalStockAnalyzer
+from src.historical import summarize_tickers
 from src.news import NewsAnalyzer
-import os
+from src.news_loader import load_news
+from src.price_panel import load_price_panel
+from src.sentiment_store import headline_polarity
+from src.date_alignment import DateAligner
+from src.correlation_analysis import STOCK_MAP
+from src.correlation_engine import pearson_by_group
+from src.indicators import universe_indicators
+from src.pipeline import Pipeline
+import argparse
+import pandas as pd
 
-# Run historical stock analysis
+# Historical stock files
 stock_files = [
     "data/yfinance/AAPL_historical_data.csv",
     "data/yfinance/AMZN_historical_data.csv",
@@ -11,24 +20,114 @@ stock_files = [
     "data/yfinance/TSLA_historical_data.csv"
 ]
 
-for stock_file in stock_files:
-    stock_name = os.path.basename(stock_file).split("_")[0]
-    analyzer = HistoricalStockAnalyzer(stock_file)
-    analyzer.load_data()
-    print(f"=== {stock_name} Summary ===")
-    print(analyzer.get_summary_stats())
-
-# Run news analysis
+# News headlines
 news_file = "data/raw_analyst_ratings.csv"
-news_analyzer = NewsAnalyzer(news_file)
 
-print("\n=== Headline Length Stats ===")
-print(news_analyzer.basic_stats())
 
-print("\n=== Articles per Publisher ===")
-print(news_analyzer.articles_per_publisher().head())
+def load_prices(stock_files):
+    return load_price_panel(stock_files)
+
+
+def summarize_prices(prices, n_jobs=1):
+    # Tickers are summarized in parallel from the shared price panel; failures are reported per ticker
+    summaries, _ = summarize_tickers(prices, n_jobs=n_jobs)
+    return summaries
+
+
+def load_news_frame(news_file):
+    return load_news(news_file)
+
+
+def news_stats(news):
+    news_analyzer = NewsAnalyzer(df=news)
+    return {"headline_length": news_analyzer.basic_stats(),
+            "publishers": news_analyzer.articles_per_publisher()}
+
+
+def score_sentiment(news, engine="textblob", n_jobs=1):
+    events = news[["stock", "date"]].copy()
+    events["stock"] = events["stock"].map(STOCK_MAP)
+    events["sentiment"] = headline_polarity(news["headline"], engine=engine, n_jobs=n_jobs)
+    return events.dropna(subset=["stock", "date"])
+
+
+def align_sessions(prices, sentiment):
+    # Each ticker's headlines are attributed to the trading session they first affect
+    frames = []
+    for ticker in prices.tickers:
+        news_df = sentiment[sentiment["stock"] == ticker][["date", "sentiment"]]
+        if news_df.empty:
+            # e.g. a price file whose ticker STOCK_MAP does not map any news symbol to
+            print(f"Warning: no headlines for {ticker}; it is left out of the correlations.")
+            continue
+        stock_df = prices.to_frame(tickers=[ticker], returns="Close").drop(columns="ticker")
+        aligned = DateAligner(news_df, stock_df, value_cols=["sentiment"]).align()
+        frames.append(aligned.assign(ticker=ticker))
+    if not frames:
+        return pd.DataFrame(columns=["Date", "Close", "Return", "news_count", "first_headline", "mean_sentiment",
+                                     "ticker"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def correlate(aligned):
+    return pearson_by_group(aligned, "Return", "mean_sentiment", by="ticker")
+
+
+def indicators(prices):
+    return universe_indicators(prices)
+
+
+def topics(news, n_topics=5):
+    return NewsAnalyzer(df=news).topic_modeling(n_topics=n_topics)
+
+
+def build_pipeline(stock_files, news_file, cache_dir=None, max_workers=4, n_jobs=1):
+    pipeline = Pipeline(cache_dir=cache_dir, max_workers=max_workers)
+    parallel = {"n_jobs": n_jobs}
+    pipeline.add("prices", load_prices, params={"stock_files": stock_files}, inputs=stock_files)
+    pipeline.add("summary", summarize_prices, deps=["prices"], options=parallel)
+    pipeline.add("news", load_news_frame, params={"news_file": news_file}, inputs=[news_file])
+    pipeline.add("news_stats", news_stats, deps=["news"])
+    pipeline.add("sentiment", score_sentiment, deps=["news"], options=parallel)
+    pipeline.add("aligned", align_sessions, deps=["prices", "sentiment"])
+    pipeline.add("correlate", correlate, deps=["aligned"])
+    pipeline.add("indicators", indicators, deps=["prices"])
+    pipeline.add("topics", topics, deps=["news"])
+    return pipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs the news/stock analysis, reusing cached stage outputs.")
+    parser.add_argument("--force", nargs="*", default=[], help="stages to recompute even if cached")
+    parser.add_argument("--workers", type=int, default=4, help="stages run concurrently")
+    parser.add_argument("--jobs", type=int, default=1, help="processes for per-ticker work (0 = all cores)")
+    parser.add_argument("--cache-dir", default=None)
+    args = parser.parse_args()
+
+    pipeline = build_pipeline(stock_files, news_file, cache_dir=args.cache_dir, max_workers=args.workers,
+                              n_jobs=args.jobs)
+    results = pipeline.run(["summary", "news_stats", "correlate", "indicators", "topics"], force=args.force)
+
+    for stock_name, stats in results["summary"].items():
+        print(f"=== {stock_name} Summary ===")
+        print(stats)
+
+    print("\n=== Headline Length Stats ===")
+    print(results["news_stats"]["headline_length"])
+
+    print("\n=== Articles per Publisher ===")
+    print(results["news_stats"]["publishers"].head())
+
+    print("\n=== Sentiment / Return Correlation by Session ===")
+    print(results["correlate"])
+
+    print("\n=== Topics in News Headlines ===")
+    for tid, words in results["topics"]:
+        print(f"Topic {tid}: {', '.join(words)}")
+
+    print("\n=== Pipeline Stages ===")
+    pipeline.print_report()
+
 
-print("\n=== Topics in News Headlines ===")
-topics = news_analyzer.topic_modeling()
-for tid, words in topics:
-    print(f"Topic {tid}: {', '.join(words)}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# scripts/benchmark_date_parsing.py
+"""
+Compares NewsDateParser against the per-row date handling it replaced.
+
+Usage:
+    python scripts/benchmark_date_parsing.py [rows] [--csv data/raw_analyst_ratings.csv]
+"""
+
+import os
+import sys
+import time
+import argparse
+import warnings
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.date_parsing import NewsDateParser
+
+
+def legacy_parse_date(date_str):
+    """Per-row strptime fallback formerly in NewsAnalyzer._parse_date."""
+    if pd.isna(date_str):
+        return pd.NaT
+    for fmt in ['%Y-%m-%d %H:%M:%S%z', '%m/%d/%Y %H:%M', '%m/%d/%Y', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d']:
+        try:
+            return pd.to_datetime(date_str, format=fmt)
+        except (ValueError, TypeError):
+            continue
+    return pd.NaT
+
+
+def legacy_tz_strip(dates):
+    """Per-row timezone strip formerly in news_data.NewsAnalyzer."""
+    parsed = pd.to_datetime(dates, errors='coerce', format='mixed')
+    # Mixed offsets leave an object column of datetime objects, hence the Timestamp() wrap
+    return parsed.apply(lambda dt: pd.Timestamp(dt).tz_convert(None) if pd.notna(dt) and dt.tzinfo is not None else dt)
+
+
+def synthetic_dates(n, seed=0):
+    rng = np.random.default_rng(seed)
+    stamps = pd.Timestamp("2011-01-01") + pd.to_timedelta(rng.integers(0, 10 * 365 * 24 * 60, n), unit="min")
+    kind = rng.choice(3, size=n, p=[0.05, 0.9, 0.05])
+    iso_tz = stamps.strftime("%Y-%m-%d %H:%M:%S") + "-04:00"
+    midnight = stamps.strftime("%Y-%m-%d 00:00:00")
+    us = stamps.strftime("%m/%d/%Y %H:%M")
+    return pd.Series(np.where(kind == 0, iso_tz, np.where(kind == 1, midnight, us)))
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.3f}s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("rows", nargs="?", type=int, default=200_000)
+    parser.add_argument("--csv", help="benchmark the 'date' column of a real news file instead")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    dates = pd.read_csv(args.csv, usecols=["date"])["date"] if args.csv else synthetic_dates(args.rows)
+    print(f"Parsing {len(dates):,} dates")
+
+    date_parser = NewsDateParser()
+    new, new_time = timed("NewsDateParser.parse", date_parser.parse, dates)
+    print("  formats:", date_parser.report["formats"])
+    print("  failed:", date_parser.report["failed"], "missing:", date_parser.report["missing"])
+
+    _, strip_time = timed("legacy tz_convert apply", legacy_tz_strip, dates)
+    # The strptime loop is far too slow for the full column; time a slice and extrapolate
+    sample = dates.iloc[:min(len(dates), 20_000)]
+    old, sample_time = timed(f"legacy _parse_date ({len(sample):,})", lambda s: s.apply(legacy_parse_date), sample)
+    per_row_time = sample_time * len(dates) / len(sample)
+    print(f"{'legacy _parse_date (projected)':<32} {per_row_time:8.3f}s")
+
+    old_utc = old.apply(lambda dt: dt.tz_convert(None) if pd.notna(dt) and dt.tzinfo is not None else dt)
+    mismatches = (pd.to_datetime(old_utc) != new.iloc[:len(sample)]).sum()
+    print(f"Mismatches against _parse_date on the slice: {mismatches}")
+    print(f"Speedup vs tz_convert apply: {strip_time / new_time:.1f}x, vs _parse_date: {per_row_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
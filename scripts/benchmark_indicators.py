@@ -0,0 +1,55 @@
+# scripts/benchmark_indicators.py
+"""
+Times compute_indicators (SMA, RSI, MACD) over a universe of random-walk
+prices with the NumPy backend, and with talib's per-ticker loop when it is
+installed. Parity with talib is asserted in tests/test_indicators.py.
+
+Usage:
+    python scripts/benchmark_indicators.py [days] [--tickers 500] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src import indicators
+
+
+def random_walks(days, tickers, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(days, tickers)), axis=0))
+    # Staggered listing dates, as in a real universe
+    for j, start in enumerate(rng.integers(0, days // 3, size=tickers)):
+        prices[:start, j] = np.nan
+    return prices
+
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("days", nargs="?", type=int, default=2_500)
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    prices = random_walks(args.days, args.tickers)
+    print(f"{args.days:,} days x {args.tickers:,} tickers")
+    backends = ["numpy"] + (["talib"] if indicators.talib is not None else [])
+    for backend in backends:
+        seconds = best_time(lambda: indicators.compute_indicators(prices, backend=backend), args.repeat)
+        print(f"{backend:<8} {seconds:8.3f}s  {args.days * args.tickers / seconds:14,.0f} prices/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# scripts/benchmark_keywords.py
+"""
+Benchmarks TextAnalyzer keyword extraction on a large headline corpus:
+vectorized cleaning, the TF-IDF fit, the sparse corpus-wide ranking and
+per-ticker / per-month rankings from that same fit. The old per-row
+cleaning loop is timed on a slice for comparison, and the size of the dense
+matrix the old ranking would have built is reported.
+
+Sklearn's English stopword list is used so the run does not need the NLTK
+corpus download.
+
+Usage:
+    python scripts/benchmark_keywords.py [rows] [--baseline-rows 100000] [--csv data/raw_analyst_ratings.csv]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.text_analysis import TextAnalyzer
+
+WORDS = ("stocks shares rise fall strong weak earnings beat miss outlook upgrade downgrade "
+         "guidance record high low great bad good very slightly new quarter sales the a of to "
+         "on after amid ahead analyst price target raises cuts 52-week Q3 $AAPL").split()
+TICKERS = "AAPL AMZN GOOG META MSFT NVDA TSLA".split()
+
+
+def synthetic_news(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(5, 14, n)
+    words = rng.choice(WORDS, size=lengths.sum())
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    headlines = [" ".join(words[bounds[i]:bounds[i + 1]]) for i in range(n)]
+    stocks = rng.choice(TICKERS, size=n)
+    dates = pd.Timestamp("2015-01-01") + pd.to_timedelta(rng.integers(0, 5 * 365, n), unit="D")
+    return pd.DataFrame({"headline": headlines, "stock": stocks, "date": dates})
+
+
+def loop_clean(texts, stop_words):
+    """The cleaning loop TextAnalyzer used to run, kept as the baseline."""
+    cleaned = []
+    for text in texts:
+        text = re.sub(r'[^a-zA-Z\s]', '', str(text))
+        tokens = [w for w in text.lower().split() if w not in stop_words and len(w) > 2]
+        cleaned.append(" ".join(tokens))
+    return cleaned
+
+
+def timed(label, func, rows=None):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    rate = f"  {rows / elapsed:12,.0f} rows/s" if rows else ""
+    print(f"{label:<28} {elapsed:8.2f}s{rate}")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("rows", nargs="?", type=int, default=1_000_000)
+    parser.add_argument("--baseline-rows", type=int, default=100_000, help="rows for the old cleaning loop")
+    parser.add_argument("--top-n", type=int, default=20)
+    parser.add_argument("--csv", help="use a real news file (headline, stock, date) instead")
+    args = parser.parse_args()
+
+    if args.csv:
+        news = pd.read_csv(args.csv, usecols=["headline", "stock", "date"], nrows=args.rows)
+        news["date"] = pd.to_datetime(news["date"], format="mixed", utc=True, errors="coerce")
+    else:
+        news = synthetic_news(args.rows)
+    print(f"{len(news):,} headlines")
+
+    stop_words = set(ENGLISH_STOP_WORDS)
+    baseline = news["headline"].iloc[:args.baseline_rows]
+    _, loop_time = timed(f"loop clean ({len(baseline):,})", lambda: loop_clean(baseline, stop_words), len(baseline))
+
+    analyzer, clean_time = timed("vectorized clean", lambda: TextAnalyzer(news["headline"], stop_words=stop_words),
+                                 len(news))
+    print(f"{'':<28} {loop_time / len(baseline) * len(news) / clean_time:8.1f}x loop throughput")
+    timed("tf-idf fit", analyzer._fit_tfidf, len(news))
+    keywords, _ = timed("corpus ranking", lambda: analyzer.extract_keywords(args.top_n))
+    by_ticker, _ = timed("per-ticker ranking", lambda: analyzer.keywords_by(news["stock"], args.top_n, "stock"))
+    by_month, _ = timed("per-month ranking", lambda: analyzer.keywords_by_period(news["date"], "M", args.top_n))
+
+    dense_bytes = analyzer.tfidf_matrix.shape[0] * analyzer.tfidf_matrix.shape[1] * 8
+    sparse_bytes = analyzer.tfidf_matrix.data.nbytes + analyzer.tfidf_matrix.indices.nbytes
+    print(f"tf-idf matrix {analyzer.tfidf_matrix.shape}: sparse {sparse_bytes / 1e6:,.1f} MB, "
+          f"dense would be {dense_bytes / 1e6:,.1f} MB")
+    print(f"top keywords: {', '.join(keywords[:10])}")
+    print(f"{by_ticker['stock'].nunique()} tickers, {by_month['period'].nunique()} months ranked")
+
+
+if __name__ == "__main__":
+    main()
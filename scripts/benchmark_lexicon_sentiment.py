@@ -0,0 +1,48 @@
+# scripts/benchmark_lexicon_sentiment.py
+"""
+Times LexiconSentimentEngine against TextBlob(...).sentiment on synthetic
+headlines (see src/synthetic_data.py) or a real news file. Parity with
+TextBlob is asserted in tests/test_lexicon_sentiment.py.
+
+Usage:
+    python scripts/benchmark_lexicon_sentiment.py [rows] [--csv data/raw_analyst_ratings.csv]
+"""
+
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+from textblob import TextBlob
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.lexicon_sentiment import LexiconSentimentEngine
+from src.synthetic_data import synthetic_news
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("rows", nargs="?", type=int, default=50_000)
+    parser.add_argument("--csv", help="time headlines from a real news file instead")
+    args = parser.parse_args()
+
+    if args.csv:
+        texts = pd.read_csv(args.csv, usecols=["headline"], nrows=args.rows)["headline"].astype(str).tolist()
+    else:
+        texts = synthetic_news(args.rows)["headline"].tolist()
+
+    start = time.perf_counter()
+    for text in texts:
+        TextBlob(text).sentiment
+    textblob_time = time.perf_counter() - start
+
+    engine = LexiconSentimentEngine()
+    start = time.perf_counter()
+    engine.score(texts)
+    engine_time = time.perf_counter() - start
+    print(f"{len(texts):,} headlines: TextBlob {textblob_time:.2f}s, engine {engine_time:.2f}s "
+          f"({textblob_time / engine_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# scripts/benchmark_parallel_sentiment.py
+"""
+Measures how TextBlob headline scoring scales with the process-pool size.
+The sentiment store is bypassed so every run scores every headline. That
+parallel output equals serial output is checked in
+tests/test_parallel_sentiment.py.
+
+Usage:
+    python scripts/benchmark_parallel_sentiment.py [rows] [--workers 1 2 4 8] [--csv data/raw_analyst_ratings.csv]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.parallel_sentiment import parallel_scores
+from src.sentiment_store import textblob_scores
+
+WORDS = ("stocks shares rise fall strong weak earnings beat miss outlook upgrade downgrade "
+         "guidance record high low great bad good very slightly new quarter sales").split()
+
+
+def synthetic_headlines(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(5, 14, n)
+    return [" ".join(rng.choice(WORDS, size=k)) for k in lengths]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("rows", nargs="?", type=int, default=100_000)
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--chunk-size", type=int, default=5_000)
+    parser.add_argument("--csv", help="score headlines from a real news file instead")
+    args = parser.parse_args()
+
+    if args.csv:
+        texts = pd.read_csv(args.csv, usecols=["headline"])["headline"].astype(str).tolist()[:args.rows]
+    else:
+        texts = synthetic_headlines(args.rows)
+    print(f"Scoring {len(texts):,} headlines on {os.cpu_count()} cores")
+
+    baseline = None
+    for workers in sorted(set(args.workers)):
+        start = time.perf_counter()
+        parallel_scores(texts, textblob_scores, n_jobs=workers, chunk_size=args.chunk_size,
+                        min_parallel=0, progress=False)
+        elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline = elapsed
+        print(f"workers={workers:<3} {elapsed:8.2f}s  {len(texts) / elapsed:10,.0f} rows/s  "
+              f"speedup {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
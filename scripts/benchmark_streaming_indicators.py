@@ -0,0 +1,79 @@
+# scripts/benchmark_streaming_indicators.py
+"""
+Times the incremental indicator states in src/indicator_state.py: per-bar
+IndicatorSet.update after a JSON save/load, and TechnicalIndicatorAnalyzer.
+append_bar, against one full recompute with src/indicators.py. Parity with
+the batch indicators is checked in tests/test_technical_indicators.py.
+
+Usage:
+    python scripts/benchmark_streaming_indicators.py [days] [--tickers 20] [--bars 250]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.indicators import compute_indicators
+from src.indicator_state import IndicatorSet
+from src.technical_indicators import TechnicalIndicatorAnalyzer
+
+
+def time_series(prices, seed_bars, state_dir):
+    indicator_set, _ = IndicatorSet.from_history(prices[:seed_bars])
+    path = os.path.join(state_dir, "state.json")
+    indicator_set.save(path)
+    indicator_set = IndicatorSet.load(path)
+    start = time.perf_counter()
+    for p in prices[seed_bars:]:
+        indicator_set.update(p)
+    per_bar = (time.perf_counter() - start) / max(len(prices) - seed_bars, 1)
+
+    start = time.perf_counter()
+    compute_indicators(prices)
+    return per_bar, time.perf_counter() - start
+
+
+def time_append_bar(prices, bars, state_dir):
+    dates = pd.bdate_range("2000-01-03", periods=len(prices))
+    path = os.path.join(state_dir, "BENCH_historical_data.csv")
+    seed = len(prices) - bars
+    pd.DataFrame({"Date": dates[:seed].strftime("%Y-%m-%d"), "Close": prices[:seed]}).to_csv(path, index=False)
+    analyzer = TechnicalIndicatorAnalyzer(path, use_cache=False)
+    analyzer.append_bar({"Date": dates[seed], "Close": prices[seed]})  # seeds the state
+    start = time.perf_counter()
+    for date, price in zip(dates[seed + 1:], prices[seed + 1:]):
+        analyzer.append_bar({"Date": date, "Close": price})
+    len(analyzer.df)  # joins the buffered rows
+    return (time.perf_counter() - start) / max(bars - 1, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("days", nargs="?", type=int, default=1_000)
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--bars", type=int, default=250, help="bars appended through append_bar")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    per_bar, batch = [], []
+    with tempfile.TemporaryDirectory() as state_dir:
+        for _ in range(args.tickers):
+            prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, args.days)))
+            update, recompute = time_series(prices, int(rng.integers(0, args.days)), state_dir)
+            per_bar.append(update)
+            batch.append(recompute)
+        append = time_append_bar(prices, min(args.bars, args.days - 1), state_dir)
+
+    print(f"{args.tickers} series x {args.days} days")
+    print(f"  IndicatorSet.update:  {np.median(per_bar) * 1e6:8.1f}us/bar")
+    print(f"  append_bar:           {append * 1e6:8.1f}us/bar")
+    print(f"  full recompute:       {np.median(batch) * 1e3:8.2f}ms/series")
+
+
+if __name__ == "__main__":
+    main()
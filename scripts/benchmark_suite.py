@@ -0,0 +1,273 @@
+# scripts/benchmark_suite.py
+"""
+Times the hot paths of src/ on a deterministic synthetic dataset (see
+src/synthetic_data.py) and compares them with a stored baseline.
+
+Every benchmark runs --repeat times (best and median wall time are kept),
+then once more under tracemalloc for its peak memory; NumPy and pandas
+buffers are traced, Arrow's own allocations are not. Per-run preparation
+(fresh cache directories, loading the inputs a step consumes) happens
+outside the timed region. Sentiment scores go to a store inside the work
+directory, so the shared store under .cache/sentiment is left alone.
+
+Results are written as JSON. When the baseline file exists and was taken on
+the same dataset, each benchmark is compared with it and the script exits
+with status 1 if any got slower than --tolerance allows or its peak memory
+grew by more than --memory-tolerance; --save-baseline stores this run as the
+new baseline.
+
+The checked-in baseline, scripts/benchmark_baseline.json, is a default run
+(100,000 headlines, 1,250 days, the default tickers, seed 0) whose "meta"
+records the machine it was taken on. Wall times only compare on similar
+hardware, so the script warns when the machine differs; peak memory carries
+across machines. Refresh it with --save-baseline when a change is meant to
+move the numbers, and commit the file with that change. Correctness checks
+live in tests/.
+
+Usage:
+    python scripts/benchmark_suite.py [--rows 100000] [--days 1250] [--tickers AAPL MSFT ...] [--repeat 3]
+        [--only NAME ...] [--output FILE] [--baseline FILE] [--save-baseline] [--tolerance 0.25]
+        [--memory-tolerance 0.25]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tracemalloc
+import statistics
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import src.sentiment_store as sentiment_store
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from src.correlation_analysis import load_news_events
+from src.date_alignment import DateAligner
+from src.indicators import universe_indicators
+from src.news import NewsAnalyzer
+from src.news_loader import load_news
+from src.price_panel import load_price_panel
+from src.publisher_analysis import PublisherAnalyzer
+from src.sentiment_store import ENGINES, SentimentStore, headline_polarity
+from src.stock_sentiment_analysis import StockSentimentAnalyzer
+from src.synthetic_data import DEFAULT_TICKERS, GENERATOR_VERSION, write_dataset
+from src.text_analysis import TextAnalyzer
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BENCH_DIR = os.path.join(REPO_DIR, ".cache", "benchmarks")
+BASELINE_FILE = os.path.join(REPO_DIR, "scripts", "benchmark_baseline.json")
+SUITE_VERSION = 1
+
+
+class Workspace:
+    """The synthetic dataset plus scratch directories; shared inputs are loaded once, untimed."""
+
+    def __init__(self, data_dir, news_file, stock_files):
+        self.data_dir = data_dir
+        self.news_file = news_file
+        self.stock_files = stock_files
+        self._loaded = {}
+
+    def scratch(self, name):
+        """An empty directory under the work directory, recreated on every call."""
+        path = os.path.join(self.data_dir, "scratch", name)
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        return path
+
+    def get(self, name, loader):
+        if name not in self._loaded:
+            self._loaded[name] = loader()
+        return self._loaded[name]
+
+    @property
+    def news(self):
+        return self.get("news", lambda: load_news(self.news_file))
+
+    @property
+    def panel(self):
+        return self.get("panel", lambda: load_price_panel(self.stock_files))
+
+    @property
+    def events(self):
+        return self.get("events", lambda: load_news_events(self.news_file))
+
+
+def _warm_news_cache(ws):
+    cache_dir = os.path.join(ws.data_dir, "news-warm")
+    load_news(ws.news_file, cache_dir=cache_dir)
+    return cache_dir
+
+
+def _cached_store(ws):
+    store = SentimentStore(store_dir=os.path.join(ws.data_dir, "sentiment-warm"))
+    store.score(ws.news["headline"])
+    return store
+
+
+def _session_inputs(ws):
+    # All price days, so headlines from the first day (which has no return yet) still find a session
+    frames = {ticker: ws.panel.to_frame(tickers=[ticker], returns="Close", dropna=False).drop(columns="ticker")
+              for ticker in ws.panel.tickers}
+    events = {ticker: ws.events[ws.events["stock"] == ticker][["date", "sentiment"]] for ticker in frames}
+    return frames, events
+
+
+def _align_sessions(frames, events):
+    return [DateAligner(events[t], frames[t], value_cols=["sentiment"]).align() for t in frames]
+
+
+# name -> (setup(ws) returning the run's arguments, run(*args)); setup is not timed
+BENCHMARKS = {
+    "news_load_csv": (lambda ws: (ws.news_file, ws.scratch("news")),
+                      lambda path, cache_dir: load_news(path, cache_dir=cache_dir)),
+    "news_load_cached": (lambda ws: (ws.news_file, ws.get("news_cache", lambda: _warm_news_cache(ws))),
+                         lambda path, cache_dir: load_news(path, cache_dir=cache_dir)),
+    "sentiment_cold": (lambda ws: (ws.news["headline"], SentimentStore(store_dir=ws.scratch("sentiment"))),
+                       lambda texts, store: headline_polarity(texts, store=store)),
+    "sentiment_cached": (lambda ws: (ws.news["headline"], ws.get("store", lambda: _cached_store(ws))),
+                         lambda texts, store: headline_polarity(texts, store=store)),
+    "price_panel_csv": (lambda ws: (ws.stock_files, ws.scratch("prices")),
+                        lambda files, cache_dir: load_price_panel(files, cache_dir=cache_dir)),
+    "date_align": (lambda ws: ws.get("sessions", lambda: _session_inputs(ws)), _align_sessions),
+    "merge_and_correlate": (lambda ws: (StockSentimentAnalyzer(ws.stock_files, ws.news_file),),
+                            lambda analyzer: analyzer.merge_and_correlate()),
+    "indicators": (lambda ws: (ws.panel,), universe_indicators),
+    "topic_modeling": (lambda ws: (NewsAnalyzer(df=ws.news),), lambda analyzer: analyzer.topic_modeling(5)),
+    "topic_modeling_online": (lambda ws: (NewsAnalyzer(df=ws.news),),
+                              lambda analyzer: analyzer.topic_modeling(5, online=True)),
+    # NLTK's list would need a corpus download; sklearn's is close enough for timing
+    "extract_keywords": (lambda ws: (ws.news["headline"],),
+                         lambda texts: TextAnalyzer(texts, stop_words=ENGLISH_STOP_WORDS).extract_keywords(20)),
+    "compare_publisher_content": (lambda ws: (PublisherAnalyzer(ws.news),),
+                                  lambda analyzer: analyzer.compare_publisher_content()),
+}
+
+
+def use_store_dir(store_dir):
+    """Points the process-wide default sentiment stores (used inside the analyzers) at store_dir."""
+    for engine, (scorer, version) in ENGINES.items():
+        sentiment_store._default_stores[engine] = SentimentStore(store_dir=store_dir, scorer=scorer, version=version)
+
+
+def measure(ws, setup, run, repeat):
+    runs = []
+    for _ in range(repeat):
+        args = setup(ws)
+        start = time.perf_counter()
+        run(*args)
+        runs.append(time.perf_counter() - start)
+    args = setup(ws)
+    tracemalloc.start()
+    try:
+        run(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(runs), "median": statistics.median(runs), "runs": runs, "peak_mb": peak / 2 ** 20}
+
+
+def _grew(now, before, tolerance, minimum):
+    """More than tolerance (relative) and minimum (absolute) above before: small numbers are mostly noise."""
+    ratio = now / before if before else float("inf")
+    return ratio > 1 + tolerance and now - before > minimum
+
+
+def compare(results, baseline, tolerance, min_seconds, memory_tolerance, min_mb):
+    """Prints each benchmark against the baseline; returns {name: ['time' and/or 'memory']} for regressions."""
+    if baseline["meta"]["dataset"] != results["meta"]["dataset"]:
+        print("Baseline was taken on a different dataset; not comparing.")
+        return {}
+    machine = ("platform", "cpus", "python")
+    if any(baseline["meta"].get(k) != results["meta"].get(k) for k in machine):
+        print("Warning: baseline was taken on " + ", ".join(str(baseline["meta"].get(k)) for k in machine)
+              + "; wall times may not be comparable.")
+    regressions = {}
+    print(f"\n{'benchmark':<28} {'baseline':>9} {'now':>9} {'ratio':>7} {'peak MB':>9} {'was':>9}")
+    for name, now in results["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            print(f"{name:<28} {'-':>9} {now['seconds']:9.3f}      new")
+            continue
+        ratio = now["seconds"] / before["seconds"] if before["seconds"] else float("inf")
+        flags = []
+        if _grew(now["seconds"], before["seconds"], tolerance, min_seconds):
+            flags.append("time")
+        if _grew(now["peak_mb"], before["peak_mb"], memory_tolerance, min_mb):
+            flags.append("memory")
+        if flags:
+            regressions[name] = flags
+        print(f"{name:<28} {before['seconds']:9.3f} {now['seconds']:9.3f} {ratio:7.2f} "
+              f"{now['peak_mb']:9.1f} {before['peak_mb']:9.1f}"
+              + "".join({"time": "  SLOWER", "memory": "  MORE MEMORY"}[f] for f in flags))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="synthetic headlines")
+    parser.add_argument("--days", type=int, default=1_250, help="business days of prices")
+    parser.add_argument("--tickers", nargs="+", default=DEFAULT_TICKERS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="benchmarks to run (default: all)")
+    parser.add_argument("--data-dir", help="where the dataset is generated (default: under .cache/benchmarks)")
+    parser.add_argument("--output", default=os.path.join(BENCH_DIR, "latest.json"))
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="ignore slowdowns smaller than this")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25,
+                        help="allowed peak memory growth before flagging (0.25 = 25%%)")
+    parser.add_argument("--min-mb", type=float, default=5.0, help="ignore peak memory growth smaller than this")
+    args = parser.parse_args()
+
+    dataset = {"rows": args.rows, "days": args.days, "tickers": list(args.tickers), "seed": args.seed,
+               "generator": GENERATOR_VERSION, "suite": SUITE_VERSION}
+    data_dir = args.data_dir or os.path.join(
+        BENCH_DIR, f"data-v{GENERATOR_VERSION}-{args.rows}-{args.days}-{'-'.join(args.tickers)}-{args.seed}")
+    news_file = os.path.join(data_dir, "raw_analyst_ratings.csv")
+    stock_files = [os.path.join(data_dir, "yfinance", f"{t}_historical_data.csv") for t in args.tickers]
+    if not all(os.path.exists(f) for f in [news_file] + stock_files):
+        print(f"Generating {args.rows:,} headlines and {len(args.tickers)} x {args.days:,} price rows in {data_dir}")
+        news_file, stock_files = write_dataset(data_dir, n_rows=args.rows, tickers=args.tickers, n_days=args.days,
+                                               seed=args.seed)
+    use_store_dir(os.path.join(data_dir, "sentiment-default"))
+    ws = Workspace(data_dir, news_file, stock_files)
+
+    results = {"meta": {"dataset": dataset, "repeat": args.repeat, "python": platform.python_version(),
+                        "platform": platform.platform(), "cpus": os.cpu_count(),
+                        "created": datetime.now(timezone.utc).isoformat(timespec="seconds")},
+               "benchmarks": {}}
+    print(f"{'benchmark':<28} {'best':>9} {'median':>9} {'peak MB':>9}")
+    for name in args.only or BENCHMARKS:
+        setup, run = BENCHMARKS[name]
+        result = measure(ws, setup, run, args.repeat)
+        results["benchmarks"][name] = result
+        print(f"{name:<28} {result['seconds']:9.3f} {result['median']:9.3f} {result['peak_mb']:9.1f}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    regressions = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_seconds,
+                                  args.memory_tolerance, args.min_mb)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        shutil.copyfile(args.output, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+    if regressions:
+        print("\nRegressed against baseline: " + ", ".join(f"{name} ({' and '.join(flags)})"
+                                                        for name, flags in regressions.items()))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# scripts/generate_synthetic_data.py
+"""
+Writes a synthetic raw_analyst_ratings.csv and yfinance price CSVs (see
+src/synthetic_data.py). The same arguments always produce the same files.
+
+Usage:
+    python scripts/generate_synthetic_data.py OUT_DIR [--rows 1000000] [--days 1250] [--tickers AAPL MSFT ...]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.synthetic_data import DATE_FORMAT_MIX, DEFAULT_START, DEFAULT_TICKERS, write_dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="headlines")
+    parser.add_argument("--days", type=int, default=1_250, help="business days of prices")
+    parser.add_argument("--tickers", nargs="+", default=DEFAULT_TICKERS)
+    parser.add_argument("--start", default=DEFAULT_START)
+    parser.add_argument("--publishers", type=int, default=1_000)
+    parser.add_argument("--publisher-skew", type=float, default=1.2, help="Zipf exponent of publisher activity")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1, help="share of syndicated copies")
+    parser.add_argument("--format-mix", type=float, nargs=3, default=DATE_FORMAT_MIX,
+                        help="shares of ISO-with-offset, midnight and US-style dates")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    news_file, stock_files = write_dataset(args.out_dir, n_rows=args.rows, tickers=args.tickers, n_days=args.days,
+                                           start=args.start, seed=args.seed, n_publishers=args.publishers,
+                                           publisher_skew=args.publisher_skew, duplicate_rate=args.duplicate_rate,
+                                           format_mix=args.format_mix)
+    print(f"{news_file}: {args.rows:,} headlines")
+    for path in stock_files:
+        print(f"{path}: {args.days:,} days")
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# src/charts.py
+
+import os
+import numpy as np
+import pandas as pd
+import matplotlib
+import matplotlib.pyplot as plt
+import multiprocessing
+from functools import partial
+from src.ticker_pool import map_tickers
+
+# About one point per horizontal pixel of a 14-inch figure at 100 dpi
+DEFAULT_MAX_POINTS = 1_500
+DEFAULT_DPI = 100
+
+
+def use_headless():
+    """Switches matplotlib to the non-interactive Agg backend (for batch rendering and workers)."""
+    matplotlib.use("Agg", force=True)
+
+
+def _headless_in_workers():
+    # Inside a pool worker nothing is ever shown; the parent's backend is left alone
+    if multiprocessing.parent_process() is not None:
+        use_headless()
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: positions of n_out points of (x, y)
+    that keep the visual shape of the line. The first and last points are
+    always kept; each bucket in between keeps the point forming the largest
+    triangle with the previously kept point and the next bucket's mean.
+    NaN values are only kept when a bucket has nothing else.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        next_y = y[next_lo:next_hi]
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = next_y[~np.isnan(next_y)].mean() if (~np.isnan(next_y)).any() else np.nan
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(np.where(np.isnan(area), -1.0, area)))
+        out[i + 1] = a
+    return out
+
+
+def _x_values(x):
+    x = pd.Series(x) if not isinstance(x, pd.Series) else x
+    if pd.api.types.is_datetime64_any_dtype(x):
+        return x.to_numpy("datetime64[ns]").view("i8").astype(float)
+    return x.to_numpy(dtype=float)
+
+
+def downsample(df, column, max_points=DEFAULT_MAX_POINTS, x=None):
+    """
+    Rows of df picked by LTTB on one column, so every other column stays
+    aligned with it. x is a column name, or the index when None. Frames
+    already short enough (or max_points=None) are returned unchanged.
+    """
+    if max_points is None or len(df) <= max_points:
+        return df
+    x_values = _x_values(df.index.to_series() if x is None else df[x])
+    return df.iloc[lttb_indices(x_values, df[column].to_numpy(dtype=float), max_points)]
+
+
+def plot_line(ax, df, column, max_points=DEFAULT_MAX_POINTS, **kwargs):
+    """
+    Plots one column against df's index, downsampled (LTTB) on that column's
+    own values, so every line in a chart keeps its own peaks. Rows where the
+    column is NaN (e.g. indicator warm-up) are dropped first.
+    """
+    series = downsample(df[[column]].dropna(), column, max_points)
+    return ax.plot(series.index, series[column], **kwargs)
+
+
+def finish(fig, path=None, dpi=DEFAULT_DPI):
+    """Writes the figure to path and closes it, or shows it when no path is given."""
+    if path is None:
+        plt.show()
+        return None
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fig.savefig(path, dpi=dpi)
+    plt.close(fig)
+    return path
+
+
+def _price_report(ticker, shared, out_dir, fmt, max_points, dpi):
+    """Indicator chart of one ticker from the shared panel; runs in worker processes."""
+    _headless_in_workers()
+    from src.indicators import add_indicators
+    from src.pynance_analysis import plot_price_with_indicators
+
+    df = shared.panel.to_frame(["Close"], tickers=[ticker]).drop(columns="ticker").set_index("Date")
+    add_indicators(df, "Close")
+    path = os.path.join(out_dir, f"{ticker}_indicators.{fmt}")
+    return plot_price_with_indicators(df, ticker, path=path, max_points=max_points, dpi=dpi)
+
+
+def render_price_reports(price_panel, out_dir, n_jobs=1, fmt="png", max_points=DEFAULT_MAX_POINTS,
+                         dpi=DEFAULT_DPI):
+    """
+    Writes a price / SMA / RSI / MACD chart for every ticker of a PricePanel
+    to out_dir, rendering tickers in parallel with the Agg backend.
+    Returns ({ticker: image path}, {ticker: error}).
+    """
+    task = partial(_price_report, out_dir=out_dir, fmt=fmt, max_points=max_points, dpi=dpi)
+    return map_tickers(task, price_panel.tickers, panel=price_panel, n_jobs=n_jobs)
+
+
+def _series_report(i, shared, tickers, columns, out_dir, fmt, max_points, dpi):
+    """One ticker's line charts (one panel per column) from shared arrays; runs in worker processes."""
+    _headless_in_workers()
+    start, end = shared["_bounds"][i]
+    df = pd.DataFrame({name: shared[name][start:end] for name in columns},
+                      index=pd.DatetimeIndex(shared["_dates"][start:end].view("datetime64[ns]"), name="Date"))
+    ticker = tickers[i]
+    fig, axs = plt.subplots(1, len(columns), figsize=(7 * len(columns), 4), squeeze=False)
+    for ax, (name, label) in zip(axs[0], columns.items()):
+        plot_line(ax, df, name, max_points)
+        ax.set_title(f"{ticker} {label}")
+        ax.set_ylabel(label)
+    fig.tight_layout()
+    return finish(fig, os.path.join(out_dir, f"{ticker}_{'_'.join(columns)}.{fmt}"), dpi=dpi)
+
+
+def render_series_reports(df, columns, out_dir, ticker_col="ticker", date_col="Date", n_jobs=1, fmt="png",
+                          max_points=DEFAULT_MAX_POINTS, dpi=DEFAULT_DPI):
+    """
+    Per-ticker line charts of a long DataFrame: columns maps each column to
+    plot to its label (e.g. {'daily_return': 'Daily Return'}). The numeric
+    columns are shared with the workers as arrays, sorted by ticker and date.
+    Returns ({ticker: image path}, {ticker: error}).
+    """
+    df = df.sort_values([ticker_col, date_col], kind="stable")
+    codes, tickers = pd.factorize(df[ticker_col], sort=True)
+    n_rows = int((codes >= 0).sum())
+    starts = np.searchsorted(codes[:n_rows], np.arange(len(tickers)))
+    arrays = {name: df[name].to_numpy(dtype=float) for name in columns}
+    arrays["_dates"] = pd.to_datetime(df[date_col]).to_numpy("datetime64[ns]").view("i8")
+    arrays["_bounds"] = np.column_stack([starts, np.append(starts[1:], n_rows)])
+    task = partial(_series_report, tickers=list(tickers), columns=dict(columns), out_dir=out_dir, fmt=fmt,
+                   max_points=max_points, dpi=dpi)
+    results, failures = map_tickers(task, range(len(tickers)), arrays=arrays, n_jobs=n_jobs)
+    return ({tickers[i]: path for i, path in results.items()},
+            {tickers[i]: error for i, error in failures.items()})
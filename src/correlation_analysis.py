@@ -1,66 +1,190 @@
-import os
 import pandas as pd
-from textblob import TextBlob
 from scipy.stats import pearsonr
 import matplotlib.pyplot as plt
+from src.news_loader import load_news
+from src.sentiment_store import headline_polarity
+from src.news_streaming import stream_daily_sentiment
+from src.correlation_engine import pearson_by_group, SentimentReturnPanel
+from src.correlation_significance import correlation_significance, DEFAULT_BLOCK_SIZE
+from src.price_panel import load_price_panel
+from src.event_study import EventStudy, summarize_events, DEFAULT_WINDOW
+from src.charts import finish
 
-def compute_sentiment(text):
-    return TextBlob(str(text)).sentiment.polarity
+# Map 'stock' column to full stock ticker names for alignment
+STOCK_MAP = {
+    'A': 'AAPL', 'AMZN': 'AMZN', 'GOOG': 'GOOG', 'META': 'META',
+    'MSFT': 'MSFT', 'NVDA': 'NVDA', 'TSLA': 'TSLA'
+}
 
-def preprocess_news(news_filepath):
-    news_df = pd.read_csv(news_filepath)
-    news_df['date'] = pd.to_datetime(news_df['date'], errors='coerce').dt.date
+def preprocess_news(news_filepath, n_jobs=1, engine="textblob"):
+    news_df = load_news(news_filepath)
+    news_df['date'] = news_df['date'].dt.date
     news_df.dropna(subset=['date'], inplace=True)
-    news_df['sentiment'] = news_df['headline'].apply(compute_sentiment)
-
-    # Map 'stock' column to full stock ticker names for alignment
-    stock_map = {
-        'A': 'AAPL', 'AMZN': 'AMZN', 'GOOG': 'GOOG', 'META': 'META',
-        'MSFT': 'MSFT', 'NVDA': 'NVDA', 'TSLA': 'TSLA'
-    }
-    news_df['stock'] = news_df['stock'].map(stock_map)
+    news_df['sentiment'] = headline_polarity(news_df['headline'], n_jobs=n_jobs, engine=engine)
+    news_df['stock'] = news_df['stock'].map(STOCK_MAP)
     return news_df
 
+def load_news_events(news_filepath, n_jobs=1, engine="textblob"):
+    """Headline events ('stock', 'date', 'sentiment') with full timestamps, for the event study."""
+    news_df = load_news(news_filepath)
+    news_df.dropna(subset=['date'], inplace=True)
+    news_df['sentiment'] = headline_polarity(news_df['headline'], n_jobs=n_jobs, engine=engine)
+    news_df['stock'] = news_df['stock'].map(STOCK_MAP)
+    return news_df[['stock', 'date', 'sentiment']]
+
+def preprocess_news_streaming(news_filepath, chunksize, n_jobs=1, engine="textblob"):
+    """
+    Bounded-memory alternative to preprocess_news: returns daily mean
+    sentiment per mapped ticker ('stock', 'date', 'sentiment') without
+    holding the whole news file in memory.
+    """
+    state = stream_daily_sentiment(news_filepath, chunksize=chunksize, n_jobs=n_jobs,
+                                   engine=engine, ticker_map=STOCK_MAP)
+    daily = state.daily()
+    return daily.rename(columns={'mean': 'sentiment'})[['stock', 'date', 'sentiment']]
+
 def preprocess_stock(stock_filepath):
-    stock_df = pd.read_csv(stock_filepath)
-    stock_df['Date'] = pd.to_datetime(stock_df['Date']).dt.date
-    stock_df = stock_df[['Date', 'Adj Close']].sort_values('Date')
-    stock_df['Return'] = stock_df['Adj Close'].pct_change()
-    stock_df.dropna(inplace=True)
-    return stock_df
-
-def merge_news_and_stock(news_df, stock_df, ticker):
+    return load_returns_panel([stock_filepath]).drop(columns='ticker')
+
+def merge_news_and_stock(news_df, stock_df, ticker, daily=False):
+    """
+    Joins a ticker's daily mean sentiment onto its returns. With daily=True,
+    news_df already holds one row per (stock, date), as returned by
+    preprocess_news_streaming.
+    """
     news_ticker_df = news_df[news_df['stock'] == ticker]
-    sentiment_df = news_ticker_df.groupby('date')['sentiment'].mean().reset_index()
+    if daily:
+        sentiment_df = news_ticker_df[['date', 'sentiment']].reset_index(drop=True)
+    else:
+        sentiment_df = news_ticker_df.groupby('date')['sentiment'].mean().reset_index()
     sentiment_df.rename(columns={'date': 'Date'}, inplace=True)
 
     merged = pd.merge(stock_df, sentiment_df, on='Date', how='inner')
     return merged
 
-def analyze_correlation(merged_df, ticker):
-    if len(merged_df) < 2:
-        print(f"[{ticker}] Not enough data to compute correlation.")
-        return None
+def load_returns_panel(stock_files):
+    """
+    Stacks the daily returns of every stock file into one long panel
+    with columns ['ticker', 'Date', 'Adj Close', 'Return'].
+    """
+    panel = load_price_panel(stock_files)
+    returns_df = panel.to_frame(['Adj Close'], returns='Adj Close')
+    returns_df['Date'] = returns_df['Date'].dt.date
+    return returns_df
 
-    corr, pval = pearsonr(merged_df['Return'], merged_df['sentiment'])
-    print(f"[{ticker}] Pearson Correlation: {corr:.4f}, p-value: {pval:.4e}")
+def daily_news_sentiment(news_df):
+    """
+    Groups scored headlines once by (stock, date) into daily mean sentiment.
+    """
+    return news_df.groupby(['stock', 'date'], sort=False)['sentiment'].mean().reset_index()
+
+def load_daily_sentiment(news_filepath, n_jobs=1, engine="textblob", chunksize=None):
+    # chunksize switches to the streaming path, which never loads the full news file
+    if chunksize:
+        return preprocess_news_streaming(news_filepath, chunksize, n_jobs=n_jobs, engine=engine)
+    return daily_news_sentiment(preprocess_news(news_filepath, n_jobs=n_jobs, engine=engine))
+
+def correlate_panel(daily_df, returns_panel, n_resamples=0, block_size=DEFAULT_BLOCK_SIZE, n_jobs=1):
+    """
+    Joins daily sentiment ('stock', 'date', 'sentiment') onto the returns
+    panel and computes Pearson r and p-value for every ticker in one pass.
+    Returns (results, merged); results has one row per ticker in the panel,
+    with NaN correlation where fewer than two days overlap. With n_resamples,
+    results also gets permutation p-values and block-bootstrap confidence
+    intervals ('perm_p_value', 'ci_low', 'ci_high').
+    """
+    sentiment = daily_df.rename(columns={'stock': 'ticker', 'date': 'Date'})
+    merged = returns_panel.merge(sentiment[['ticker', 'Date', 'sentiment']], on=['ticker', 'Date'], how='inner')
+    if n_resamples:
+        results = correlation_significance(merged, 'Return', 'sentiment', by='ticker', date_col='Date',
+                                           n_permutations=n_resamples, n_bootstrap=n_resamples,
+                                           block_size=block_size, n_jobs=n_jobs)
+    else:
+        results = pearson_by_group(merged, 'Return', 'sentiment', by='ticker')
+
+    tickers = pd.Index(returns_panel['ticker'].unique(), name='ticker')
+    results = results.set_index('ticker').reindex(tickers).reset_index()
+    results['n'] = results['n'].fillna(0).astype(int)
+    return results, merged
 
-    # Optional: plot
+def plot_correlation(merged_df, ticker, path=None):
+    fig = plt.figure()
     plt.scatter(merged_df['sentiment'], merged_df['Return'])
     plt.title(f"Sentiment vs Return for {ticker}")
     plt.xlabel("Average Daily Sentiment")
     plt.ylabel("Daily Return")
     plt.grid(True)
     plt.tight_layout()
-    plt.show()
+    return finish(fig, path)
+
+def analyze_correlation(merged_df, ticker, plot=True, path=None):
+    if len(merged_df) < 2:
+        print(f"[{ticker}] Not enough data to compute correlation.")
+        return None
+
+    corr, pval = pearsonr(merged_df['Return'], merged_df['sentiment'])
+    print(f"[{ticker}] Pearson Correlation: {corr:.4f}, p-value: {pval:.4e}")
+
+    if plot:
+        plot_correlation(merged_df, ticker, path=path)
 
     return corr, pval
 
-def run_analysis(stock_files, news_filepath):
-    news_df = preprocess_news(news_filepath)
+def run_analysis(stock_files, news_filepath, n_jobs=1, engine="textblob", chunksize=None, plot=False,
+                 n_resamples=0, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Correlates daily news sentiment with daily returns for every stock file.
+    News is grouped by (stock, date) once and joined against the combined
+    returns panel; all tickers are correlated in a single vectorized pass.
+    Returns a tidy DataFrame ['ticker', 'n', 'correlation', 'p_value'].
+    n_resamples > 0 adds permutation p-values and block-bootstrap confidence
+    intervals, since the returns are far from normal.
+    Scatter plots are only drawn with plot=True.
+    """
+    daily_df = load_daily_sentiment(news_filepath, n_jobs=n_jobs, engine=engine, chunksize=chunksize)
+    results, merged = correlate_panel(daily_df, load_returns_panel(stock_files), n_resamples=n_resamples,
+                                      block_size=block_size, n_jobs=n_jobs)
+    for row in results.itertuples(index=False):
+        if row.n < 2:
+            print(f"[{row.ticker}] Not enough data to compute correlation.")
+        elif n_resamples:
+            print(f"[{row.ticker}] Pearson Correlation: {row.correlation:.4f}, p-value: {row.p_value:.4e}, "
+                  f"permutation p-value: {row.perm_p_value:.4f}, 95% CI: [{row.ci_low:.4f}, {row.ci_high:.4f}]")
+        else:
+            print(f"[{row.ticker}] Pearson Correlation: {row.correlation:.4f}, p-value: {row.p_value:.4e}")
+
+    if plot:
+        for ticker, ticker_df in merged.groupby('ticker', sort=False):
+            if len(ticker_df) >= 2:
+                plot_correlation(ticker_df, ticker)
+
+    return results
+
+def run_lag_analysis(stock_files, news_filepath, lags=range(-10, 11), window=None, n_jobs=1, engine="textblob",
+                     chunksize=None):
+    """
+    Lead/lag study: correlates each ticker's daily sentiment with its
+    Adj Close return `lag` trading days later, for every lag at once.
+    Returns the tidy lag table ['ticker', 'lag', 'n', 'correlation', 'p_value'];
+    with window set, also the rolling correlations as a (lag, ticker, day)
+    array and the panel they were computed on.
+    """
+    daily_df = load_daily_sentiment(news_filepath, n_jobs=n_jobs, engine=engine, chunksize=chunksize)
+    panel = SentimentReturnPanel.from_frames(daily_df, load_price_panel(stock_files), field='Adj Close')
+    lagged = panel.lagged(lags)
+    if window is None:
+        return lagged
+    return lagged, panel.rolling_grid(window, lags=list(lags)), panel
 
-    for stock_file in stock_files:
-        ticker = os.path.basename(stock_file).split('_')[0]
-        stock_df = preprocess_stock(stock_file)
-        merged_df = merge_news_and_stock(news_df, stock_df, ticker)
-        analyze_correlation(merged_df, ticker)
+def run_event_study(stock_files, news_filepath, window=DEFAULT_WINDOW, by=('bucket',), field='Adj Close',
+                    market=None, n_jobs=1, engine="textblob"):
+    """
+    Market-adjusted event study of every headline: abnormal returns over
+    [-window, +window] trading days around the session each headline first
+    affects. Returns (summary per `by` group, e.g. ('bucket', 'ticker'),
+    and the per-event table).
+    """
+    events = load_news_events(news_filepath, n_jobs=n_jobs, engine=engine)
+    study = EventStudy(load_price_panel(stock_files), window=window, field=field, market=market)
+    results = study.run(events)
+    return summarize_events(results, by=by), results
@@ -0,0 +1,168 @@
+# src/correlation_engine.py
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+def pearson_p_value(r, n):
+    """
+    Two-sided p-value for Pearson r with n observations, the same test
+    scipy.stats.pearsonr applies, evaluated for whole arrays at once.
+    """
+    r = np.clip(np.asarray(r, dtype=float), -1.0, 1.0)
+    n = np.asarray(n, dtype=float)
+    dof = n - 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        p = 2 * stats.t.sf(np.abs(t), dof)
+    p = np.where(np.abs(r) == 1.0, 0.0, p)
+    return np.where(n > 2, p, np.where(n == 2, 1.0, np.nan))
+
+
+def pearson_by_group(df, x, y, by):
+    """
+    Pearson r and p-value of x vs y for every group in one vectorized pass.
+    Returns a tidy DataFrame with columns [by, 'n', 'correlation', 'p_value'].
+    Groups with fewer than two rows get NaN.
+    """
+    df = df[[by, x, y]].dropna()
+    grouped = df.groupby(by, sort=True)
+    dx = df[x] - grouped[x].transform("mean")
+    dy = df[y] - grouped[y].transform("mean")
+    sums = pd.DataFrame({by: df[by], "n": 1, "sxy": dx * dy, "sxx": dx ** 2, "syy": dy ** 2}).groupby(by).sum()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (sums["sxy"] / np.sqrt(sums["sxx"] * sums["syy"])).clip(-1.0, 1.0)
+    r = r.where(sums["n"] > 1)
+    return pd.DataFrame({
+        by: sums.index,
+        "n": sums["n"].to_numpy(),
+        "correlation": r.to_numpy(),
+        "p_value": pearson_p_value(r.to_numpy(), sums["n"].to_numpy()),
+    }).reset_index(drop=True)
+
+
+def _masked_pearson(x, y):
+    """
+    Row-wise Pearson r of two (ticker, day) arrays over the days where
+    both are present. Returns (n, r).
+    """
+    mask = ~(np.isnan(x) | np.isnan(y))
+    n = mask.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dx = np.where(mask, x - np.where(mask, x, 0).sum(axis=1, keepdims=True) / n[:, None], 0.0)
+        dy = np.where(mask, y - np.where(mask, y, 0).sum(axis=1, keepdims=True) / n[:, None], 0.0)
+        r = (dx * dy).sum(axis=1) / np.sqrt((dx ** 2).sum(axis=1) * (dy ** 2).sum(axis=1))
+    return n, np.where(n > 1, np.clip(r, -1.0, 1.0), np.nan)
+
+
+def _shift(values, lag):
+    """values[:, t + lag] at column t, NaN-padded at the edges."""
+    out = np.full(values.shape, np.nan)
+    if lag >= 0:
+        out[:, :values.shape[1] - lag] = values[:, lag:]
+    else:
+        out[:, -lag:] = values[:, :values.shape[1] + lag]
+    return out
+
+
+class SentimentReturnPanel:
+    """
+    Daily sentiment and returns aligned on one (ticker, trading day) grid, so
+    lead/lag and rolling correlations run for every ticker at once.
+    A lag of k pairs sentiment on day t with the return k trading days later.
+    """
+
+    def __init__(self, tickers, dates, sentiment, returns):
+        self.tickers = list(tickers)
+        self.dates = pd.DatetimeIndex(dates)
+        self.sentiment = np.asarray(sentiment, dtype=float)
+        self.returns = np.asarray(returns, dtype=float)
+
+    @classmethod
+    def from_frames(cls, daily_df, price_panel, field="Close", date_col="date", value_col="sentiment"):
+        """
+        Places daily sentiment onto the price panel's trading days; days
+        without news are NaN and news on non-trading days is dropped.
+        With a 'stock' column each ticker gets its own series; without one,
+        the same market-wide series is used for every ticker.
+        """
+        returns = price_panel.returns(field)
+        sentiment = np.full(returns.shape, np.nan)
+        days = pd.DatetimeIndex(pd.to_datetime(daily_df[date_col])).normalize().asi8
+        cols = np.minimum(np.searchsorted(price_panel.dates, days), max(len(price_panel.dates) - 1, 0))
+        found = (price_panel.dates[cols] == days) if len(price_panel.dates) else np.zeros(len(days), bool)
+        values = daily_df[value_col].to_numpy(dtype=float)
+
+        if "stock" in daily_df.columns:
+            rows = pd.Index(price_panel.tickers).get_indexer(daily_df["stock"])
+            found &= rows >= 0
+            sentiment[rows[found], cols[found]] = values[found]
+        else:
+            sentiment[:, cols[found]] = values[found]
+        return cls(price_panel.tickers, price_panel.dates.view("datetime64[ns]"), sentiment, returns)
+
+    def lagged(self, lags=range(-10, 11)):
+        """
+        Pearson r and p-value of sentiment(t) vs return(t + lag) for every
+        ticker and lag. Returns a tidy DataFrame ['ticker', 'lag', 'n',
+        'correlation', 'p_value'].
+        """
+        lags = np.asarray(list(lags), dtype=np.int64)
+        n = np.empty((len(lags), len(self.tickers)), dtype=np.int64)
+        r = np.empty((len(lags), len(self.tickers)))
+        for k, lag in enumerate(lags):
+            n[k], r[k] = _masked_pearson(self.sentiment, _shift(self.returns, lag))
+        return pd.DataFrame({
+            "ticker": np.tile(np.asarray(self.tickers, dtype=object), len(lags)),
+            "lag": np.repeat(lags, len(self.tickers)),
+            "n": n.ravel(),
+            "correlation": r.ravel(),
+            "p_value": pearson_p_value(r.ravel(), n.ravel()),
+        })
+
+    def rolling_grid(self, window=60, lags=(0,), min_periods=None):
+        """
+        Rolling Pearson r over the last `window` trading days, for every lag,
+        ticker and day: an array of shape (lag, ticker, day) where day t holds
+        the window ending at t, matching pandas rolling(window,
+        min_periods).corr(). Windows use cumulative sums of the centred
+        series, so the cost does not grow with the window length. A window
+        needs min_periods paired days (default window, as in pandas).
+        """
+        min_periods = max(window if min_periods is None else min_periods, 2)
+        out = np.full((len(lags), len(self.tickers), len(self.dates)), np.nan)
+
+        # Running sums of n, x, y, xx, yy, xy; the buffer is reused for every lag
+        cumulative = np.zeros((6, len(self.tickers), len(self.dates) + 1))
+        for k, lag in enumerate(lags):
+            x, y = self.sentiment, _shift(self.returns, lag)
+            mask = ~(np.isnan(x) | np.isnan(y))
+            # Centre each ticker's series first so the running sums stay well conditioned
+            with np.errstate(invalid="ignore", divide="ignore"):
+                count = mask.sum(axis=1, keepdims=True)
+                x = np.where(mask, x, 0.0)
+                y = np.where(mask, y, 0.0)
+                x -= np.where(mask, x.sum(axis=1, keepdims=True) / count, 0.0)
+                y -= np.where(mask, y.sum(axis=1, keepdims=True) / count, 0.0)
+
+            for j, values in enumerate((mask, x, y, x * x, y * y, x * y)):
+                np.cumsum(values, axis=1, out=cumulative[j, :, 1:])
+            # Window sums ending at each day; the first window - 1 days get partial windows, as in pandas
+            sums = cumulative[:, :, 1:].copy()
+            sums[:, :, window:] -= cumulative[:, :, 1:-window]
+            n, sx, sy, sxx, syy, sxy = sums
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cov = sxy - sx * sy / n
+                var_x = np.maximum(sxx - sx ** 2 / n, 0)
+                var_y = np.maximum(syy - sy ** 2 / n, 0)
+                r = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+            out[k] = np.where(np.rint(n) >= min_periods, r, np.nan)
+        return out
+
+    def rolling(self, window=60, lag=0, min_periods=None):
+        """Rolling correlation for one lag as a (date x ticker) DataFrame."""
+        grid = self.rolling_grid(window, lags=(lag,), min_periods=min_periods)[0]
+        return pd.DataFrame(grid.T, index=self.dates.rename("Date"), columns=self.tickers)
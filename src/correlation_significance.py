@@ -0,0 +1,127 @@
+# src/correlation_significance.py
+
+import numpy as np
+import pandas as pd
+from functools import partial
+from src.ticker_pool import map_tickers
+from src.correlation_engine import pearson_by_group
+
+DEFAULT_PERMUTATIONS = 5_000
+DEFAULT_BOOTSTRAP = 2_000
+DEFAULT_BLOCK_SIZE = 5
+# Resamples drawn per batch, so index matrices stay a few MB for long series
+BATCH_SIZE = 1_000
+
+
+def permutation_indices(n, n_resamples, rng):
+    """(n_resamples, n) matrix whose rows are independent permutations of range(n)."""
+    return np.argsort(rng.random((n_resamples, n)), axis=1)
+
+
+def block_bootstrap_indices(n, n_resamples, block_size, rng):
+    """
+    (n_resamples, n) moving-block bootstrap indices: each row chains random
+    blocks of block_size consecutive days (wrapping around), which keeps the
+    short-range autocorrelation of daily series inside each block.
+    """
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(n_resamples, n_blocks))
+    indices = (starts[:, :, None] + np.arange(block_size)) % n
+    return indices.reshape(n_resamples, -1)[:, :n]
+
+
+def _standardize(values):
+    centred = values - values.mean(axis=-1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return centred / np.sqrt((centred ** 2).sum(axis=-1, keepdims=True))
+
+
+def permutation_correlations(x, y, n_resamples, rng):
+    """
+    Correlations of x with n_resamples shuffles of y. With both series
+    standardized once, every replicate is a row of one matrix-vector product.
+    """
+    zx, zy = _standardize(x), _standardize(y)
+    out = np.empty(n_resamples)
+    for start in range(0, n_resamples, BATCH_SIZE):
+        size = min(BATCH_SIZE, n_resamples - start)
+        out[start:start + size] = zy[permutation_indices(len(y), size, rng)] @ zx
+    return out
+
+
+def bootstrap_correlations(x, y, n_resamples, block_size, rng):
+    """Correlations of n_resamples block-bootstrap resamples of the (x, y) pairs."""
+    out = np.empty(n_resamples)
+    for start in range(0, n_resamples, BATCH_SIZE):
+        size = min(BATCH_SIZE, n_resamples - start)
+        idx = block_bootstrap_indices(len(x), size, block_size, rng)
+        out[start:start + size] = (_standardize(x[idx]) * _standardize(y[idx])).sum(axis=1)
+    return out
+
+
+def _group_significance(x, y, seed, n_permutations, n_bootstrap, block_size, ci):
+    """Resampling statistics for one group."""
+    row = {"perm_p_value": np.nan, "ci_low": np.nan, "ci_high": np.nan}
+    if len(x) < 3:
+        return row
+
+    r = float((_standardize(x) * _standardize(y)).sum())
+    perm_rng, boot_rng = [np.random.default_rng(s) for s in seed.spawn(2)]
+    if n_permutations:
+        null = permutation_correlations(x, y, n_permutations, perm_rng)
+        # Add-one estimate, so a p-value is never reported as exactly zero
+        row["perm_p_value"] = (np.sum(np.abs(null) >= abs(r) - 1e-12) + 1) / (n_permutations + 1)
+    if n_bootstrap:
+        replicates = bootstrap_correlations(x, y, n_bootstrap, block_size, boot_rng)
+        alpha = (1 - ci) / 2
+        row["ci_low"], row["ci_high"] = np.nanquantile(replicates, [alpha, 1 - alpha])
+    return row
+
+
+def _shared_group_significance(i, shared, random_state, **options):
+    """Task for group i; its rows are a slice of the shared, group-sorted x and y arrays."""
+    start, end = shared["bounds"][i]
+    # Same stream as SeedSequence(random_state).spawn(n)[i], without spawning all n
+    seed = np.random.SeedSequence(random_state, spawn_key=(int(i),))
+    return _group_significance(shared["x"][start:end], shared["y"][start:end], seed, **options)
+
+
+def correlation_significance(df, x="Return", y="sentiment", by="ticker", date_col=None,
+                             n_permutations=DEFAULT_PERMUTATIONS, n_bootstrap=DEFAULT_BOOTSTRAP,
+                             block_size=DEFAULT_BLOCK_SIZE, ci=0.95, n_jobs=1, random_state=42):
+    """
+    Distribution-free significance for the Pearson correlation of x and y in
+    every group: a permutation p-value and a moving-block bootstrap
+    confidence interval, next to the parametric r and p-value.
+
+    Rows are resampled in date order (date_col, if given) so bootstrap blocks
+    are runs of consecutive days. Groups are spread over n_jobs processes
+    that read x and y from shared memory; each group gets its own seed
+    stream, so results do not depend on n_jobs.
+    Returns [by, 'n', 'correlation', 'p_value', 'perm_p_value', 'ci_low', 'ci_high'].
+    Groups whose resampling fails keep NaN resampling columns; a warning is
+    printed and their tracebacks are kept in the result's attrs['failures'].
+    """
+    df = df.dropna(subset=[x, y])
+    df = df.sort_values([by, date_col] if date_col is not None else [by], kind="stable")
+    results = pearson_by_group(df, x, y, by)
+
+    codes, keys = pd.factorize(df[by], sort=True)
+    # Missing keys sort last and belong to no group
+    n_rows = int((codes >= 0).sum())
+    starts = np.searchsorted(codes[:n_rows], np.arange(len(keys)))
+    bounds = np.column_stack([starts, np.append(starts[1:], n_rows)])
+    arrays = {"x": df[x].to_numpy(float), "y": df[y].to_numpy(float), "bounds": bounds}
+    task = partial(_shared_group_significance, random_state=random_state, n_permutations=n_permutations,
+                   n_bootstrap=n_bootstrap, block_size=block_size, ci=ci)
+    rows, failures = map_tickers(task, range(len(keys)), arrays=arrays, n_jobs=n_jobs, verbose=False)
+    failures = {keys[i]: error for i, error in failures.items()}
+    for key, error in failures.items():
+        print(f"Warning: [{key}] significance failed: {error.strip().splitlines()[-1]}")
+
+    extra = pd.DataFrame.from_dict({keys[i]: row for i, row in rows.items()}, orient="index",
+                                   columns=["perm_p_value", "ci_low", "ci_high"])
+    results = results.join(extra, on=by)
+    results.attrs["failures"] = failures
+    return results
@@ -0,0 +1,123 @@
+# src/dashboard_data.py
+
+import os
+import glob
+import numpy as np
+import pandas as pd
+from src.charts import DEFAULT_MAX_POINTS, downsample
+from src.correlation_analysis import load_news_events
+from src.correlation_engine import pearson_by_group
+from src.date_alignment import DEFAULT_CUTOFF, TradingCalendar
+from src.date_parsing import EXCHANGE_TZ
+from src.event_study import sentiment_buckets
+from src.price_panel import load_price_panel
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+NEWS_FILE = os.path.join(DATA_DIR, "raw_analyst_ratings.csv")
+STOCK_PATTERN = os.path.join(DATA_DIR, "yfinance", "*_historical_data.csv")
+
+
+def find_stock_files(pattern=STOCK_PATTERN):
+    return sorted(glob.glob(pattern))
+
+
+def daily_aggregates(price_panel, events, field="Close", cutoff=DEFAULT_CUTOFF, tz=EXCHANGE_TZ, news_tz="UTC"):
+    """
+    One row per (ticker, trading day) of the panel, sorted by ticker then
+    date: 'ticker', 'Date', field, 'Return', 'news_count', 'positive' and
+    'negative' headline counts, and 'mean_sentiment' (NaN on days without
+    news). events holds 'stock', 'date' and 'sentiment' (see
+    load_news_events); headlines are attributed to the session they can
+    first move, and all of them are binned with one bincount per column.
+    """
+    tickers = list(price_panel.tickers)
+    n_days = len(price_panel.dates)
+    size = len(tickers) * n_days
+    # Panel dates are sorted and unique, so session positions are panel day indices
+    calendar = TradingCalendar(pd.DatetimeIndex(price_panel.dates.view("datetime64[ns]")), cutoff=cutoff, tz=tz)
+    rows = pd.Index(tickers).get_indexer(events["stock"].to_numpy())
+    days = calendar.sessions(events["date"], news_tz=news_tz)
+    keep = (rows >= 0) & (days >= 0)
+    keys = rows[keep] * n_days + days[keep]
+
+    sentiment = events["sentiment"].to_numpy(dtype=float)[keep]
+    scored = ~np.isnan(sentiment)
+    buckets = sentiment_buckets(sentiment)
+    sums = np.bincount(keys[scored], weights=sentiment[scored], minlength=size)
+    n_scored = np.bincount(keys[scored], minlength=size)
+
+    # Rows of to_frame(dropna=False) are ticker-major, the same layout as keys
+    daily = price_panel.to_frame([field], returns=field, dropna=False)
+    daily["news_count"] = np.bincount(keys, minlength=size)
+    daily["positive"] = np.bincount(keys[buckets == "positive"], minlength=size)
+    daily["negative"] = np.bincount(keys[buckets == "negative"], minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        daily["mean_sentiment"] = np.where(n_scored > 0, sums / np.maximum(n_scored, 1), np.nan)
+    return daily[daily[field].notna()].reset_index(drop=True)
+
+
+def load_daily_aggregates(stock_files, news_file, field="Close", n_jobs=1, engine="textblob"):
+    """daily_aggregates from the files, through the price panel, news and sentiment caches."""
+    return daily_aggregates(load_price_panel(stock_files), load_news_events(news_file, n_jobs=n_jobs, engine=engine),
+                            field=field)
+
+
+class DashboardData:
+    """
+    Read-only view over daily aggregates for interactive use. Row positions
+    of every ticker are indexed once, so each query only touches the rows of
+    the selected tickers and dates.
+    """
+
+    def __init__(self, daily, field="Close"):
+        self.daily = daily
+        self.field = field
+        self.tickers = sorted(daily["ticker"].unique())
+        self._rows = daily.groupby("ticker", sort=False).indices
+        self.start = daily["Date"].min()
+        self.end = daily["Date"].max()
+
+    def select(self, tickers=None, start=None, end=None):
+        """Rows of the given tickers (default: all) between start and end (inclusive)."""
+        if tickers is None:
+            df = self.daily
+        else:
+            positions = [self._rows[t] for t in tickers if t in self._rows]
+            df = self.daily.iloc[np.sort(np.concatenate(positions))] if positions else self.daily.iloc[:0]
+        mask = np.ones(len(df), dtype=bool)
+        if start is not None:
+            mask &= (df["Date"] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (df["Date"] <= pd.Timestamp(end)).to_numpy()
+        return df[mask]
+
+    def top(self, column, n=10, tickers=None, start=None, end=None, smallest=False):
+        """The n (ticker, day) rows with the largest (or smallest) value of column."""
+        df = self.select(tickers, start, end)
+        return df.nsmallest(n, column) if smallest else df.nlargest(n, column)
+
+    def summary(self, tickers=None, start=None, end=None):
+        """
+        Per-ticker totals over the selection: trading days, days with news,
+        headlines, average daily sentiment, compounded return, and the
+        correlation of daily return with mean sentiment.
+        """
+        df = self.select(tickers, start, end)
+        grouped = df.groupby("ticker", sort=True)
+        out = pd.DataFrame({
+            "days": grouped.size(),
+            "news_days": (df["news_count"] > 0).groupby(df["ticker"], sort=True).sum(),
+            "headlines": grouped["news_count"].sum(),
+            "mean_sentiment": grouped["mean_sentiment"].mean(),
+            # Compounded through log returns so the whole table is one groupby pass per column
+            "total_return": np.expm1(np.log1p(df["Return"]).groupby(df["ticker"], sort=True).sum()),
+        })
+        corr = pearson_by_group(df, "Return", "mean_sentiment", by="ticker").set_index("ticker")
+        out["correlation"] = corr["correlation"]
+        out["p_value"] = corr["p_value"]
+        return out.reset_index()
+
+    def series(self, ticker, column, start=None, end=None, max_points=DEFAULT_MAX_POINTS):
+        """One ticker's column indexed by Date, downsampled (LTTB) to at most max_points."""
+        df = self.select([ticker], start, end)[["Date", column]].dropna().set_index("Date")
+        return downsample(df, column, max_points)
@@ -1,28 +1,161 @@
+import numpy as np
 import pandas as pd
+from datetime import time
+from src.date_parsing import EXCHANGE_TZ, NewsDateParser, localize
+from src.news_dataset import read_news
+from src.price_panel import _parse_trading_days
+
+# Regular-session close: news at or after it belongs to the next session
+DEFAULT_CUTOFF = "16:00"
+
+
+def _cutoff_offset(cutoff):
+    cutoff = time.fromisoformat(cutoff) if isinstance(cutoff, str) else cutoff
+    return pd.Timedelta(hours=cutoff.hour, minutes=cutoff.minute, seconds=cutoff.second)
+
+
+def _trading_days(dates):
+    """Midnight timestamps of the trading days in a 'Date' column of strings, dates or timestamps."""
+    dates = pd.Series(dates)
+    return _parse_trading_days(dates.astype(str) if dates.dtype == object else dates)
+
+
+def _localize(local_times, tz):
+    """Wall-clock times in tz to UTC int64 nanoseconds, with the DST policy of date_parsing.localize."""
+    return localize(local_times, tz).asi8
+
+
+def _utc_nanoseconds(timestamps, news_tz="UTC"):
+    """
+    News timestamps as UTC int64 nanoseconds (NaT stays NaT's integer).
+    Strings are parsed with NewsDateParser; naive values are read as news_tz.
+    """
+    timestamps = pd.Series(timestamps)
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        return NewsDateParser(naive_tz=news_tz).parse(timestamps).to_numpy("datetime64[ns]").view("i8")
+    if timestamps.dt.tz is None:
+        return localize(timestamps, news_tz).to_numpy("datetime64[ns]").view("i8")
+    return timestamps.dt.tz_convert(None).to_numpy("datetime64[ns]").view("i8")
+
+
+class TradingCalendar:
+    """
+    Trading sessions as a sorted array of cutoff instants. A headline belongs
+    to the first session whose cutoff (default 16:00 exchange time) is later
+    than its timestamp, so after-close, weekend and holiday news roll forward
+    to the next session that actually trades. One searchsorted call maps any
+    number of headlines.
+    """
+
+    def __init__(self, trading_days, cutoff=DEFAULT_CUTOFF, tz=EXCHANGE_TZ):
+        days = pd.DatetimeIndex(_trading_days(trading_days).dropna().unique()).sort_values()
+        self.cutoff = cutoff
+        self.tz = tz
+        cutoffs = _localize(days + _cutoff_offset(cutoff), tz)
+        # A cutoff inside a repeated DST hour has no single instant; that session cannot be placed
+        placed = cutoffs != pd.NaT.value
+        if not placed.all():
+            print(f"Warning: {(~placed).sum()} trading day(s) have an ambiguous {cutoff} cutoff in {tz}; "
+                  f"they are left out of the calendar.")
+        self.days, self.cutoffs = days[placed], cutoffs[placed]
+        # News before the first trading day cannot be placed: its earlier sessions are unknown
+        self.start = _localize(self.days[:1], tz)[0] if len(self.days) else np.iinfo(np.int64).max
+
+    def __len__(self):
+        return len(self.days)
+
+    def sessions(self, timestamps, news_tz="UTC"):
+        """Session position of every timestamp; -1 if missing or outside the calendar."""
+        return self._positions(_utc_nanoseconds(timestamps, news_tz))
+
+    def _positions(self, nanoseconds):
+        positions = np.searchsorted(self.cutoffs, nanoseconds, side="right")
+        outside = (nanoseconds == np.iinfo(np.int64).min) | (nanoseconds < self.start) | (positions >= len(self))
+        return np.where(outside, -1, positions)
+
+    def aggregate(self, news_df, date_col="date", value_cols=(), news_tz="UTC"):
+        """
+        Per-session numeric aggregates of the news rows: 'news_count', the
+        index label of the session's earliest headline ('first_headline') and
+        'mean_<col>' for every value column (NaNs ignored). Only sessions
+        with news are returned, keyed by 'Date'; the number of rows that fell
+        outside the calendar is stored in self.unassigned.
+        """
+        nanoseconds = _utc_nanoseconds(news_df[date_col], news_tz)
+        positions = self._positions(nanoseconds)
+        rows = np.flatnonzero(positions >= 0)
+        positions = positions[rows]
+        self.unassigned = len(news_df) - len(rows)
+
+        counts = np.bincount(positions, minlength=len(self))
+        has_news = np.flatnonzero(counts)
+        out = pd.DataFrame({"Date": self.days[has_news], "news_count": counts[has_news]})
+        if not len(rows):
+            # No headline falls in the calendar (or there are none): same columns, no sessions
+            out["first_headline"] = news_df.index[:0]
+            for col in value_cols:
+                out[f"mean_{col}"] = np.array([], dtype=float)
+            return out
+
+        # Earliest headline per session: sort by (session, time, row) and take each run's head
+        order = np.lexsort((rows, nanoseconds[rows], positions))
+        heads = order[np.flatnonzero(np.r_[True, np.diff(positions[order]) != 0])]
+        out["first_headline"] = news_df.index[rows[heads]]
+
+        for col in value_cols:
+            values = pd.to_numeric(news_df[col], errors="coerce").to_numpy(dtype=float)[rows]
+            ok = ~np.isnan(values)
+            sums = np.bincount(positions[ok], weights=values[ok], minlength=len(self))[has_news]
+            n = np.bincount(positions[ok], minlength=len(self))[has_news]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[f"mean_{col}"] = np.where(n > 0, sums / np.maximum(n, 1), np.nan)
+        return out
+
 
 class DateAligner:
-    def __init__(self, news_df: pd.DataFrame, stock_df: pd.DataFrame):
+    """
+    Aligns news to the trading session it can first affect and joins the
+    per-session aggregates to the stock rows. cutoff and tz set the session
+    boundary; naive news timestamps are read as news_tz (NewsDateParser
+    yields UTC). value_cols defaults to the numeric news columns.
+    """
+
+    def __init__(self, news_df: pd.DataFrame, stock_df: pd.DataFrame, cutoff=DEFAULT_CUTOFF, tz=EXCHANGE_TZ,
+                 news_tz="UTC", value_cols=None):
         self.news_df = news_df.copy()
         self.stock_df = stock_df.copy()
+        self.cutoff = cutoff
+        self.tz = tz
+        self.news_tz = news_tz
+        self.value_cols = value_cols
+        self.calendar = None
+        self.sessions_df = None
 
-    def preprocess(self):
-        # Ensure datetime format
-        self.news_df["date"] = pd.to_datetime(self.news_df["date"], errors='coerce').dt.date
-        self.stock_df["Date"] = pd.to_datetime(self.stock_df["Date"], errors='coerce').dt.date
+    @classmethod
+    def from_dataset(cls, file_path, stock_df: pd.DataFrame, tickers=None, start=None, end=None, tz=None,
+                     value_cols=None, **options):
+        # Only the date and value columns are read, from the partitions the filters select
+        news_df = read_news(file_path, tickers=tickers, start=start, end=end,
+                            columns=["date"] + list(value_cols or []), tz=tz)
+        return cls(news_df, stock_df, news_tz=tz or "UTC", value_cols=value_cols, **options)
 
-        # Drop rows with missing dates
-        self.news_df.dropna(subset=["date"], inplace=True)
+    def preprocess(self):
+        self.stock_df["Date"] = _trading_days(self.stock_df["Date"]).to_numpy()
         self.stock_df.dropna(subset=["Date"], inplace=True)
+        self.calendar = TradingCalendar(self.stock_df["Date"], cutoff=self.cutoff, tz=self.tz)
+        if self.value_cols is None:
+            self.value_cols = [c for c in self.news_df.select_dtypes("number").columns if c != "date"]
 
-    def aggregate_news_by_date(self):
-        # Aggregate all headlines per day
-        self.news_df = self.news_df.groupby("date")["headline"].apply(lambda x: " ".join(x)).reset_index()
+    def aggregate_news_by_session(self):
+        self.sessions_df = self.calendar.aggregate(self.news_df, value_cols=self.value_cols, news_tz=self.news_tz)
+        if self.calendar.unassigned:
+            print(f"Warning: {self.calendar.unassigned} headlines fall outside the trading calendar "
+                  f"or have no date and were not aligned.")
+        return self.sessions_df
 
     def align(self):
         self.preprocess()
-        self.aggregate_news_by_date()
-
-        # Merge on date
-        merged = pd.merge(self.news_df, self.stock_df, left_on="date", right_on="Date", how="inner")
+        self.aggregate_news_by_session()
 
-        return merged
+        # Every session row already carries a trading day, so the join is on exact dates
+        return pd.merge(self.stock_df, self.sessions_df, on="Date", how="inner")
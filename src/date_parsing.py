@@ -0,0 +1,153 @@
+# src/date_parsing.py
+
+import numpy as np
+import pandas as pd
+
+EXCHANGE_TZ = "America/New_York"
+
+# Formats seen in raw_analyst_ratings.csv, most specific first
+KNOWN_FORMATS = [
+    '%Y-%m-%d %H:%M:%S%z',  # ISO with timezone
+    '%Y-%m-%d %H:%M:%S',    # ISO without timezone
+    '%Y-%m-%d',             # Just date
+    '%m/%d/%Y %H:%M',       # US format with time
+    '%m/%d/%Y',             # US format without time
+]
+MIXED = "mixed"
+# A time followed by a UTC offset or zone marker, for values only format='mixed' can read
+HAS_OFFSET = r"\d:\d{2}(?::\d{2}(?:\.\d+)?)?\s*(?:[zZ]|UTC|GMT|[+-]\d{2}(?::?\d{2})?)$"
+
+
+def convert_timezone(dates, tz=None, naive=None):
+    """
+    Converts timezone-naive UTC timestamps to naive wall-clock time in tz.
+    tz=None leaves the values in UTC. naive flags rows that had no offset in
+    the source and were stored as written; they are taken as wall-clock time
+    in tz already and left unchanged.
+    """
+    if tz is None or tz == "UTC":
+        return dates
+    converted = dates.dt.tz_localize("UTC").dt.tz_convert(tz).dt.tz_localize(None)
+    if naive is None:
+        return converted
+    return converted.where(~np.asarray(naive, dtype=bool), dates)
+
+
+def localize(dates, tz, ambiguous="NaT", nonexistent="shift_forward"):
+    """
+    Reads naive wall-clock timestamps (a Series or DatetimeIndex) as tz and
+    returns them as naive UTC.
+    Times repeated by a DST fall-back are NaT, and times skipped by a
+    spring-forward move to the first valid time after the gap.
+    """
+    if isinstance(dates, pd.Series):
+        return dates.dt.tz_localize(tz, ambiguous=ambiguous, nonexistent=nonexistent).dt.tz_convert(None)
+    return pd.DatetimeIndex(dates).tz_localize(tz, ambiguous=ambiguous, nonexistent=nonexistent).tz_convert(None)
+
+
+class NewsDateParser:
+    """
+    Vectorized parser for the mixed-format news 'date' column.
+
+    Each distinct string is parsed once. A sample of them decides which of
+    KNOWN_FORMATS are present, then every format group is parsed with a single
+    pd.to_datetime call. Anything left over goes through format='mixed'.
+    Values without an offset (including date-only ones) are read as naive_tz,
+    which defaults to tz, or UTC when no tz is given; DST edges are handled
+    as in localize. After parse, self.naive flags the rows that had no offset.
+    """
+
+    def __init__(self, tz=None, naive_tz=None, sample_size=5000, random_state=42):
+        self.tz = tz
+        self.naive_tz = naive_tz or tz or "UTC"
+        self.sample_size = sample_size
+        self.random_state = random_state
+        self.report = None
+        self.naive = None
+
+    def detect_formats(self, values):
+        """
+        Returns the known formats that match at least one sampled value,
+        ordered by how many sampled values they match.
+        """
+        values = pd.Series(values, dtype=object).dropna()
+        if len(values) > self.sample_size:
+            values = values.sample(n=self.sample_size, random_state=self.random_state)
+
+        hits = {}
+        for fmt in KNOWN_FORMATS:
+            matched = self._parse_format(values, fmt).notna().sum()
+            if matched:
+                hits[fmt] = matched
+        return sorted(hits, key=hits.get, reverse=True)
+
+    def _parse_format(self, values, fmt):
+        if fmt == MIXED:
+            parsed = pd.to_datetime(values, format=MIXED, errors="coerce", utc=True)
+            naive = ~values.str.contains(HAS_OFFSET)
+            if naive.any():
+                # format='mixed' would read these as UTC; they belong to naive_tz like the known formats
+                parsed[naive] = self._parse_naive(values[naive], MIXED)
+            return parsed
+        if "%z" in fmt:
+            return pd.to_datetime(values, format=fmt, errors="coerce", utc=True)
+        return self._parse_naive(values, fmt)
+
+    def _parse_naive(self, values, fmt):
+        parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+        return localize(parsed, self.naive_tz).dt.tz_localize("UTC")
+
+    def parse(self, dates):
+        """
+        Parses a Series of date strings into timezone-naive timestamps in
+        self.tz (UTC when tz is None). Per-format row counts and the number
+        of failures are stored in self.report.
+        """
+        dates = pd.Series(dates)
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            self.naive = np.full(len(dates), getattr(dates.dt, "tz", None) is None)
+            if getattr(dates.dt, "tz", None) is not None:
+                dates = dates.dt.tz_convert(None)
+            elif self.naive_tz != "UTC":
+                dates = localize(dates, self.naive_tz)
+            self.report = {"formats": {"datetime": int(dates.notna().sum())},
+                           "missing": int(dates.isna().sum()), "failed": 0}
+            return convert_timezone(dates, self.tz)
+
+        codes, uniques = pd.factorize(dates.astype(object))
+        values = pd.Series(np.asarray(uniques, dtype=str)).str.strip()
+        rows_per_value = np.bincount(codes[codes >= 0], minlength=len(values))
+
+        parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns, UTC]")
+        detected = self.detect_formats(values)
+        fallback = [fmt for fmt in KNOWN_FORMATS if fmt not in detected] + [MIXED]
+
+        naive = np.ones(len(values), dtype=bool)
+        counts = {}
+        pending = values
+        for fmt in detected + fallback:
+            if pending.empty:
+                break
+            result = self._parse_format(pending, fmt)
+            ok = result.notna().to_numpy()
+            if not ok.any():
+                continue
+            parsed.iloc[pending.index[ok]] = result[ok].to_numpy()
+            if "%z" in fmt:
+                naive[pending.index[ok]] = False
+            elif fmt == MIXED:
+                naive[pending.index[ok]] = ~pending[ok].str.contains(HAS_OFFSET).to_numpy()
+            counts[fmt] = int(rows_per_value[pending.index[ok]].sum())
+            pending = pending[~ok]
+
+        self.report = {
+            "formats": counts,
+            "missing": int((codes < 0).sum()),
+            "failed": int(rows_per_value[pending.index].sum()),
+        }
+
+        self.naive = naive[codes] & (codes >= 0)
+        utc = parsed.dt.tz_convert(None).to_numpy()
+        utc = np.append(utc, np.datetime64("NaT", "ns"))
+        result = pd.Series(utc[codes], index=dates.index, name=dates.name)
+        return convert_timezone(result, self.tz)
@@ -0,0 +1,119 @@
+# src/event_study.py
+
+import numpy as np
+import pandas as pd
+from src.date_parsing import EXCHANGE_TZ
+from src.date_alignment import DEFAULT_CUTOFF, TradingCalendar
+
+DEFAULT_WINDOW = 5
+# Same polarity cut-offs as HeadlineSentimentAnalyzer's positive / neutral / negative labels
+SENTIMENT_THRESHOLD = 0.1
+
+
+def sentiment_buckets(polarity, threshold=SENTIMENT_THRESHOLD):
+    """'positive' above threshold, 'negative' below -threshold, else 'neutral' (NaN included)."""
+    polarity = np.asarray(polarity, dtype=float)
+    return np.where(polarity > threshold, "positive", np.where(polarity < -threshold, "negative", "neutral"))
+
+
+def market_returns(returns, market=None):
+    """
+    Benchmark return per day: the row of the market ticker index if given,
+    else the equal-weighted mean of every ticker with a return that day.
+    """
+    if market is not None:
+        return returns[market]
+    valid = ~np.isnan(returns)
+    count = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, np.where(valid, returns, 0.0).sum(axis=0) / count, np.nan)
+
+
+def offset_label(offset):
+    return f"AR[{offset:+d}]"
+
+
+class EventStudy:
+    """
+    Market-adjusted event study on a PricePanel. Abnormal returns
+    (ticker return minus the market return) are computed once for the whole
+    panel. Every event is a (ticker, session) pair: headlines are mapped to
+    the session they can first move (see TradingCalendar), and the
+    [-window, +window] abnormal returns of all events are gathered with one
+    fancy-indexing step on precomputed day offsets.
+    """
+
+    def __init__(self, price_panel, window=DEFAULT_WINDOW, field="Close", market=None, cutoff=DEFAULT_CUTOFF,
+                 tz=EXCHANGE_TZ):
+        self.panel = price_panel
+        self.window = window
+        self.offsets = np.arange(-window, window + 1)
+        returns = price_panel.returns(field)
+        market_index = None if market is None else price_panel.ticker_index(market)
+        self.market = market_returns(returns, market_index)
+        self.abnormal = returns - self.market[None, :]
+        # Panel dates are sorted and unique, so session positions are panel day indices
+        self.calendar = TradingCalendar(pd.DatetimeIndex(price_panel.dates.view("datetime64[ns]")), cutoff=cutoff,
+                                        tz=tz)
+
+    def locate(self, tickers, timestamps, news_tz="UTC"):
+        """(ticker row, panel day) of each event; -1 where the ticker or session is unknown."""
+        rows = pd.Index(self.panel.tickers).get_indexer(pd.Series(tickers).to_numpy())
+        return rows, self.calendar.sessions(timestamps, news_tz=news_tz)
+
+    def abnormal_returns(self, rows, days):
+        """(n_events, 2 * window + 1) abnormal returns around each event day; NaN outside the panel."""
+        n_days = self.abnormal.shape[1]
+        window_days = days[:, None] + self.offsets[None, :]
+        inside = (rows[:, None] >= 0) & (days[:, None] >= 0) & (window_days >= 0) & (window_days < n_days)
+        values = self.abnormal[np.maximum(rows, 0)[:, None], np.clip(window_days, 0, n_days - 1)]
+        return np.where(inside, values, np.nan)
+
+    def run(self, events, ticker_col="stock", date_col="date", sentiment_col="sentiment", news_tz="UTC",
+            threshold=SENTIMENT_THRESHOLD):
+        """
+        One row per event with 'ticker', 'Date' (event session), 'bucket',
+        the abnormal return at every offset ('AR[-5]' ... 'AR[+5]'),
+        'CAR_pre' (offsets < 0), 'CAR_post' (offsets >= 0) and 'CAR' (whole
+        window). A CAR is NaN unless every return it covers exists, so
+        partial windows at the panel edges are not mixed in. Events whose
+        ticker or session is not in the panel are dropped.
+        """
+        rows, days = self.locate(events[ticker_col], events[date_col], news_tz=news_tz)
+        keep = (rows >= 0) & (days >= 0)
+        rows, days = rows[keep], days[keep]
+        ar = self.abnormal_returns(rows, days)
+
+        out = pd.DataFrame({
+            "ticker": np.asarray(self.panel.tickers, dtype=object)[rows],
+            "Date": self.panel.dates[days].view("datetime64[ns]"),
+            "bucket": sentiment_buckets(events[sentiment_col].to_numpy(dtype=float)[keep], threshold),
+            sentiment_col: events[sentiment_col].to_numpy(dtype=float)[keep],
+        }, index=events.index[keep])
+        ar_frame = pd.DataFrame(ar, columns=[offset_label(o) for o in self.offsets], index=out.index)
+        pre = self.offsets < 0
+        # Plain sums, so any missing day leaves the CAR NaN
+        ar_frame["CAR_pre"] = ar[:, pre].sum(axis=1)
+        ar_frame["CAR_post"] = ar[:, ~pre].sum(axis=1)
+        ar_frame["CAR"] = ar.sum(axis=1)
+        return pd.concat([out, ar_frame], axis=1)
+
+
+def summarize_events(results, by=("bucket",)):
+    """
+    Average abnormal return path and CAR statistics per group: 'n_events',
+    mean 'AR[k]' per offset, and for 'CAR' its mean, standard deviation,
+    t-statistic and the number of events with a complete window ('n_car').
+    """
+    by = list(by)
+    ar_cols = [c for c in results.columns if c.startswith("AR[")]
+    grouped = results.groupby(by, sort=True)
+    summary = grouped[ar_cols + ["CAR_pre", "CAR_post"]].mean()
+    summary.insert(0, "n_events", grouped.size())
+    car = grouped["CAR"].agg(["count", "mean", "std"])
+    summary["n_car"] = car["count"]
+    summary["CAR_mean"] = car["mean"]
+    summary["CAR_std"] = car["std"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        summary["CAR_t"] = car["mean"] / (car["std"] / np.sqrt(car["count"]))
+    return summary.reset_index()
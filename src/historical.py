@@ -1,4 +1,5 @@
-import pandas as pd
+from src.price_panel import load_price_panel
+from src.ticker_pool import map_tickers
 
 class HistoricalStockAnalyzer:
     def __init__(self, file_path: str):
@@ -6,7 +7,8 @@ class HistoricalStockAnalyzer:
         self.df = None
 
     def load_data(self):
-        self.df = pd.read_csv(self.file_path, parse_dates=["Date"])
+        panel = load_price_panel([self.file_path])
+        self.df = panel.to_frame().drop(columns="ticker")
         return self.df
 
     def get_summary_stats(self):
@@ -17,3 +19,13 @@ class HistoricalStockAnalyzer:
 
     def get_volume_trends(self):
         return self.df[["Date", "Volume"]].set_index("Date")
+
+
+def ticker_summary(ticker, shared):
+    """get_summary_stats for one ticker of a shared PricePanel; runs in worker processes."""
+    return shared.panel.to_frame(tickers=[ticker]).drop(columns="ticker").describe()
+
+
+def summarize_tickers(panel, n_jobs=1):
+    """Summary statistics of every ticker in the panel, as ({ticker: DataFrame}, {ticker: error})."""
+    return map_tickers(ticker_summary, panel.tickers, panel=panel, n_jobs=n_jobs)
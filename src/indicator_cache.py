@@ -0,0 +1,116 @@
+# src/indicator_cache.py
+
+import os
+import glob
+import json
+import uuid
+import hashlib
+import pandas as pd
+from src.news_loader import _source_stat
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "indicators")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def file_fingerprint(file_path):
+    """Identifies one version of an input file by path, size and mtime."""
+    return dict(_source_stat(file_path), path=os.path.abspath(file_path))
+
+
+class IndicatorCache:
+    """
+    On-disk cache of computed frames keyed by (input file fingerprint,
+    indicator name, parameters). Each entry is one Parquet file whose mtime
+    records its last use; once the directory grows past max_bytes the least
+    recently used entries are evicted. Editing the input file changes its
+    fingerprint, so stale entries are never served, just aged out.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, file_path, name, params=None):
+        payload = {"version": CACHE_VERSION, "file": file_fingerprint(file_path), "name": name,
+                   "params": params or {}}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, file_path, name, params=None):
+        """Returns the cached frame, or None on a miss."""
+        path = self._path(self.key(file_path, name, params))
+        try:
+            frame = pd.read_parquet(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return frame
+
+    def put(self, file_path, name, params, frame):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(self.key(file_path, name, params))
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        frame.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def get_or_compute(self, file_path, name, params, compute):
+        """Cached frame for the key, or compute() stored under it."""
+        frame = self.get(file_path, name, params)
+        if frame is None:
+            frame = compute()
+            self.put(file_path, name, params, frame)
+        return frame
+
+    def _entries(self):
+        entries = []
+        for path in glob.glob(os.path.join(self.cache_dir, "*.parquet")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits in max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        for _, _, path in self._entries():
+            os.remove(path)
+
+    def stats(self):
+        entries = self._entries()
+        return {"hits": self.hits, "misses": self.misses, "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries)}
+
+
+_default_cache = None
+
+
+def get_default_cache():
+    """Process-wide cache under <repo>/.cache/indicators/."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = IndicatorCache()
+    return _default_cache
@@ -0,0 +1,226 @@
+# src/indicator_state.py
+
+import json
+import math
+import os
+from collections import deque
+from src.indicators import TA_EPSILON
+
+NAN = float("nan")
+
+
+class IndicatorState:
+    """
+    Base class for incremental indicators: update() takes one new price and
+    returns the indicator value for that bar in constant time, matching a
+    full talib-style recompute bar for bar. Leading NaN prices are skipped,
+    like talib does; a NaN after the first price propagates from then on.
+    """
+
+    def update(self, price):
+        raise NotImplementedError
+
+    def to_dict(self):
+        state = {k: (list(v) if isinstance(v, deque) else v) for k, v in vars(self).items()}
+        return {"type": type(self).__name__, "state": state}
+
+    @classmethod
+    def from_dict(cls, data):
+        state_cls = STATE_TYPES[data["type"]]
+        obj = state_cls.__new__(state_cls)
+        obj._restore(data["state"])
+        return obj
+
+    def _restore(self, state):
+        vars(self).update(state)
+
+    @classmethod
+    def from_history(cls, prices, *args, **kwargs):
+        """Seeds a new state from historical prices; returns (state, values per bar)."""
+        state = cls(*args, **kwargs)
+        return state, [state.update(p) for p in prices]
+
+
+class SMAState(IndicatorState):
+    def __init__(self, period=30):
+        self.period = period
+        self.window = deque()
+        self.total = 0.0
+        self.started = False
+
+    def _restore(self, state):
+        super()._restore(state)
+        self.window = deque(self.window)
+
+    def update(self, price):
+        price = float(price)
+        if not self.started:
+            if math.isnan(price):
+                return NAN
+            self.started = True
+        # Same running-sum order as talib: add the new price, read, then drop the oldest
+        self.window.append(price)
+        self.total += price
+        if len(self.window) < self.period:
+            return NAN
+        value = self.total / self.period
+        self.total -= self.window.popleft()
+        return value
+
+
+class EMAState(IndicatorState):
+    """
+    SMA-seeded EMA with alpha = 2 / (n + 1). skip drops that many bars
+    (after leading NaNs) before the seed window, which MACD's fast EMA needs.
+    """
+
+    def __init__(self, period=30, skip=0):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.skip = skip
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = NAN
+
+    def update(self, price):
+        price = float(price)
+        if self.count == 0 and math.isnan(price):
+            return NAN
+        self.count += 1
+        if self.count <= self.skip:
+            return NAN
+        if self.count < self.skip + self.period:
+            self.seed_sum += price
+            return NAN
+        if self.count == self.skip + self.period:
+            self.value = (self.seed_sum + price) / self.period
+        else:
+            self.value = ((price - self.value) * self.alpha) + self.value
+        return self.value
+
+
+class RSIState(IndicatorState):
+    """Wilder RSI: mean gain/loss over the first n changes, then (avg * (n - 1) + x) / n."""
+
+    def __init__(self, period=14):
+        self.period = period
+        self.count = 0
+        self.prev_price = NAN
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, price):
+        price = float(price)
+        if self.count == 0:
+            if math.isnan(price):
+                return NAN
+            self.count, self.prev_price = 1, price
+            return NAN
+
+        change = price - self.prev_price
+        self.prev_price = price
+        gain, loss = (change, 0.0) if not change < 0 else (0.0, -change)
+        # count is the number of prices seen, so this is change number count
+        changes = self.count
+        self.count += 1
+        if changes <= self.period:
+            self.avg_gain += gain
+            self.avg_loss += loss
+            if changes < self.period:
+                return NAN
+            self.avg_gain /= self.period
+            self.avg_loss /= self.period
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        total = self.avg_gain + self.avg_loss
+        return 100.0 * (self.avg_gain / total) if not (-TA_EPSILON < total < TA_EPSILON) else 0.0
+
+
+class MACDState(IndicatorState):
+    """MACD line, signal line and histogram; update() returns the (macd, signal, hist) tuple."""
+
+    def __init__(self, fastperiod=12, slowperiod=26, signalperiod=9):
+        fastperiod, slowperiod = min(fastperiod, slowperiod), max(fastperiod, slowperiod)
+        self.fast = EMAState(fastperiod, skip=slowperiod - fastperiod)
+        self.slow = EMAState(slowperiod)
+        self.signal = EMAState(signalperiod)
+
+    def to_dict(self):
+        return {"type": type(self).__name__,
+                "state": {name: getattr(self, name).to_dict() for name in ("fast", "slow", "signal")}}
+
+    def _restore(self, state):
+        for name, data in state.items():
+            setattr(self, name, IndicatorState.from_dict(data))
+
+    def update(self, price):
+        fast, slow = self.fast.update(price), self.slow.update(price)
+        if math.isnan(slow) and self.signal.count == 0:
+            return NAN, NAN, NAN
+        line = fast - slow
+        signal = self.signal.update(line)
+        if math.isnan(signal):
+            return NAN, NAN, NAN
+        return line, signal, line - signal
+
+
+STATE_TYPES = {cls.__name__: cls for cls in (SMAState, EMAState, RSIState, MACDState)}
+
+
+class IndicatorSet:
+    """
+    The standard SMA_20 / SMA_50 / RSI / MACD columns as one incremental
+    state, keyed like compute_indicators' output.
+    """
+
+    def __init__(self, sma_periods=(20, 50), rsi_period=14, macd_periods=(12, 26, 9)):
+        self.states = {f"SMA_{p}": SMAState(p) for p in sma_periods}
+        self.states["RSI"] = RSIState(rsi_period)
+        self.states["MACD"] = MACDState(*macd_periods)
+        self.last_date = None
+
+    def update(self, price, date=None):
+        """Folds in one new bar; returns {'SMA_20': ..., 'MACD_Hist': ...} for it."""
+        out = {}
+        for name, state in self.states.items():
+            value = state.update(price)
+            if isinstance(state, MACDState):
+                out["MACD"], out["MACD_Signal"], out["MACD_Hist"] = value
+            else:
+                out[name] = value
+        if date is not None:
+            self.last_date = str(date)
+        return out
+
+    @classmethod
+    def from_history(cls, prices, dates=None, **options):
+        """Seeds the set from a price history; returns (state, list of per-bar outputs)."""
+        indicator_set = cls(**options)
+        rows = [indicator_set.update(p) for p in prices]
+        if dates is not None and len(dates):
+            indicator_set.last_date = str(list(dates)[-1])
+        return indicator_set, rows
+
+    def to_dict(self):
+        return {"last_date": self.last_date, "states": {k: s.to_dict() for k, s in self.states.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        indicator_set = cls.__new__(cls)
+        indicator_set.states = {k: IndicatorState.from_dict(v) for k, v in data["states"].items()}
+        indicator_set.last_date = data.get("last_date")
+        return indicator_set
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            # NaN is written as a bare NaN token, which json reads back
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
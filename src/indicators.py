@@ -0,0 +1,195 @@
+# src/indicators.py
+
+import numpy as np
+from scipy.signal import lfilter
+
+try:
+    import talib
+except ImportError:  # talib only ships a Windows wheel in requirements.txt
+    talib = None
+
+BACKENDS = ("talib", "numpy")
+DEFAULT_BACKEND = "talib" if talib is not None else "numpy"
+# Same near-zero test talib's C code uses (TA_IS_ZERO)
+TA_EPSILON = 1e-8
+
+
+def _resolve_backend(backend):
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown indicator backend '{backend}'. Choose from {BACKENDS}.")
+    if backend == "talib" and talib is None:
+        raise ImportError("talib is not installed; use backend='numpy'.")
+    return backend
+
+
+def _as_2d(prices):
+    """(date, ticker) float array and whether the input was a single series."""
+    values = np.asarray(prices, dtype=float)
+    if values.ndim == 1:
+        return values[:, None], True
+    if values.ndim != 2:
+        raise ValueError("Prices must be a 1-D series or a 2-D (date x ticker) array.")
+    return values, False
+
+
+def _first_valid(values):
+    """Index of each column's first non-NaN value (len(values) if none), as talib skips leading NaNs."""
+    valid = ~np.isnan(values)
+    if not len(values):
+        return np.zeros(values.shape[1], dtype=np.int64)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(values))
+
+
+def _per_column(func, values, *args):
+    """Runs a 1-D talib function down every column."""
+    outputs = [func(np.ascontiguousarray(values[:, j]), *args) for j in range(values.shape[1])]
+    if outputs and isinstance(outputs[0], tuple):
+        return tuple(np.column_stack(parts) for parts in zip(*outputs))
+    return np.column_stack(outputs) if outputs else np.full(values.shape, np.nan)
+
+
+def _sma_numpy(values, period, begin):
+    out = np.full(values.shape, np.nan)
+    # Leading NaNs are zeroed for the running sum; NaNs after the start propagate, as in talib
+    filled = np.where(np.arange(len(values))[:, None] < begin, 0.0, values)
+    cumulative = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(filled, axis=0)])
+    out[period - 1:] = (cumulative[period:] - cumulative[:-period]) / period
+    out[np.arange(len(values))[:, None] < begin + period - 1] = np.nan
+    return out
+
+
+def _ema_numpy(values, period, begin):
+    """
+    talib-style EMA: seeded with the simple mean of the period values starting
+    at each column's begin index, then out = prev + alpha * (x - prev).
+    The recursion runs down all columns at once as a first-order IIR filter.
+    """
+    alpha = 2.0 / (period + 1)
+    out = np.full(values.shape, np.nan)
+    for start in np.unique(begin):
+        cols = np.flatnonzero(begin == start)
+        seed_at = start + period - 1
+        if seed_at >= len(values):
+            continue
+        seed = values[start:seed_at + 1, cols].mean(axis=0)
+        out[seed_at, cols] = seed
+        if seed_at + 1 < len(values):
+            out[seed_at + 1:, cols] = lfilter([alpha], [1.0, alpha - 1.0], values[seed_at + 1:, cols], axis=0,
+                                              zi=((1.0 - alpha) * seed)[None, :])[0]
+    return out
+
+
+def _rsi_numpy(values, period, begin):
+    out = np.full(values.shape, np.nan)
+    diffs = np.diff(values, axis=0)
+    gains, losses = np.clip(diffs, 0, None), np.clip(-diffs, 0, None)
+    for start in np.unique(begin):
+        cols = np.flatnonzero(begin == start)
+        first = start + period
+        if first >= len(values):
+            continue
+        # Wilder smoothing: simple mean of the first period changes, then avg = (avg * (n - 1) + x) / n
+        avg_gain = lfilter([1.0 / period], [1.0, -(period - 1.0) / period], gains[first:, cols], axis=0,
+                           zi=(gains[start:first, cols].mean(axis=0) * (period - 1.0) / period)[None, :])[0]
+        avg_loss = lfilter([1.0 / period], [1.0, -(period - 1.0) / period], losses[first:, cols], axis=0,
+                           zi=(losses[start:first, cols].mean(axis=0) * (period - 1.0) / period)[None, :])[0]
+        avg_gain = np.vstack([gains[start:first, cols].mean(axis=0), avg_gain])
+        avg_loss = np.vstack([losses[start:first, cols].mean(axis=0), avg_loss])
+        total = avg_gain + avg_loss
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[first:, cols] = np.where(np.abs(total) < TA_EPSILON, 0.0, 100.0 * avg_gain / total)
+    return out
+
+
+def _macd_numpy(values, fast, slow, signal, begin):
+    if slow < fast:
+        fast, slow = slow, fast
+    # talib starts both EMAs on the same bar: the fast one is seeded from the
+    # fast window that ends where the slow seed window ends
+    slow_ema = _ema_numpy(values, slow, begin)
+    fast_ema = _ema_numpy(values, fast, begin + (slow - fast))
+    macd_line = fast_ema - slow_ema
+    signal_line = _ema_numpy(macd_line, signal, begin + slow - 1)
+    macd_line[np.arange(len(values))[:, None] < begin + slow + signal - 2] = np.nan
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def _finish(result, single):
+    if isinstance(result, tuple):
+        return tuple(_finish(r, single) for r in result)
+    return result[:, 0] if single else result
+
+
+def sma(prices, timeperiod=30, backend=None):
+    """Simple moving average of a series or every column of a (date x ticker) array."""
+    values, single = _as_2d(prices)
+    if _resolve_backend(backend) == "talib":
+        return _finish(_per_column(talib.SMA, values, timeperiod), single)
+    return _finish(_sma_numpy(values, timeperiod, _first_valid(values)), single)
+
+
+def ema(prices, timeperiod=30, backend=None):
+    """Exponential moving average (SMA-seeded, alpha = 2 / (n + 1)), like talib.EMA."""
+    values, single = _as_2d(prices)
+    if _resolve_backend(backend) == "talib":
+        return _finish(_per_column(talib.EMA, values, timeperiod), single)
+    return _finish(_ema_numpy(values, timeperiod, _first_valid(values)), single)
+
+
+def rsi(prices, timeperiod=14, backend=None):
+    """Relative Strength Index with Wilder smoothing, like talib.RSI."""
+    values, single = _as_2d(prices)
+    if _resolve_backend(backend) == "talib":
+        return _finish(_per_column(talib.RSI, values, timeperiod), single)
+    return _finish(_rsi_numpy(values, timeperiod, _first_valid(values)), single)
+
+
+def macd(prices, fastperiod=12, slowperiod=26, signalperiod=9, backend=None):
+    """Returns (macd, signal, histogram), like talib.MACD."""
+    values, single = _as_2d(prices)
+    if _resolve_backend(backend) == "talib":
+        return _finish(_per_column(talib.MACD, values, fastperiod, slowperiod, signalperiod), single)
+    return _finish(_macd_numpy(values, fastperiod, slowperiod, signalperiod, _first_valid(values)), single)
+
+
+def compute_indicators(prices, sma_periods=(20, 50), rsi_period=14, macd_periods=(12, 26, 9), backend=None):
+    """
+    The standard indicator set for a series or a (date x ticker) array, in
+    one call: {'SMA_20', 'SMA_50', 'RSI', 'MACD', 'MACD_Signal', 'MACD_Hist'}
+    mapped to arrays shaped like prices.
+    """
+    out = {f"SMA_{p}": sma(prices, p, backend=backend) for p in sma_periods}
+    out["RSI"] = rsi(prices, rsi_period, backend=backend)
+    out["MACD"], out["MACD_Signal"], out["MACD_Hist"] = macd(prices, *macd_periods, backend=backend)
+    return out
+
+
+def add_indicators(df, column="Close", **options):
+    """Adds the compute_indicators columns to a single-ticker DataFrame in place and returns it."""
+    for name, values in compute_indicators(df[column].to_numpy(dtype=float), **options).items():
+        df[name] = values
+    return df
+
+
+def universe_indicators(price_panel, field="Close", **options):
+    """
+    Indicators for every ticker of a PricePanel in one pass. Returns a long
+    DataFrame ['ticker', 'Date', field, 'SMA_20', ...] with one row per
+    ticker and trading day that has a price. Each ticker runs over its own
+    priced days, so a bar missing on the shared date axis does not turn the
+    rest of its EMA/RSI/MACD into NaN.
+    """
+    prices = np.asarray(price_panel.field(field)).T
+    valid = ~np.isnan(prices)
+    # Pack each ticker's prices to the top of its column, compute, then read the same slots back
+    rank = np.cumsum(valid, axis=0) - 1
+    cols = np.broadcast_to(np.arange(prices.shape[1]), prices.shape)
+    packed = np.full(prices.shape, np.nan)
+    packed[rank[valid], cols[valid]] = prices[valid]
+    # Long rows are ticker-major, so the slots are read in transposed order
+    slots = rank.T[valid.T], cols.T[valid.T]
+    frame = price_panel.to_frame([field])
+    for name, values in compute_indicators(packed, **options).items():
+        frame[name] = values[slots]
+    return frame
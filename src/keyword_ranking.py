@@ -0,0 +1,74 @@
+# src/keyword_ranking.py
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+
+def column_scores(X):
+    """Column sums of a sparse document x term matrix as a flat array, without densifying."""
+    return np.asarray(X.sum(axis=0)).ravel()
+
+
+def top_k(scores, k):
+    """Indices of the k largest scores, largest first (ties keep column order)."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=int)
+    threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    # argpartition splits ties at the k-th score arbitrarily; take the earliest columns instead
+    above = np.flatnonzero(scores > threshold)
+    top = np.concatenate([above, np.flatnonzero(scores == threshold)[:k - len(above)]])
+    return top[np.lexsort((top, -scores[top]))]
+
+
+def group_indicator(labels):
+    """
+    Sparse (group x document) 0/1 matrix for a label per document, and the
+    group labels in row order. Documents with a missing label are left out.
+    """
+    codes, groups = pd.factorize(pd.Series(labels), sort=True)
+    rows = np.flatnonzero(codes >= 0)
+    indicator = sp.csr_matrix((np.ones(len(rows)), (codes[rows], rows)), shape=(len(groups), len(codes)))
+    return indicator, groups
+
+
+def group_term_matrix(labels, X):
+    """
+    Sums the rows of a sparse document x term matrix per label with one
+    sparse product, G @ X. Returns (group x term CSR matrix, group labels).
+    """
+    indicator, groups = group_indicator(labels)
+    return (indicator @ sp.csr_matrix(X)).tocsr(), groups
+
+
+def top_terms_per_row(matrix, features, k=10, group_name="group"):
+    """
+    Top-k terms of every row of a sparse group x term matrix, picked with
+    argpartition over each row's stored entries only. Returns a tidy
+    DataFrame [group_name, 'rank', 'keyword', 'score'].
+    """
+    matrix = sp.csr_matrix(matrix, copy=True)
+    # Sorted column indices make ties resolve in vocabulary order
+    matrix.sort_indices()
+    rows, cols, scores = [], [], []
+    for i in range(matrix.shape[0]):
+        start, end = matrix.indptr[i], matrix.indptr[i + 1]
+        data, indices = matrix.data[start:end], matrix.indices[start:end]
+        best = top_k(data, k)
+        rows.append(np.full(len(best), i))
+        cols.append(indices[best])
+        scores.append(data[best])
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=int)
+    cols = np.concatenate(cols) if cols else np.empty(0, dtype=int)
+    ranks = np.arange(len(rows)) - np.searchsorted(rows, rows) + 1
+    return pd.DataFrame({group_name: rows, "rank": ranks, "keyword": np.asarray(features, dtype=object)[cols],
+                         "score": np.concatenate(scores) if scores else np.empty(0)})
+
+
+def keywords_by_group(labels, X, features, k=10, group_name="group"):
+    """Top-k keywords per label from one fitted document x term matrix."""
+    matrix, groups = group_term_matrix(labels, X)
+    ranked = top_terms_per_row(matrix, features, k, group_name)
+    ranked[group_name] = np.asarray(groups, dtype=object)[ranked[group_name].to_numpy()]
+    return ranked
@@ -0,0 +1,222 @@
+# src/lexicon_sentiment.py
+
+import re
+import numpy as np
+import pandas as pd
+from textblob.en import sentiment as pattern_sentiment
+from textblob._text import find_tokens, EMOTICONS, PUNCTUATION
+
+# Bump when a change to this engine can change its scores (invalidates stored lexicon scores)
+ENGINE_VERSION = 2
+# Raw tokens that find_tokens leaves whole, or splits into word + one trailing mark
+PLAIN_TOKEN = r"([A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?)([,;:!?]?)"
+# Distinct raw tokens remembered by _split before the cache is cleared
+SPLIT_CACHE_SIZE = 100_000
+
+
+def _spanning(marks):
+    """Regex for marks written with whitespace somewhere between their characters, e.g. ': S' or '( ! )'."""
+    variants = []
+    for mark in marks:
+        chars = [re.escape(c) for c in mark]
+        for k in range(1, len(chars)):
+            variants.append(r"\s*".join(chars[:k]) + r"\s+" + r"\s*".join(chars[k:]))
+    return re.compile("|".join(sorted(set(variants), key=len, reverse=True)))
+
+
+# pattern joins emoticons and the sarcasm mark across spaces on the whole
+# sentence; headlines where that can happen are scored by pattern itself
+CROSS_TOKEN_MARKS = _spanning([e for group in EMOTICONS.values() for e in group] + ["(!)"])
+
+
+class LexiconSentimentEngine:
+    """
+    Batch re-implementation of TextBlob's PatternAnalyzer polarity/subjectivity.
+
+    The pattern lexicon (with its intensity, adverb-modifier and negation
+    rules) is compiled into per-token arrays. A headline column is tokenized
+    once per distinct whitespace token, flattened into CSR-style token arrays,
+    and pattern's left-to-right rules are evaluated one token position at a
+    time for every headline simultaneously. The few headlines with an
+    emoticon or (!) spread over several whitespace tokens (e.g. 'Report: S')
+    are handed to pattern whole, since its rules see across the spaces.
+    """
+
+    def __init__(self, lexicon=pattern_sentiment):
+        self.lexicon = lexicon
+        if dict.__len__(lexicon) == 0:
+            lexicon.load()
+        self.negations = set(lexicon.negations)
+        self.emoticons = {e.lower(): p for (_, p), group in EMOTICONS.items() for e in group}
+        self._split_cache = {}
+
+    def _split(self, raw_token):
+        """Sub-tokens pattern produces for one whitespace-delimited token."""
+        tokens = self._split_cache.get(raw_token)
+        if tokens is None:
+            tokens = [w.lower() for w in " ".join(find_tokens(raw_token)).split()]
+            if len(self._split_cache) >= SPLIT_CACHE_SIZE:
+                self._split_cache.clear()
+            self._split_cache[raw_token] = tokens
+        return tokens
+
+    def tokenize(self, texts):
+        """
+        Returns (vocab, token_ids, offsets): token_ids[offsets[k]:offsets[k + 1]]
+        are the lowercased pattern tokens of texts[k], as indexes into vocab.
+        """
+        raw = pd.Series(list(texts), dtype=object).astype(str).str.split()
+        flat_raw = raw.explode().dropna()
+        codes, uniques = pd.factorize(flat_raw)
+        uniques = np.asarray(uniques, dtype=object)
+
+        plain = pd.Series(uniques, dtype=object).str.lower().str.extract("^" + PLAIN_TOKEN + "$")
+        words, marks = plain[0].to_numpy(), plain[1].to_numpy()
+        pieces = []
+        for raw_token, word, mark in zip(uniques, words, marks):
+            if pd.isna(word):
+                pieces.append(self._split(raw_token))
+            else:
+                pieces.append([word, mark] if mark else [word])
+
+        # Expand every raw token occurrence into its sub-tokens
+        piece_lengths = np.fromiter((len(p) for p in pieces), dtype=np.int64, count=len(pieces))
+        sub_codes, vocab = pd.factorize(pd.Series([w for p in pieces for w in p], dtype=object))
+        piece_starts = np.concatenate([[0], np.cumsum(piece_lengths)[:-1]])
+
+        counts = piece_lengths[codes]
+        total = int(counts.sum())
+        occurrence_starts = np.cumsum(counts) - counts
+        within = np.arange(total) - np.repeat(occurrence_starts, counts)
+        token_ids = sub_codes[np.repeat(piece_starts[codes], counts) + within]
+
+        token_counts = np.bincount(flat_raw.index.to_numpy(dtype=np.int64), weights=counts, minlength=len(raw))
+        offsets = np.concatenate([[0], np.cumsum(token_counts.astype(np.int64))])
+        return np.asarray(vocab, dtype=object), token_ids, offsets
+
+    def compile(self, vocab):
+        """
+        Builds per-token feature arrays for vocab following pattern's rules.
+        """
+        n = len(vocab)
+        features = {
+            "known": np.zeros(n, bool), "p": np.zeros(n), "s": np.zeros(n), "i": np.ones(n),
+            "modifier": np.zeros(n, bool), "negation": np.zeros(n, bool), "ly": np.zeros(n, bool),
+            "long": np.zeros(n, bool), "long_unquoted": np.zeros(n, bool), "exclamation": np.zeros(n, bool),
+            "append": np.zeros(n, bool), "append_p": np.zeros(n), "append_s": np.zeros(n),
+        }
+        for k, w in enumerate(vocab):
+            entry = self.lexicon.get(w)
+            if entry is not None and None in entry:
+                features["known"][k] = True
+                features["p"][k], features["s"][k], features["i"][k] = entry[None]
+                features["modifier"][k] = "RB" in entry
+            features["negation"][k] = w in self.negations
+            features["ly"][k] = self.lexicon.modifier(w)
+            features["long"][k] = len(w) > 2
+            features["long_unquoted"][k] = len(w.strip("'")) > 1
+            features["exclamation"][k] = w == "!"
+            if w == "(!)":
+                features["append"][k], features["append_s"][k] = True, 1.0
+            elif w.isalpha() is False and len(w) <= 5 and w not in PUNCTUATION and w in self.emoticons:
+                features["append"][k], features["append_s"][k] = True, 1.0
+                features["append_p"][k] = self.emoticons[w]
+        return features
+
+    def score(self, texts):
+        """
+        Returns an (n, 2) array of (polarity, subjectivity), matching
+        TextBlob(text).sentiment for each text.
+        """
+        texts = pd.Series(list(texts), dtype=object).astype(str)
+        whole = texts.str.contains(CROSS_TOKEN_MARKS).to_numpy()
+        if not whole.any():
+            return self._score_tokens(texts)
+        scores = np.empty((len(texts), 2))
+        scores[~whole] = self._score_tokens(texts[~whole])
+        scores[whole] = [tuple(self.lexicon(t)) for t in texts[whole]]
+        return scores
+
+    def _score_tokens(self, texts):
+        vocab, token_ids, offsets = self.tokenize(texts)
+        f = self.compile(vocab)
+        n = len(offsets) - 1
+        lengths = np.diff(offsets)
+
+        # Process longest headlines first so the rows still active at step j are a prefix
+        order = np.argsort(-lengths, kind="stable")
+        starts = offsets[:-1][order]
+        sorted_lengths = lengths[order]
+
+        m = np.zeros(n, bool)          # preceding modifier
+        m_ly = np.zeros(n, bool)       # ... and it ends in -ly
+        neg = np.zeros(n, bool)        # preceding negation
+        has_last = np.zeros(n, bool)   # open assessment a[-1]
+        lp, ls, li = np.zeros(n), np.zeros(n), np.ones(n)
+        ln = np.zeros(n, bool)
+        sum_p, sum_s, count = np.zeros(n), np.zeros(n), np.zeros(n)
+
+        def close(rows):
+            rows = rows[has_last[rows]]
+            sum_p[rows] += np.where(ln[rows], lp[rows] * -0.5, lp[rows])
+            sum_s[rows] += ls[rows]
+            count[rows] += 1
+
+        def open_(rows, p, s, i):
+            close(rows)
+            has_last[rows] = True
+            lp[rows], ls[rows], li[rows] = p, s, i
+            ln[rows] = False
+
+        for j in range(int(sorted_lengths[0]) if n else 0):
+            active = int(np.searchsorted(-sorted_lengths, -j, side="left"))
+            rows = np.arange(active)
+            tok = token_ids[starts[:active] + j]
+            known = f["known"][tok]
+
+            # Known word: new assessment, or modified by the preceding adverb
+            kr, kt = rows[known], tok[known]
+            new = ~m[kr]
+            open_(kr[new], f["p"][kt[new]], f["s"][kt[new]], f["i"][kt[new]])
+            mr, mt = kr[~new], kt[~new]
+            lp[mr] = np.clip(f["p"][mt] * li[mr], -1.0, 1.0)
+            ls[mr] = np.clip(f["s"][mt] * li[mr], -1.0, 1.0)
+            li[mr] = f["i"][mt]
+            nr = kr[neg[kr]]
+            li[nr] = 1.0 / li[nr]
+            ln[nr] = True
+            m[kr], m_ly[kr], neg[kr] = f["modifier"][kt], f["ly"][kt], f["negation"][kt]
+
+            # Unknown word: carry or drop negation/modifier state
+            ur, ut = rows[~known], tok[~known]
+            n_new = f["negation"][ut] | (neg[ur] & ~f["long_unquoted"][ut])
+            flip = n_new & m[ur] & m_ly[ur]
+            ln[ur[flip]] = True
+            n_new[flip] = False
+            m[ur[~flip & m[ur] & f["long"][ut]]] = False
+            neg[ur] = n_new
+
+            boost = ur[f["exclamation"][ut] & has_last[ur]]
+            lp[boost] = np.clip(lp[boost] * 1.25, -1.0, 1.0)
+            add = f["append"][ut]
+            open_(ur[add], f["append_p"][ut[add]], f["append_s"][ut[add]], 1.0)
+
+        close(np.arange(n))
+        scores = np.empty((n, 2))
+        scores[order, 0] = sum_p / np.maximum(count, 1)
+        scores[order, 1] = sum_s / np.maximum(count, 1)
+        return scores
+
+
+_engine = None
+
+
+def lexicon_scores(texts):
+    """
+    Scores a list of strings with the shared LexiconSentimentEngine,
+    one (polarity, subjectivity) row each.
+    """
+    global _engine
+    if _engine is None:
+        _engine = LexiconSentimentEngine()
+    return _engine.score(texts)
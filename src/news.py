@@ -1,20 +1,19 @@
 import pandas as pd
-import re
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
 import matplotlib.pyplot as plt
+from src.news_loader import load_news
+from src.text_cleaning import clean_headlines
+from src.topic_model import DEFAULT_CHUNKSIZE, OnlineTopicModel, build_vocabulary, series_chunks
+from src.news_dataset import read_news
+from src.date_parsing import NewsDateParser
 
 class NewsAnalyzer:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str = None, df: pd.DataFrame = None):
         self.file_path = file_path
-        self.df = pd.read_csv(file_path)
-        
-        # Convert date column with multiple attempts
-        self.df["date"] = pd.to_datetime(self.df["date"], format='mixed', errors='coerce')
-        
-        # If still not datetime, try manual parsing
-        if not pd.api.types.is_datetime64_any_dtype(self.df["date"]):
-            self.df["date"] = self.df["date"].apply(self._parse_date)
+        # Dates come back already parsed from the shared news cache, unless a
+        # pre-filtered frame (e.g. from read_news) is passed in
+        self.df = df.copy() if df is not None else load_news(file_path)
         
         # Report conversion issues
         na_count = self.df["date"].isna().sum()
@@ -26,25 +25,15 @@ class NewsAnalyzer:
         # Optional: drop rows with invalid dates
         # self.df = self.df.dropna(subset=['date'])
     
-    def _parse_date(self, date_str):
-        """Helper function to parse dates in different formats"""
-        if pd.isna(date_str):
-            return pd.NaT
-        
-        # Try common formats
-        for fmt in [
-            '%Y-%m-%d %H:%M:%S%z',  # ISO with timezone
-            '%m/%d/%Y %H:%M',       # US format with time
-            '%m/%d/%Y',             # US format without time
-            '%Y-%m-%d %H:%M:%S',    # ISO without timezone
-            '%Y-%m-%d'              # Just date
-        ]:
-            try:
-                return pd.to_datetime(date_str, format=fmt)
-            except:
-                continue
-        return pd.NaT
-    
+    @classmethod
+    def from_dataset(cls, file_path: str, tickers=None, start=None, end=None, columns=None):
+        """
+        Builds the analyzer on just the tickers and [start, end) window it needs,
+        read from the partitioned news dataset.
+        """
+        df = read_news(file_path, tickers=tickers, start=start, end=end, columns=columns)
+        return cls(file_path, df=df)
+
     def check_dates(self):
         print("Date column type:", self.df["date"].dtype)
         print("First 5 dates:")
@@ -68,7 +57,7 @@ class NewsAnalyzer:
     def articles_per_day(self):
     # Ensure date column is datetime
         if not pd.api.types.is_datetime64_any_dtype(self.df["date"]):
-            self.df["date"] = pd.to_datetime(self.df["date"], format='mixed', errors='coerce')
+            self.df["date"] = NewsDateParser().parse(self.df["date"])
         
         # Create a copy with only valid dates
         valid_dates = self.df.dropna(subset=['date'])
@@ -83,21 +72,29 @@ class NewsAnalyzer:
         self.df["hour"] = self.df["date"].dt.hour
         return self.df["hour"].value_counts().sort_index()
 
-    def topic_modeling(self, n_topics=5):
-        self.df["cleaned"] = self.df["headline"].astype(str).str.lower()
-        self.df["cleaned"] = self.df["cleaned"].apply(lambda x: re.sub(r"[^a-z\s]", "", x))
+    def topic_modeling(self, n_topics=5, online=False, chunksize=DEFAULT_CHUNKSIZE, n_jobs=None):
+        """
+        LDA topics as [(topic number, top words)]. With online=True the
+        headlines are fed to minibatch LDA chunk by chunk over a vocabulary
+        built in one streaming pass (same min_df/max_df), and the fitted model
+        is kept as self.topic_model to assign topics to new headlines.
+        """
+        if online:
+            vocabulary = build_vocabulary(series_chunks(self.df["headline"], chunksize))
+            self.topic_model = OnlineTopicModel(n_topics=n_topics, vocabulary=vocabulary, n_jobs=n_jobs)
+            self.topic_model.fit_stream(series_chunks(self.df["headline"], chunksize))
+            return self.topic_model.topics(10)
+
+        self.df["cleaned"] = clean_headlines(self.df["headline"]).to_numpy()
 
         vectorizer = CountVectorizer(stop_words='english', max_df=0.9, min_df=10)
         X = vectorizer.fit_transform(self.df["cleaned"])
 
-        lda = LatentDirichletAllocation(n_components=n_topics, random_state=42)
+        lda = LatentDirichletAllocation(n_components=n_topics, random_state=42, n_jobs=n_jobs)
         lda.fit(X)
 
-        topics = []
-        for idx, topic in enumerate(lda.components_):
-            top_words = [vectorizer.get_feature_names_out()[i] for i in topic.argsort()[-10:]]
-            topics.append((idx+1, top_words))
-        return topics
+        feature_names = vectorizer.get_feature_names_out()
+        return [(idx+1, list(feature_names[topic.argsort()[-10:]])) for idx, topic in enumerate(lda.components_)]
 
     def get_domain_stats(self):
         self.df["domain"] = self.df["publisher"].str.extract(r"@([\w\.-]+)")
@@ -1,22 +1,18 @@
 import pandas as pd
-import re
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
 import matplotlib.pyplot as plt
-from textblob import TextBlob
+from src.news_loader import load_news
+from src.text_cleaning import clean_headlines
+from src.topic_model import DEFAULT_CHUNKSIZE, OnlineTopicModel, build_vocabulary, series_chunks
+from src.sentiment_store import headline_polarity
+from src.charts import finish
 
 class NewsAnalyzer:
     def __init__(self, file_path: str):
         self.file_path = file_path
-        self.df = pd.read_csv(file_path)
-
-        # Parse all dates first (coerce errors)
-        self.df["date"] = pd.to_datetime(self.df["date"], errors='coerce')
-
-        # Remove timezone info (convert all to timezone-naive)
-        self.df["date"] = self.df["date"].apply(
-            lambda dt: dt.tz_convert(None) if pd.notna(dt) and dt.tzinfo is not None else dt
-        )
+        # Dates come back from the shared news cache as timezone-naive UTC
+        self.df = load_news(file_path)
 
         # Report conversion issues
         na_count = self.df["date"].isna().sum()
@@ -55,30 +51,36 @@ class NewsAnalyzer:
         self.df["hour"] = self.df["date"].dt.hour
         return self.df["hour"].value_counts().sort_index()
 
-    def topic_modeling(self, n_topics=5):
-        self.df["cleaned"] = self.df["headline"].astype(str).str.lower()
-        self.df["cleaned"] = self.df["cleaned"].apply(lambda x: re.sub(r"[^a-z\s]", "", x))
+    def topic_modeling(self, n_topics=5, online=False, chunksize=DEFAULT_CHUNKSIZE, n_jobs=None):
+        """
+        LDA topics as [(topic number, top words)]. With online=True the
+        headlines are fed to minibatch LDA chunk by chunk over a vocabulary
+        built in one streaming pass (same min_df/max_df), and the fitted model
+        is kept as self.topic_model to assign topics to new headlines.
+        """
+        if online:
+            vocabulary = build_vocabulary(series_chunks(self.df["headline"], chunksize))
+            self.topic_model = OnlineTopicModel(n_topics=n_topics, vocabulary=vocabulary, n_jobs=n_jobs)
+            self.topic_model.fit_stream(series_chunks(self.df["headline"], chunksize))
+            return self.topic_model.topics(10)
+
+        self.df["cleaned"] = clean_headlines(self.df["headline"]).to_numpy()
 
         vectorizer = CountVectorizer(stop_words='english', max_df=0.9, min_df=10)
         X = vectorizer.fit_transform(self.df["cleaned"])
 
-        lda = LatentDirichletAllocation(n_components=n_topics, random_state=42)
+        lda = LatentDirichletAllocation(n_components=n_topics, random_state=42, n_jobs=n_jobs)
         lda.fit(X)
 
-        topics = []
-        for idx, topic in enumerate(lda.components_):
-            top_words = [vectorizer.get_feature_names_out()[i] for i in topic.argsort()[-10:]]
-            topics.append((idx+1, top_words))
-        return topics
+        feature_names = vectorizer.get_feature_names_out()
+        return [(idx+1, list(feature_names[topic.argsort()[-10:]])) for idx, topic in enumerate(lda.components_)]
 
     def get_domain_stats(self):
         self.df["domain"] = self.df["publisher"].str.extract(r"@([\w\.-]+)")
         return self.df["domain"].value_counts()
 
-    def sentiment_analysis(self):
-        def get_sentiment(text):
-            analysis = TextBlob(str(text))
-            polarity = analysis.sentiment.polarity
+    def sentiment_analysis(self, engine="textblob"):
+        def get_sentiment(polarity):
             if polarity > 0.1:
                 return "positive"
             elif polarity < -0.1:
@@ -86,15 +88,16 @@ class NewsAnalyzer:
             else:
                 return "neutral"
 
-        self.df["sentiment"] = self.df["headline"].apply(get_sentiment)
+        self.df["sentiment"] = headline_polarity(self.df["headline"], engine=engine).apply(get_sentiment)
         return self.df["sentiment"].value_counts()
 
-    def plot_sentiment_distribution(self):
+    def plot_sentiment_distribution(self, path=None):
         sentiment_counts = self.sentiment_analysis()
+        fig = plt.figure()
         sentiment_counts.plot(kind="bar", color=["green", "red", "gray"])
         plt.title("Sentiment Distribution of News Headlines")
         plt.xlabel("Sentiment")
         plt.ylabel("Number of Headlines")
         plt.grid(axis="y")
         plt.tight_layout()
-        plt.show()
+        return finish(fig, path)
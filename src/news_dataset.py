@@ -0,0 +1,154 @@
+# src/news_dataset.py
+
+import os
+import shutil
+import zlib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from src.news_loader import (CACHE_DIRNAME, NAIVE_COLUMN, localize_news_dates, _load_cached_news, _source_stat,
+                             _read_meta, _write_meta)
+from src.date_parsing import localize
+
+DATASET_VERSION = 2
+# Tickers are hashed into this many partitions so a one-ticker query skips most files
+# without creating a directory per ticker and month
+STOCK_BUCKETS = 8
+PARTITION_COLUMNS = ["year", "month", "bucket"]
+ROW_COLUMN = "_row"
+# Wall-clock dates in a tz can be this far from UTC, so tz reads widen the pushdown bounds by it
+MAX_UTC_OFFSET = pd.Timedelta(days=1)
+
+
+def _partitioning():
+    return ds.partitioning(pa.schema([(c, pa.int32()) for c in PARTITION_COLUMNS]), flavor="hive")
+
+
+def stock_bucket(stocks):
+    """Stable partition number for each ticker."""
+    return np.array([zlib.crc32(str(s).encode()) % STOCK_BUCKETS for s in stocks], dtype=np.int32)
+
+
+def _dataset_dir(file_path, dataset_dir=None):
+    if dataset_dir is None:
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        dataset_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIRNAME, f"{name}.dataset")
+    return dataset_dir
+
+
+def build_news_dataset(file_path, dataset_dir=None, refresh=False, encoding=None):
+    """
+    Writes the news CSV as a Parquet dataset partitioned by
+    year=/month=/bucket= (ticker hash), rows sorted by stock and date inside
+    each file. Dates are partitioned on their UTC calendar month. The dataset
+    is only rewritten when the source file changes. Returns its directory.
+    """
+    dataset_dir = _dataset_dir(file_path, dataset_dir)
+    meta_path = os.path.join(dataset_dir, "_meta.json")
+    meta = _read_meta(meta_path)
+    stat = _source_stat(file_path)
+    if (not refresh and meta is not None and meta.get("version") == DATASET_VERSION
+            and meta.get("size") == stat["size"] and meta.get("mtime_ns") == stat["mtime_ns"]):
+        return dataset_dir
+
+    df = _load_cached_news(file_path, encoding=encoding, refresh=refresh)
+    df[ROW_COLUMN] = np.arange(len(df), dtype=np.int64)
+    df["year"] = df["date"].dt.year.astype("Int32")
+    df["month"] = df["date"].dt.month.astype("Int32")
+    df["bucket"] = stock_bucket(df["stock"]) if "stock" in df.columns else 0
+    sort_keys = [c for c in ("stock", "date") if c in df.columns]
+    df = df.sort_values(sort_keys, kind="stable")
+
+    tmp_dir = dataset_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    ds.write_dataset(pa.Table.from_pandas(df, preserve_index=False), tmp_dir, format="parquet",
+                     partitioning=_partitioning(),
+                     existing_data_behavior="overwrite_or_ignore")
+    _write_meta(os.path.join(tmp_dir, "_meta.json"),
+                dict(stat, version=DATASET_VERSION, source=os.path.abspath(file_path), rows=len(df)))
+    shutil.rmtree(dataset_dir, ignore_errors=True)
+    os.replace(tmp_dir, dataset_dir)
+    return dataset_dir
+
+
+def _month_filter(start, end):
+    """Partition-level (year, month) bounds for a [start, end) date range."""
+    year, month = ds.field("year"), ds.field("month")
+    expr = None
+    if start is not None:
+        expr = (year > start.year) | ((year == start.year) & (month >= start.month))
+    if end is not None:
+        last = end - pd.Timedelta(1, "ns")
+        upper = (year < last.year) | ((year == last.year) & (month <= last.month))
+        expr = upper if expr is None else expr & upper
+    return expr
+
+
+def _timestamp_scalar(ts, arrow_type):
+    return pa.scalar(ts.as_unit("ns").to_datetime64(), type=pa.timestamp("ns")).cast(arrow_type)
+
+
+def read_news(file_path, tickers=None, start=None, end=None, columns=None, tz=None, dataset_dir=None):
+    """
+    Loads news rows for the given tickers and [start, end) UTC date range,
+    reading only the partitions and columns that can match. start and end
+    accept anything pd.Timestamp does; timezone-aware bounds are converted
+    to UTC. Rows come back in their original file order, with the 'date'
+    column in tz like load_news (dates written without an offset are tz
+    wall-clock time, and are filtered on their UTC instant in that tz).
+    """
+    dataset = ds.dataset(build_news_dataset(file_path, dataset_dir), format="parquet", partitioning=_partitioning(),
+                         exclude_invalid_files=True)
+    stored = [c for c in dataset.schema.names if c not in PARTITION_COLUMNS + [ROW_COLUMN, NAIVE_COLUMN]]
+    columns = stored if columns is None else list(columns)
+    missing = set(columns) - set(stored)
+    if missing:
+        raise KeyError(f"Columns not in the news dataset: {sorted(missing)}")
+
+    bounds = []
+    for bound in (start, end):
+        if bound is not None:
+            bound = pd.Timestamp(bound)
+            bound = bound.tz_convert("UTC").tz_localize(None) if bound.tzinfo is not None else bound
+        bounds.append(bound)
+    start, end = bounds
+    # Naive dates are stored as written, so with a tz their UTC instant is only known after reading
+    exact = tz not in (None, "UTC") and (start is not None or end is not None)
+    if exact:
+        start = start - MAX_UTC_OFFSET if start is not None else None
+        end = end + MAX_UTC_OFFSET if end is not None else None
+
+    filters = []
+    if tickers is not None:
+        tickers = [str(t) for t in ([tickers] if isinstance(tickers, str) else tickers)]
+        filters.append(ds.field("bucket").isin(sorted(set(stock_bucket(tickers).tolist()))))
+        filters.append(ds.field("stock").isin(tickers))
+    if start is not None or end is not None:
+        filters.append(_month_filter(start, end))
+        date_type = dataset.schema.field("date").type
+        if start is not None:
+            filters.append(ds.field("date") >= _timestamp_scalar(start, date_type))
+        if end is not None:
+            filters.append(ds.field("date") < _timestamp_scalar(end, date_type))
+
+    expr = None
+    for f in filters:
+        expr = f if expr is None else expr & f
+    extra = [ROW_COLUMN] + ([NAIVE_COLUMN] if "date" in columns or exact else []) + (
+        ["date"] if exact and "date" not in columns else [])
+    table = dataset.to_table(columns=columns + extra, filter=expr)
+
+    df = table.to_pandas().sort_values(ROW_COLUMN).drop(columns=ROW_COLUMN).reset_index(drop=True)
+    if exact:
+        naive = df[NAIVE_COLUMN].to_numpy()
+        instants = df["date"].where(~naive, localize(df["date"], tz))
+        keep = pd.Series(True, index=df.index)
+        if bounds[0] is not None:
+            keep &= instants >= bounds[0]
+        if bounds[1] is not None:
+            keep &= instants < bounds[1]
+        df = df[keep.to_numpy()].reset_index(drop=True)
+    if "date" not in columns:
+        df = df.drop(columns=["date", NAIVE_COLUMN], errors="ignore")
+    return localize_news_dates(df, tz)
@@ -0,0 +1,146 @@
+# src/news_loader.py
+
+import os
+import json
+import hashlib
+import pandas as pd
+from src.date_parsing import NewsDateParser, convert_timezone
+
+CACHE_VERSION = 3
+CACHE_DIRNAME = ".cache"
+# Cached flag for dates written without an offset; they are stored as written
+NAIVE_COLUMN = "_date_naive"
+
+
+def _cache_paths(file_path, cache_dir=None):
+    """
+    Returns the (parquet, metadata) paths used to cache a news CSV.
+    By default the cache lives in a .cache folder next to the source file.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIRNAME)
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    return (os.path.join(cache_dir, f"{name}.parquet"),
+            os.path.join(cache_dir, f"{name}.meta.json"))
+
+
+def _file_hash(file_path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_stat(file_path):
+    stat = os.stat(file_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, meta_path)
+
+
+def is_cache_fresh(file_path, cache_dir=None):
+    """
+    Checks whether the cached copy of file_path is still valid.
+    A matching size and mtime is trusted as-is; otherwise the content hash
+    decides, so a touched-but-unchanged file does not force a re-parse.
+    """
+    parquet_path, meta_path = _cache_paths(file_path, cache_dir)
+    meta = _read_meta(meta_path)
+    if meta is None or meta.get("version") != CACHE_VERSION or not os.path.exists(parquet_path):
+        return False
+
+    stat = _source_stat(file_path)
+    if stat["size"] == meta["size"] and stat["mtime_ns"] == meta["mtime_ns"]:
+        return True
+    if stat["size"] != meta["size"] or _file_hash(file_path) != meta["sha256"]:
+        return False
+
+    # Same content with a new mtime: record it so the next check is cheap again
+    meta.update(stat)
+    _write_meta(meta_path, meta)
+    return True
+
+
+def parse_news_csv(file_path, encoding=None):
+    """
+    Reads the raw analyst-ratings CSV and returns a typed DataFrame with
+    the 'date' column normalized to timezone-naive UTC, along with the
+    date parser's per-format report. NAIVE_COLUMN flags the dates that had
+    no offset, so a later tz can read them as wall-clock time.
+    """
+    df = pd.read_csv(file_path, encoding=encoding)
+    df = df.drop(columns=[c for c in df.columns if c.startswith("Unnamed:")])
+    report = None
+    if "date" in df.columns:
+        parser = NewsDateParser()
+        df["date"] = parser.parse(df["date"])
+        df[NAIVE_COLUMN] = parser.naive
+        report = parser.report
+    return df, report
+
+
+def localize_news_dates(df, tz=None):
+    """
+    Moves the cached 'date' column into tz, in place: values that had an
+    offset are converted, values written without one are read as tz
+    wall-clock time (as NewsDateParser(tz=tz) would). Drops NAIVE_COLUMN.
+    """
+    naive = df.pop(NAIVE_COLUMN) if NAIVE_COLUMN in df.columns else None
+    if "date" in df.columns:
+        df["date"] = convert_timezone(df["date"], tz, naive)
+    return df
+
+
+def load_news(file_path, cache_dir=None, encoding=None, refresh=False, tz=None):
+    """
+    Loads the news CSV through a Parquet cache.
+    The first call parses the CSV and writes the cache; later calls read the
+    cache until the source file changes (size, mtime and content hash).
+    Dates are timezone-naive UTC unless tz (e.g. "America/New_York") is given,
+    in which case dates written without an offset are read as tz.
+    """
+    return localize_news_dates(_load_cached_news(file_path, cache_dir, encoding, refresh), tz)
+
+
+def _load_cached_news(file_path, cache_dir=None, encoding=None, refresh=False):
+    """The cached frame, NAIVE_COLUMN included."""
+    parquet_path, meta_path = _cache_paths(file_path, cache_dir)
+    if not refresh and is_cache_fresh(file_path, cache_dir):
+        return pd.read_parquet(parquet_path)
+
+    stat = _source_stat(file_path)
+    df, date_report = parse_news_csv(file_path, encoding=encoding)
+
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+    tmp_path = parquet_path + ".tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, parquet_path)
+
+    meta = {"version": CACHE_VERSION, "source": os.path.abspath(file_path),
+            "sha256": _file_hash(file_path), "rows": len(df), "date_report": date_report}
+    meta.update(stat)
+    _write_meta(meta_path, meta)
+    return df
+
+
+def date_report(file_path, cache_dir=None):
+    """
+    Returns the per-format date parsing counts recorded when the cache was built.
+    """
+    _, meta_path = _cache_paths(file_path, cache_dir)
+    meta = _read_meta(meta_path)
+    return None if meta is None else meta.get("date_report")
@@ -1,18 +1,26 @@
 import pandas as pd
-from textblob import TextBlob
+from src.news_loader import load_news
+from src.sentiment_store import headline_polarity
+from src.news_streaming import stream_daily_sentiment, DEFAULT_CHUNKSIZE
 
 def load_news_data(file_path):
-    df = pd.read_csv(file_path, parse_dates=["date"])
+    df = load_news(file_path)
     df["date"] = df["date"].dt.date
     return df
 
-def compute_sentiment(text):
-    analysis = TextBlob(str(text))
-    return analysis.sentiment.polarity
-
-def analyze_news_sentiment(df, stock):
+def analyze_news_sentiment(df, stock, engine="textblob"):
     df_stock = df[df["stock"] == stock].copy()
-    df_stock["Sentiment"] = df_stock["headline"].apply(compute_sentiment)
+    df_stock["Sentiment"] = headline_polarity(df_stock["headline"], engine=engine)
     daily_sentiment = df_stock.groupby("date")["Sentiment"].mean().reset_index()
     daily_sentiment.columns = ["date", "Avg_Sentiment"]
     return daily_sentiment
+
+def analyze_news_sentiment_streaming(file_path, stock, chunksize=DEFAULT_CHUNKSIZE, engine="textblob"):
+    """
+    Same output as analyze_news_sentiment(load_news_data(file_path), stock),
+    computed chunk by chunk without loading the whole file.
+    """
+    daily = stream_daily_sentiment(file_path, chunksize=chunksize, engine=engine).daily()
+    daily_sentiment = daily[daily["stock"] == stock][["date", "mean"]].reset_index(drop=True)
+    daily_sentiment.columns = ["date", "Avg_Sentiment"]
+    return daily_sentiment
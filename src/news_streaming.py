@@ -0,0 +1,193 @@
+# src/news_streaming.py
+
+import os
+import numpy as np
+import pandas as pd
+from src.date_parsing import NewsDateParser
+from src.parallel_sentiment import parallel_scores
+from src.sentiment_store import ENGINES, normalize_headlines, headline_polarity
+
+DEFAULT_CHUNKSIZE = 200_000
+AGG_COLUMNS = ["sum", "count", "sum_sq"]
+# Keys of the rows ingested as delta batches are saved next to the state file
+KEYS_SUFFIX = ".keys.npy"
+# Columns that identify a news row, where present; syndicated copies differ in url or publisher
+ROW_ID_COLUMNS = ["url", "publisher", "headline", "date", "stock"]
+
+
+def row_keys(news_df):
+    """uint64 key of each raw news row from its ROW_ID_COLUMNS; only identical rows share a key."""
+    columns = [c for c in ROW_ID_COLUMNS if c in news_df.columns]
+    rows = news_df[columns].astype(object).where(news_df[columns].notna(), "").astype(str)
+    return pd.util.hash_pandas_object(rows, index=False).to_numpy()
+
+
+class DailySentimentState:
+    """
+    Mergeable per-(stock, date) sentiment sums, counts and sums of squares.
+    Its size depends on the number of tickers and days, not on the number
+    of headlines, so it can be built from a file of any length. Rows folded
+    in as delta batches (ingest_news with dedupe=True) also leave an 8-byte
+    key each, so a delta ingested twice is counted once. meta holds what the
+    state was built from (e.g. the source file and engine) and is saved with it.
+    """
+
+    def __init__(self, frame=None, keys=None, meta=None):
+        if frame is None:
+            index = pd.MultiIndex.from_arrays([pd.Index([], dtype=object), pd.DatetimeIndex([])],
+                                              names=["stock", "date"])
+            frame = pd.DataFrame({col: pd.Series(dtype=float) for col in AGG_COLUMNS}, index=index)
+        self.frame = frame
+        self.keys = np.unique(np.asarray(keys if keys is not None else [], dtype=np.uint64))
+        self.meta = dict(meta or {})
+
+    def __len__(self):
+        return len(self.frame)
+
+    @classmethod
+    def load(cls, path):
+        frame = pd.read_parquet(path)
+        meta = frame.attrs.get("meta", {})
+        frame["stock"] = frame["stock"].astype(object)
+        keys = np.load(path + KEYS_SUFFIX) if os.path.exists(path + KEYS_SUFFIX) else None
+        return cls(frame.set_index(["stock", "date"]), keys=keys, meta=meta)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path + KEYS_SUFFIX + ".tmp", "wb") as f:
+            np.save(f, self.keys)
+        os.replace(path + KEYS_SUFFIX + ".tmp", path + KEYS_SUFFIX)
+        frame = self.frame.reset_index()
+        frame.attrs = {"meta": self.meta}
+        frame.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+
+    def unseen(self, keys):
+        """Mask of the rows whose key the state has not recorded."""
+        return ~np.isin(np.asarray(keys, dtype=np.uint64), self.keys)
+
+    def update(self, stocks, dates, scores, keys=None):
+        """
+        Folds one batch of scored headlines into the state.
+        dates are timestamps; they are grouped by calendar day. keys (from
+        row_keys) are recorded so the same rows can be skipped later; use
+        unseen to filter a batch before scoring it.
+        """
+        if keys is not None:
+            self.keys = np.union1d(self.keys, np.asarray(keys, dtype=np.uint64))
+        scores = np.asarray(scores, dtype=float)
+        batch = pd.DataFrame({
+            "stock": pd.Series(stocks).fillna("").to_numpy(),
+            "date": pd.DatetimeIndex(dates).normalize(),
+            "sum": scores,
+            "count": 1.0,
+            "sum_sq": scores ** 2,
+        })
+        batch = batch[batch["date"].notna()]
+        self._add(batch.groupby(["stock", "date"])[AGG_COLUMNS].sum())
+        return self
+
+    def merge(self, other):
+        """
+        Adds another state (e.g. built from a different file or chunk) into
+        this one. The two are assumed to hold different rows.
+        """
+        self._add(other.frame)
+        self.keys = np.union1d(self.keys, other.keys)
+        return self
+
+    def _add(self, frame):
+        self.frame = frame.copy() if self.frame.empty else self.frame.add(frame, fill_value=0)
+
+    def daily(self, by_ticker=True, dates=None):
+        """
+        Returns mean, std and count per (stock, date), or per date across all
+        stocks when by_ticker is False. Dates are datetime.date objects, like
+        the in-memory loaders produce. dates restricts the output to those days.
+        """
+        frame = self.frame
+        if dates is not None:
+            days = pd.DatetimeIndex(pd.to_datetime(pd.Index(dates))).normalize()
+            frame = frame[frame.index.get_level_values("date").isin(days)]
+        if by_ticker:
+            frame = frame[frame.index.get_level_values("stock") != ""]
+        else:
+            frame = frame.groupby(level="date").sum()
+        out = frame.sort_index().reset_index()
+
+        count = out["count"]
+        out["mean"] = out["sum"] / count
+        variance = (out["sum_sq"] - count * out["mean"] ** 2).clip(lower=0) / (count - 1)
+        out["std"] = np.sqrt(variance.where(count > 1))
+        out["count"] = count.astype(int)
+        out["date"] = out["date"].dt.date
+        return out.drop(columns=["sum", "sum_sq"])
+
+
+def ingest_news(state, news_df, engine="textblob", n_jobs=1, ticker_map=None, ascii_only=False,
+                dropna_headlines=False, tz=None, use_store=False, dedupe=False):
+    """
+    Scores a batch of raw news rows ('headline', 'date', 'stock') and folds
+    it into state. Returns the calendar days the batch touched.
+
+    dedupe is for incremental delta batches: rows recorded by an earlier
+    dedupe=True batch (same url, publisher, headline, date and stock, as far
+    as those columns exist) are skipped, and this batch's rows are recorded.
+    Rows within one batch are never merged, so streaming a file gives the
+    same counts as loading it whole.
+
+    ticker_map remaps the 'stock' column (unmapped tickers are dropped from
+    per-ticker output). ascii_only and dropna_headlines reproduce the
+    cleaning StockSentimentAnalyzer applies. The sentiment store is bypassed
+    by default: its in-memory lookup table would grow with every chunk and
+    undo the bounded memory of streaming. use_store=True scores through it,
+    which pays off when the same headlines are ingested again.
+    """
+    if dropna_headlines:
+        news_df = news_df.dropna(subset=["headline"])
+    headlines = news_df["headline"].astype(str)
+    if ascii_only:
+        headlines = headlines.str.encode("ascii", errors="ignore").str.decode("ascii")
+
+    keys = None
+    if dedupe:
+        keys = row_keys(news_df)
+        new = state.unseen(keys)
+        news_df, headlines, keys = news_df[new], headlines[new], keys[new]
+    dates = NewsDateParser(tz=tz).parse(news_df["date"])
+
+    if use_store:
+        scores = headline_polarity(headlines, n_jobs=n_jobs, engine=engine).to_numpy()
+    else:
+        scores = parallel_scores(normalize_headlines(headlines), ENGINES[engine][0],
+                                 n_jobs=n_jobs, progress=False)[:, 0] if len(headlines) else np.empty(0)
+
+    stocks = news_df["stock"].map(ticker_map) if ticker_map is not None else news_df["stock"]
+    state.update(stocks, dates, scores, keys=keys)
+    return pd.DatetimeIndex(dates.dropna()).normalize().unique()
+
+
+def stream_daily_sentiment(news_file, chunksize=DEFAULT_CHUNKSIZE, encoding=None, state=None, **ingest_options):
+    """
+    Reads the news CSV in chunks and folds each one into a
+    DailySentimentState via ingest_news. Only one chunk is in memory at a time.
+    """
+    state = state if state is not None else DailySentimentState()
+    reader = pd.read_csv(news_file, usecols=["headline", "date", "stock"], chunksize=chunksize, encoding=encoding)
+    for chunk in reader:
+        ingest_news(state, chunk, **ingest_options)
+    return state
+
+
+def update_daily_sentiment(state_path, news_df, **ingest_options):
+    """
+    Incremental update: loads the persisted state at state_path, folds in a
+    delta batch of headlines and saves it back. Returns the updated state and
+    the days that changed; every other day is left untouched. Rows already
+    folded in by an earlier update are skipped (dedupe=True by default).
+    """
+    ingest_options.setdefault("dedupe", True)
+    state = DailySentimentState.load(state_path) if os.path.exists(state_path) else DailySentimentState()
+    affected = ingest_news(state, news_df, **ingest_options)
+    state.save(state_path)
+    return state, affected
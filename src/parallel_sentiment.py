@@ -0,0 +1,41 @@
+# src/parallel_sentiment.py
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from tqdm.auto import tqdm
+
+DEFAULT_CHUNK_SIZE = 5_000
+MIN_PARALLEL_ROWS = 20_000
+
+
+def resolve_n_jobs(n_jobs):
+    """
+    Maps n_jobs to a worker count: None or <= 0 means all cores.
+    """
+    if n_jobs is None or n_jobs <= 0:
+        return os.cpu_count() or 1
+    return n_jobs
+
+
+def parallel_scores(texts, scorer, n_jobs=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                    min_parallel=MIN_PARALLEL_ROWS, progress=True):
+    """
+    Runs scorer over texts in chunks on a process pool.
+
+    scorer must be a module-level function taking a list of strings and
+    returning one row per string. Results are stacked in input order.
+    Inputs smaller than min_parallel, empty inputs, or n_jobs=1, are scored
+    serially.
+    """
+    texts = list(texts)
+    n_jobs = resolve_n_jobs(n_jobs)
+    if n_jobs == 1 or not texts or len(texts) < min_parallel:
+        return scorer(texts)
+
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(chunks))) as executor:
+        # executor.map yields in submission order, so stacking keeps rows aligned
+        results = tqdm(executor.map(scorer, chunks), total=len(chunks),
+                       desc="Scoring headlines", unit="chunk", disable=not progress)
+        return np.vstack(list(results))
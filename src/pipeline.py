@@ -0,0 +1,238 @@
+# src/pipeline.py
+
+import os
+import sys
+import ast
+import json
+import time
+import uuid
+import types
+import inspect
+import importlib
+import hashlib
+import joblib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from src.indicator_cache import file_fingerprint
+
+PIPELINE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "pipeline")
+# Modules of this package are hashed into the fingerprints of the stages that use them
+PACKAGE = __name__.split(".")[0]
+
+
+def _code_names(code):
+    """Global names a code object (and the functions, lambdas and comprehensions nested in it) refers to."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _imported_modules(module, package=PACKAGE):
+    """Package modules that module's source imports, at top level or inside functions."""
+    with open(module.__file__, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module)
+            # "from src import x" imports the submodule src.x
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+    modules = []
+    for name in sorted(names):
+        if name.split(".")[0] == package:
+            try:
+                modules.append(importlib.import_module(name))
+            except ImportError:
+                pass
+    return modules
+
+
+def package_modules(func, package=PACKAGE):
+    """
+    The package modules func depends on: the modules defining the globals it
+    refers to, then, transitively, every package module their source imports.
+    """
+    found = {}
+    pending = []
+
+    def add(module):
+        if module is not None and module.__name__.split(".")[0] == package and module.__name__ not in found:
+            found[module.__name__] = module
+            pending.append(module)
+
+    func_globals = getattr(func, "__globals__", {})
+    for name in _code_names(func.__code__) if hasattr(func, "__code__") else ():
+        obj = func_globals.get(name)
+        if inspect.ismodule(obj):
+            add(obj)
+        elif getattr(obj, "__module__", None):
+            add(sys.modules.get(obj.__module__))
+        elif name in func_globals:
+            # Plain data (e.g. a dict imported with "from src.x import NAME"): the modules defining that name
+            for module in list(sys.modules.values()):
+                if module is not None and name in vars(module) and vars(module)[name] is obj:
+                    add(module)
+    while pending:
+        module = pending.pop()
+        if getattr(module, "__file__", None):
+            for imported in _imported_modules(module, package):
+                add(imported)
+    return [found[name] for name in sorted(found)]
+
+
+def _file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class Stage:
+    """
+    One step of a Pipeline: func is called with the outputs of its deps as
+    keyword arguments (named after the dep stages) plus params. inputs lists
+    the files it reads, whose size and mtime feed its fingerprint. options
+    are extra keyword arguments that do not change the output (e.g. n_jobs)
+    and are left out of the fingerprint.
+    """
+
+    def __init__(self, name, func, deps=(), params=None, inputs=(), cache=True, options=None):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.params = dict(params or {})
+        self.options = dict(options or {})
+        self.inputs = list(inputs)
+        self.cache = cache
+
+    def code_id(self):
+        """
+        The function's qualified name and source, plus a digest of every
+        package module it reaches (see package_modules), so editing the stage
+        or any src/ code it calls invalidates it. Code outside the package
+        (installed libraries) is not tracked; bump PIPELINE_VERSION for that.
+        """
+        try:
+            source = inspect.getsource(self.func)
+        except (OSError, TypeError):
+            source = ""
+        modules = {module.__name__: _file_digest(module.__file__)
+                   for module in package_modules(self.func) if getattr(module, "__file__", None)}
+        return f"{self.func.__module__}.{self.func.__qualname__}:{source}:{json.dumps(modules, sort_keys=True)}"
+
+
+class Pipeline:
+    """
+    Runs stages as a dependency graph. Each stage's fingerprint hashes its
+    code, params, input file fingerprints and the fingerprints of its deps,
+    and its output is persisted under that key with joblib. A rerun only
+    executes stages whose fingerprint has no stored artifact; cached outputs
+    are loaded only when a stage that does run, or the caller, needs them.
+    Stages whose deps are ready run concurrently on a thread pool.
+    """
+
+    def __init__(self, cache_dir=None, max_workers=4):
+        self.cache_dir = cache_dir if cache_dir is not None else DEFAULT_CACHE_DIR
+        self.max_workers = max_workers
+        self.stages = {}
+        self.report = {}
+
+    def add(self, name, func, deps=(), params=None, inputs=(), cache=True, options=None):
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already defined.")
+        missing = [d for d in deps if d not in self.stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on undefined stages: {missing}")
+        self.stages[name] = Stage(name, func, deps, params, inputs, cache, options)
+        return self
+
+    def _required(self, targets):
+        """Stages needed for targets, in definition order (which is topological, see add)."""
+        needed = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage '{name}'.")
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.stages[name].deps)
+        return [name for name in self.stages if name in needed]
+
+    def fingerprints(self, targets=None):
+        keys = {}
+        for name in self._required(targets or list(self.stages)):
+            stage = self.stages[name]
+            payload = {
+                "version": PIPELINE_VERSION,
+                "name": name,
+                "code": stage.code_id(),
+                "params": stage.params,
+                "inputs": [file_fingerprint(path) for path in stage.inputs],
+                "deps": {dep: keys[dep] for dep in stage.deps},
+            }
+            keys[name] = hashlib.sha256(json.dumps(payload, sort_keys=True, default=repr).encode()).hexdigest()[:32]
+        return keys
+
+    def _path(self, name, key):
+        return os.path.join(self.cache_dir, f"{name}-{key}.joblib")
+
+    def _save(self, name, key, output):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(name, key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        joblib.dump(output, tmp_path)
+        os.replace(tmp_path, path)
+
+    def run(self, targets=None, force=()):
+        """
+        Brings targets (default: every stage) up to date and returns
+        {stage name: output} for them. force lists stages to recompute even
+        if cached. Per-stage status and timings are stored in self.report.
+        """
+        targets = list(targets or self.stages)
+        order = self._required(targets)
+        keys = self.fingerprints(targets)
+        cached = {name for name in order
+                  if self.stages[name].cache and name not in force and os.path.exists(self._path(name, keys[name]))}
+        to_run = [name for name in order if name not in cached]
+
+        # Cached outputs that a running stage or the caller will read
+        wanted = set(targets) | {dep for name in to_run for dep in self.stages[name].deps}
+        outputs = {}
+        self.report = {}
+        for name in order:
+            if name in cached:
+                self.report[name] = {"status": "cached", "seconds": 0.0}
+                if name in wanted:
+                    outputs[name] = joblib.load(self._path(name, keys[name]))
+
+        done = set(cached)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while len(done) < len(order):
+                for name in to_run:
+                    if name not in done and name not in running.values() and set(self.stages[name].deps) <= done:
+                        running[executor.submit(self._execute, name, keys[name], outputs)] = name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    # Re-raises the stage's exception; the pool waits for stages already running
+                    outputs[name], self.report[name] = future.result()
+                    done.add(name)
+
+        return {name: outputs[name] for name in targets}
+
+    def _execute(self, name, key, outputs):
+        stage = self.stages[name]
+        start = time.perf_counter()
+        output = stage.func(**{dep: outputs[dep] for dep in stage.deps}, **stage.params, **stage.options)
+        if stage.cache:
+            self._save(name, key, output)
+        return output, {"status": "ran", "seconds": time.perf_counter() - start}
+
+    def print_report(self):
+        for name, info in self.report.items():
+            print(f"{name:<16} {info['status']:<7} {info['seconds']:8.2f}s")
@@ -0,0 +1,207 @@
+# src/price_panel.py
+
+import os
+import time
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+from src.news_loader import CACHE_DIRNAME, _source_stat, _read_meta, _write_meta
+
+PANEL_VERSION = 2
+# Each save writes a new panel_dir/gen-* folder; panel.json names the current one
+GENERATION_PREFIX = "gen-"
+PRICE_FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume", "Dividends", "Stock Splits"]
+# Trailing UTC offset after a time of day, e.g. "2020-01-02 00:00:00-05:00"
+UTC_OFFSET = r"(\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)(?:Z|[+-]\d{2}:?\d{2})$"
+
+
+def ticker_from_path(file_path):
+    """Ticker symbol of a yfinance export named SYMBOL_historical_data.csv."""
+    return os.path.basename(file_path).split("_")[0]
+
+
+def _parse_trading_days(dates):
+    """
+    Parses a yfinance 'Date' column to midnight timestamps of the local
+    trading day. Offsets such as -04:00 are dropped rather than converted,
+    so a session keeps its own calendar date.
+    """
+    if dates.dtype == object:
+        # Strip offsets textually: mixed offsets (across a DST change) cannot share one dtype
+        dates = dates.str.replace(UTC_OFFSET, r"\1", regex=True)
+    parsed = pd.to_datetime(dates, errors="coerce")
+    if parsed.dt.tz is not None:
+        parsed = parsed.dt.tz_localize(None)
+    return parsed.dt.normalize()
+
+
+def _remove_old_generations(panel_dir, keep):
+    """Deletes the generation folders (and any pre-generation arrays) except keep; mapped files are skipped."""
+    for entry in os.listdir(panel_dir):
+        path = os.path.join(panel_dir, entry)
+        if entry.startswith(GENERATION_PREFIX) and entry != keep:
+            shutil.rmtree(path, ignore_errors=True)
+        elif entry in ("values.npy", "dates.npy"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class PricePanel:
+    """
+    All tickers' daily prices in one aligned float array of shape
+    (ticker, trading day, field), with an int64 (ns since epoch) date axis
+    shared by every ticker. Days a ticker did not trade are NaN.
+    """
+
+    def __init__(self, tickers, dates, fields, values):
+        self.tickers = list(tickers)
+        self.dates = np.asarray(dates, dtype=np.int64)
+        self.fields = list(fields)
+        self.values = values
+
+    def __len__(self):
+        return len(self.tickers)
+
+    @classmethod
+    def from_csv(cls, stock_files, encoding=None):
+        """Reads the yfinance CSVs and packs them into a panel."""
+        frames = []
+        for stock_file in stock_files:
+            df = pd.read_csv(stock_file, encoding=encoding)
+            df["Date"] = _parse_trading_days(df["Date"])
+            df = df.dropna(subset=["Date"]).drop_duplicates("Date", keep="last")
+            frames.append(df)
+
+        fields = [f for f in PRICE_FIELDS if any(f in df.columns for df in frames)]
+        if not frames:
+            return cls([], [], fields, np.empty((0, 0, len(fields))))
+        dates = np.unique(np.concatenate([df["Date"].to_numpy("datetime64[ns]").view(np.int64) for df in frames]))
+
+        values = np.full((len(frames), len(dates), len(fields)), np.nan)
+        for k, df in enumerate(frames):
+            rows = np.searchsorted(dates, df["Date"].to_numpy("datetime64[ns]").view(np.int64))
+            for j, field in enumerate(fields):
+                if field in df.columns:
+                    values[k, rows, j] = pd.to_numeric(df[field], errors="coerce").to_numpy(float)
+        return cls([ticker_from_path(f) for f in stock_files], dates, fields, values)
+
+    def save(self, panel_dir, meta=None):
+        """
+        Writes the panel as .npy arrays in a new generation folder under
+        panel_dir, then points the panel.json manifest at it. Arrays already
+        written are never overwritten: a reader may still have them memory-
+        mapped, which Windows refuses to replace. Older generations are
+        removed where the OS allows it and retried on the next save.
+        """
+        os.makedirs(panel_dir, exist_ok=True)
+        generation = f"{GENERATION_PREFIX}{time.time_ns():x}-{os.getpid()}"
+        os.makedirs(os.path.join(panel_dir, generation))
+        for name, array in (("values", self.values), ("dates", self.dates)):
+            np.save(os.path.join(panel_dir, generation, f"{name}.npy"), np.ascontiguousarray(array))
+        header = dict(meta or {}, version=PANEL_VERSION, tickers=self.tickers, fields=self.fields,
+                      generation=generation)
+        _write_meta(os.path.join(panel_dir, "panel.json"), header)
+        _remove_old_generations(panel_dir, keep=generation)
+
+    @classmethod
+    def open(cls, panel_dir, mmap_mode="r"):
+        """Memory-maps a saved panel; only the pages actually touched are read."""
+        header = _read_meta(os.path.join(panel_dir, "panel.json"))
+        data_dir = os.path.join(panel_dir, header["generation"])
+        values = np.load(os.path.join(data_dir, "values.npy"), mmap_mode=mmap_mode)
+        dates = np.load(os.path.join(data_dir, "dates.npy"))
+        return cls(header["tickers"], dates, header["fields"], values)
+
+    def ticker_index(self, ticker):
+        try:
+            return self.tickers.index(ticker)
+        except ValueError:
+            raise KeyError(f"Ticker '{ticker}' is not in the price panel.") from None
+
+    def field(self, name):
+        """(ticker, day) view of one price field."""
+        if name not in self.fields:
+            raise KeyError(f"Field '{name}' is not in the price panel.")
+        return self.values[:, :, self.fields.index(name)]
+
+    def returns(self, field="Close"):
+        """
+        (ticker, day) simple returns of field. Each day is compared with the
+        ticker's previous day that has a price, like pct_change after dropping
+        missing rows; days without a price or without a prior price are NaN.
+        """
+        prices = np.asarray(self.field(field))
+        valid = ~np.isnan(prices)
+        positions = np.where(valid, np.arange(prices.shape[1]), -1)
+        last_valid = np.maximum.accumulate(positions, axis=1)
+        prev = np.full_like(last_valid, -1)
+        prev[:, 1:] = last_valid[:, :-1]
+
+        prev_prices = np.take_along_axis(prices, np.maximum(prev, 0), axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = prices / prev_prices - 1.0
+        out[~valid | (prev < 0)] = np.nan
+        return out
+
+    def to_frame(self, fields=None, tickers=None, returns=None, return_name="Return", dropna=True):
+        """
+        Long DataFrame with 'ticker', 'Date' and the requested fields, sorted by
+        ticker then date. returns='Close' (etc.) adds a return_name column and,
+        with dropna, keeps only days that have a return; otherwise only days
+        that have a price in the first requested field.
+        """
+        fields = self.fields if fields is None else list(fields)
+        rows = np.arange(len(self.tickers)) if tickers is None else np.array(
+            [self.ticker_index(t) for t in tickers], dtype=np.int64)
+        n_days = len(self.dates)
+
+        columns = {
+            "ticker": np.repeat(np.asarray(self.tickers, dtype=object)[rows], n_days) if len(rows) else
+            np.array([], dtype=object),
+            "Date": np.tile(self.dates.view("datetime64[ns]"), len(rows)),
+        }
+        for name in fields:
+            columns[name] = np.asarray(self.field(name))[rows].ravel()
+        if returns is not None:
+            columns[return_name] = self.returns(returns)[rows].ravel()
+        df = pd.DataFrame(columns)
+
+        if dropna:
+            key = return_name if returns is not None else (fields[0] if fields else None)
+            if key is not None:
+                df = df[df[key].notna()]
+        return df.reset_index(drop=True)
+
+
+def _panel_dir(stock_files, cache_dir=None):
+    paths = sorted(os.path.abspath(f) for f in stock_files)
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(paths[0]), CACHE_DIRNAME)
+    key = hashlib.sha256("\n".join(paths).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, "prices", key)
+
+
+def load_price_panel(stock_files, cache_dir=None, refresh=False, encoding=None):
+    """
+    Loads the stock CSVs as a memory-mapped PricePanel.
+    The first call packs the files into a .cache folder next to them; later
+    calls map the packed arrays straight from disk until any file's size or
+    mtime changes. Tickers keep the order of stock_files.
+    """
+    stock_files = list(stock_files)
+    if not stock_files:
+        return PricePanel.from_csv([])
+    panel_dir = _panel_dir(stock_files, cache_dir)
+    sources = [dict(_source_stat(f), path=os.path.abspath(f)) for f in stock_files]
+
+    meta = _read_meta(os.path.join(panel_dir, "panel.json"))
+    if (not refresh and meta is not None and meta.get("version") == PANEL_VERSION
+            and meta.get("sources") == sources):
+        return PricePanel.open(panel_dir)
+
+    panel = PricePanel.from_csv(stock_files, encoding=encoding)
+    panel.save(panel_dir, meta={"sources": sources})
+    return PricePanel.open(panel_dir)
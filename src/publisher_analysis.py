@@ -1,9 +1,12 @@
 # src/publisher_analysis.py
 
+import numpy as np
 import pandas as pd
 from collections import Counter
 import matplotlib.pyplot as plt
 import seaborn as sns
+from src.keyword_ranking import group_term_matrix, top_terms_per_row
+from src.charts import finish
 
 class PublisherAnalyzer:
     def __init__(self, data, publisher_col="publisher", headline_col="headline"):
@@ -17,15 +20,15 @@ class PublisherAnalyzer:
         self.publisher_stats = counts
         return counts
 
-    def plot_top_publishers(self, top_n=10):
+    def plot_top_publishers(self, top_n=10, path=None):
         top_publishers = self.top_publishers(top_n)
-        plt.figure(figsize=(10, 6))
+        fig = plt.figure(figsize=(10, 6))
         sns.barplot(x=top_publishers.values, y=top_publishers.index, palette="viridis")
         plt.title("Top Publishers by Article Count")
         plt.xlabel("Number of Articles")
         plt.ylabel("Publisher")
         plt.tight_layout()
-        plt.show()
+        return finish(fig, path)
 
     def analyze_email_domains(self):
         publishers = self.data[self.publisher_col].dropna().astype(str)
@@ -34,20 +37,40 @@ class PublisherAnalyzer:
         domain_counts = domains.value_counts()
         return domain_counts
 
-    def compare_publisher_content(self, sample_size=1000):
+    def keyword_profiles(self, top_n=5, weighting="count", max_features=1000, sample_size=None):
         """
-        Returns a DataFrame with publishers and their most frequent keywords
-        to examine if their content differs.
+        Top keywords of every publisher over the whole dataset (or a random
+        sample of sample_size rows). Headlines are vectorized once; a sparse
+        publisher-indicator product sums their term counts per publisher and
+        each row's top terms are picked with argpartition, so nothing is
+        densified. weighting="tfidf" treats each publisher as one document and
+        down-weights terms every publisher uses.
+        Returns [publisher_col, 'rank', 'keyword', 'score'].
         """
-        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+
+        if weighting not in ("count", "tfidf"):
+            raise ValueError("weighting must be 'count' or 'tfidf'.")
+        data = self.data.dropna(subset=[self.publisher_col, self.headline_col])
+        if sample_size is not None:
+            data = data.sample(n=min(sample_size, len(data)), random_state=42)
 
-        sample = self.data.dropna(subset=[self.publisher_col, self.headline_col]).sample(n=min(sample_size, len(self.data)), random_state=42)
-        grouped = sample.groupby(self.publisher_col)[self.headline_col].apply(lambda x: " ".join(x)).reset_index()
+        vectorizer = CountVectorizer(stop_words='english', max_features=max_features)
+        X = vectorizer.fit_transform(data[self.headline_col].astype(str))
+        counts, publishers = group_term_matrix(data[self.publisher_col], X)
+        if weighting == "tfidf":
+            counts = TfidfTransformer().fit_transform(counts)
 
-        vectorizer = CountVectorizer(stop_words='english', max_features=1000)
-        X = vectorizer.fit_transform(grouped[self.headline_col])
-        features = vectorizer.get_feature_names_out()
-        keywords_df = pd.DataFrame(X.toarray(), columns=features, index=grouped[self.publisher_col])
+        profiles = top_terms_per_row(counts, vectorizer.get_feature_names_out(), top_n, self.publisher_col)
+        profiles[self.publisher_col] = np.asarray(publishers, dtype=object)[profiles[self.publisher_col].to_numpy()]
+        return profiles
 
-        top_keywords = keywords_df.apply(lambda row: row.nlargest(5).index.tolist(), axis=1)
+    def compare_publisher_content(self, sample_size=None, top_n=5, weighting="count"):
+        """
+        Returns a DataFrame with publishers and their most frequent keywords
+        to examine if their content differs. Uses every headline unless
+        sample_size is given.
+        """
+        profiles = self.keyword_profiles(top_n=top_n, weighting=weighting, sample_size=sample_size)
+        top_keywords = profiles.groupby(self.publisher_col, sort=True)["keyword"].agg(list)
         return top_keywords.reset_index(name='Top Keywords')
@@ -3,7 +3,8 @@
 import os
 import pandas as pd
 import matplotlib.pyplot as plt
-import talib
+from src.indicators import add_indicators
+from src.charts import DEFAULT_MAX_POINTS, DEFAULT_DPI, downsample, finish, plot_line
 
 def load_stock_data(file_path):
     """
@@ -20,54 +21,40 @@ def add_technical_indicators(df):
     """
     Adds SMA, RSI, and MACD indicators to the dataframe.
     """
-    close = df['Close'].values
+    # SMA 20/50, RSI 14 and MACD 12/26/9 from the shared indicator engine
+    return add_indicators(df, 'Close')
 
-    # Moving Averages
-    df['SMA_20'] = talib.SMA(close, timeperiod=20)
-    df['SMA_50'] = talib.SMA(close, timeperiod=50)
-
-    # RSI
-    df['RSI'] = talib.RSI(close, timeperiod=14)
-
-    # MACD
-    macd, macd_signal, macd_hist = talib.MACD(close)
-    df['MACD'] = macd
-    df['MACD_Signal'] = macd_signal
-    df['MACD_Hist'] = macd_hist
-
-    return df
-
-def plot_price_with_indicators(df, symbol):
+def plot_price_with_indicators(df, symbol, path=None, max_points=DEFAULT_MAX_POINTS, dpi=DEFAULT_DPI):
     """
-    Plots Close price, SMAs, RSI, and MACD in subplots.
+    Plots Close price, SMAs, RSI, and MACD in subplots. Long histories are
+    downsampled (LTTB) to max_points per line, each on its own values; with
+    path the chart is saved there instead of shown.
     """
-    plt.figure(figsize=(14, 10))
+    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(14, 10))
 
     # Price + SMA
-    plt.subplot(3, 1, 1)
-    plt.plot(df.index, df['Close'], label='Close Price')
-    plt.plot(df.index, df['SMA_20'], label='SMA 20', linestyle='--')
-    plt.plot(df.index, df['SMA_50'], label='SMA 50', linestyle='--')
-    plt.title(f"{symbol} Price with SMAs")
-    plt.legend()
-    plt.grid()
+    plot_line(ax1, df, 'Close', max_points, label='Close Price')
+    plot_line(ax1, df, 'SMA_20', max_points, label='SMA 20', linestyle='--')
+    plot_line(ax1, df, 'SMA_50', max_points, label='SMA 50', linestyle='--')
+    ax1.set_title(f"{symbol} Price with SMAs")
+    ax1.legend()
+    ax1.grid()
 
     # RSI
-    plt.subplot(3, 1, 2)
-    plt.plot(df.index, df['RSI'], color='purple')
-    plt.axhline(70, linestyle='--', color='red')
-    plt.axhline(30, linestyle='--', color='green')
-    plt.title("RSI (14)")
-    plt.grid()
-
-    # MACD
-    plt.subplot(3, 1, 3)
-    plt.plot(df.index, df['MACD'], label='MACD', color='black')
-    plt.plot(df.index, df['MACD_Signal'], label='Signal', color='orange')
-    plt.bar(df.index, df['MACD_Hist'], label='Hist', color='gray', alpha=0.5)
-    plt.title("MACD")
-    plt.legend()
-    plt.grid()
-
-    plt.tight_layout()
-    plt.show()
+    plot_line(ax2, df, 'RSI', max_points, color='purple')
+    ax2.axhline(70, linestyle='--', color='red')
+    ax2.axhline(30, linestyle='--', color='green')
+    ax2.set_title("RSI (14)")
+    ax2.grid()
+
+    # MACD; the histogram is one filled area rather than a rectangle per bar
+    plot_line(ax3, df, 'MACD', max_points, label='MACD', color='black')
+    plot_line(ax3, df, 'MACD_Signal', max_points, label='Signal', color='orange')
+    hist = downsample(df[['MACD_Hist']].dropna(), 'MACD_Hist', max_points)
+    ax3.fill_between(hist.index, 0, hist['MACD_Hist'], label='Hist', color='gray', alpha=0.5, linewidth=0)
+    ax3.set_title("MACD")
+    ax3.legend()
+    ax3.grid()
+
+    fig.tight_layout()
+    return finish(fig, path, dpi)
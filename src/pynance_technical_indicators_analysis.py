@@ -4,6 +4,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import pynance as pn
 import os
+from src.indicators import sma, rsi
+from src.charts import DEFAULT_MAX_POINTS, DEFAULT_DPI, finish, plot_line
 
 
 def load_stock_data(file_path):
@@ -20,38 +22,35 @@ def add_technical_indicators(df):
     """
     Adds simple financial metrics using PyNance.
     """
+    close = df["Close"].to_numpy(dtype=float)
+
     # Moving Averages
-    df["SMA_20"] = df["Close"].rolling(window=20).mean()
-    df["SMA_50"] = df["Close"].rolling(window=50).mean()
-
-    # RSI (simplified version using price changes)
-    delta = df["Close"].diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    avg_gain = gain.rolling(window=14).mean()
-    avg_loss = loss.rolling(window=14).mean()
-    rs = avg_gain / avg_loss
-    df["RSI"] = 100 - (100 / (1 + rs))
+    df["SMA_20"] = sma(close, 20)
+    df["SMA_50"] = sma(close, 50)
+
+    # RSI with Wilder smoothing, matching talib
+    df["RSI"] = rsi(close, 14)
 
     return df
 
 
-def plot_price_with_indicators(df, symbol):
+def plot_price_with_indicators(df, symbol, path=None, max_points=DEFAULT_MAX_POINTS, dpi=DEFAULT_DPI):
     """
-    Plots the closing price with SMA and RSI.
+    Plots the closing price with SMA and RSI, each line downsampled to
+    max_points on its own values; saved to path instead of shown when given.
     """
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 8), sharex=True)
 
     # Plot Closing Price with SMAs
-    ax1.plot(df.index, df["Close"], label="Close", color="black")
-    ax1.plot(df.index, df["SMA_20"], label="SMA 20", color="blue", linestyle="--")
-    ax1.plot(df.index, df["SMA_50"], label="SMA 50", color="orange", linestyle="--")
+    plot_line(ax1, df, "Close", max_points, label="Close", color="black")
+    plot_line(ax1, df, "SMA_20", max_points, label="SMA 20", color="blue", linestyle="--")
+    plot_line(ax1, df, "SMA_50", max_points, label="SMA 50", color="orange", linestyle="--")
     ax1.set_title(f"{symbol} Price & Moving Averages")
     ax1.legend()
     ax1.grid(True)
 
     # Plot RSI
-    ax2.plot(df.index, df["RSI"], label="RSI", color="green")
+    plot_line(ax2, df, "RSI", max_points, label="RSI", color="green")
     ax2.axhline(70, color="red", linestyle="--", alpha=0.5)
     ax2.axhline(30, color="blue", linestyle="--", alpha=0.5)
     ax2.set_title(f"{symbol} RSI")
@@ -60,4 +59,4 @@ def plot_price_with_indicators(df, symbol):
     ax2.grid(True)
 
     plt.tight_layout()
-    plt.show()
+    return finish(fig, path, dpi)
@@ -1,24 +1,24 @@
 # sentiment_analysis.py
 
 import pandas as pd
-from textblob import TextBlob
+from src.news_loader import load_news
+from src.sentiment_store import headline_polarity
 
 class HeadlineSentimentAnalyzer:
-    def __init__(self, csv_file: str):
+    def __init__(self, csv_file: str, n_jobs: int = 1, engine: str = "textblob"):
         self.csv_file = csv_file
+        self.n_jobs = n_jobs
+        self.engine = engine
         self.df = self._load_and_prepare()
 
     def _load_and_prepare(self):
-        df = pd.read_csv(self.csv_file)
+        df = load_news(self.csv_file)
         if 'headline' not in df.columns:
             raise ValueError("The input file must contain a 'headline' column.")
         df.dropna(subset=['headline'], inplace=True)
         return df
 
     def analyze_sentiment(self):
-        def get_polarity(text):
-            return TextBlob(text).sentiment.polarity
-        
         def get_sentiment_label(polarity):
             if polarity > 0.1:
                 return 'positive'
@@ -27,7 +27,7 @@ class HeadlineSentimentAnalyzer:
             else:
                 return 'neutral'
 
-        self.df['polarity'] = self.df['headline'].apply(get_polarity)
+        self.df['polarity'] = headline_polarity(self.df['headline'], n_jobs=self.n_jobs, engine=self.engine)
         self.df['sentiment'] = self.df['polarity'].apply(get_sentiment_label)
         return self.df[['headline', 'polarity', 'sentiment']]
 
@@ -0,0 +1,161 @@
+# src/sentiment_store.py
+
+import os
+import glob
+import uuid
+import numpy as np
+import pandas as pd
+from importlib.metadata import version as package_version
+from textblob import TextBlob
+from src.parallel_sentiment import parallel_scores
+from src.lexicon_sentiment import ENGINE_VERSION, lexicon_scores
+
+SCORER_VERSION = f"textblob-{package_version('textblob')}"
+LEXICON_VERSION = f"lexicon-{ENGINE_VERSION}-{package_version('textblob')}"
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "sentiment")
+SCORE_COLUMNS = ["polarity", "subjectivity"]
+
+
+def normalize_headlines(texts):
+    """
+    Normalizes headlines for hashing: string conversion, collapsed whitespace.
+    Case and punctuation are kept since TextBlob scores depend on them.
+    """
+    texts = pd.Series(texts)
+    return texts.astype(str).str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def hash_headlines(texts):
+    """
+    Returns a uint64 content hash for each (already normalized) headline.
+    """
+    return pd.util.hash_array(np.asarray(texts, dtype=object))
+
+
+def textblob_scores(texts):
+    """
+    Scores a list of strings with TextBlob, one (polarity, subjectivity) row each.
+    """
+    scores = np.empty((len(texts), 2))
+    for i, text in enumerate(texts):
+        sentiment = TextBlob(text).sentiment
+        scores[i] = sentiment.polarity, sentiment.subjectivity
+    return scores
+
+
+class SentimentStore:
+    """
+    On-disk polarity/subjectivity store keyed by normalized-headline hash.
+
+    Scores live in Parquet part files under store_dir/<scorer version>/, so
+    upgrading TextBlob starts a fresh store instead of mixing results.
+    Each call scores only headlines the store has never seen.
+    """
+
+    def __init__(self, store_dir=None, scorer=textblob_scores, version=SCORER_VERSION, max_parts=32):
+        self.store_dir = os.path.join(store_dir or DEFAULT_STORE_DIR, version)
+        self.scorer = scorer
+        self.version = version
+        self.max_parts = max_parts
+        self._scores = None
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.store_dir, "part-*.parquet")))
+
+    def _load(self):
+        if self._scores is None:
+            parts = self._parts()
+            if parts:
+                scores = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+                self._scores = scores.drop_duplicates("key").set_index("key")
+            else:
+                self._scores = pd.DataFrame(columns=SCORE_COLUMNS, dtype=float,
+                                            index=pd.Index([], dtype="uint64", name="key"))
+        return self._scores
+
+    def _append(self, new_scores):
+        os.makedirs(self.store_dir, exist_ok=True)
+        part_path = os.path.join(self.store_dir, f"part-{uuid.uuid4().hex}.parquet")
+        tmp_path = part_path + ".tmp"
+        new_scores.reset_index().to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, part_path)
+        known = self._load()
+        self._scores = new_scores if known.empty else pd.concat([known, new_scores])
+
+        if len(self._parts()) > self.max_parts:
+            self.compact()
+
+    def compact(self):
+        """
+        Merges all part files into one.
+        """
+        parts = self._parts()
+        scores = self._load()
+        os.makedirs(self.store_dir, exist_ok=True)
+        merged_path = os.path.join(self.store_dir, f"part-{uuid.uuid4().hex}.parquet")
+        scores.reset_index().to_parquet(merged_path + ".tmp", index=False)
+        os.replace(merged_path + ".tmp", merged_path)
+        for p in parts:
+            os.remove(p)
+
+    def __len__(self):
+        return len(self._load())
+
+    def score(self, texts, n_jobs=1):
+        """
+        Returns a DataFrame with 'polarity' and 'subjectivity' for each text,
+        aligned to the input index. Duplicate headlines are scored once.
+        With n_jobs != 1, unseen headlines are scored on a process pool.
+        """
+        texts = pd.Series(texts)
+        codes, uniques = pd.factorize(normalize_headlines(texts))
+        uniques = np.asarray(uniques, dtype=object)
+        keys = hash_headlines(uniques)
+
+        known = self._load()
+        seen = np.asarray(pd.Index(keys).isin(known.index))
+        if not seen.all():
+            unseen_keys, first = np.unique(keys[~seen], return_index=True)
+            scores = parallel_scores(uniques[~seen][first], self.scorer, n_jobs=n_jobs)
+            new_scores = pd.DataFrame(scores, columns=SCORE_COLUMNS,
+                                      index=pd.Index(unseen_keys, dtype="uint64", name="key"))
+            self._append(new_scores)
+            known = self._scores
+
+        unique_scores = known.loc[keys, SCORE_COLUMNS].to_numpy()
+        return pd.DataFrame(unique_scores[codes], columns=SCORE_COLUMNS, index=texts.index)
+
+
+# "lexicon" gives the same scores as "textblob", computed in one vectorized batch
+ENGINES = {
+    "textblob": (textblob_scores, SCORER_VERSION),
+    "lexicon": (lexicon_scores, LEXICON_VERSION),
+}
+DEFAULT_ENGINE = "textblob"
+
+_default_stores = {}
+
+
+def get_default_store(engine=DEFAULT_ENGINE):
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown sentiment engine '{engine}', expected one of {list(ENGINES)}")
+    if engine not in _default_stores:
+        scorer, version = ENGINES[engine]
+        _default_stores[engine] = SentimentStore(scorer=scorer, version=version)
+    return _default_stores[engine]
+
+
+def score_headlines(texts, store=None, n_jobs=1, engine=DEFAULT_ENGINE):
+    """
+    Scores headlines through the shared sentiment store for the given engine.
+    """
+    if store is None:
+        store = get_default_store(engine)
+    return store.score(texts, n_jobs=n_jobs)
+
+
+def headline_polarity(texts, store=None, n_jobs=1, engine=DEFAULT_ENGINE):
+    """
+    TextBlob polarity for each headline, via the shared sentiment store.
+    """
+    return score_headlines(texts, store, n_jobs=n_jobs, engine=engine)["polarity"]
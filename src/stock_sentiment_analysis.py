@@ -1,69 +1,197 @@
 # src/stock_sentiment_analysis.py
 
+import os
 import pandas as pd
 import numpy as np
-from textblob import TextBlob
 import matplotlib.pyplot as plt
-import seaborn as sns
 from typing import List
 import chardet
+from src.news_loader import load_news, is_cache_fresh, _file_hash, _source_stat
+from src.sentiment_store import headline_polarity
+from src.news_streaming import DailySentimentState, DEFAULT_CHUNKSIZE, stream_daily_sentiment, ingest_news
+from src.price_panel import load_price_panel
+from src.correlation_engine import SentimentReturnPanel
+from src.correlation_significance import correlation_significance
+from src.charts import DEFAULT_MAX_POINTS, finish, plot_line, render_series_reports
+
+
+MOMENT_COLUMNS = ['n', 'mx', 'my', 'mxx', 'myy', 'mxy']
+
+
+def _pearson_sums(df, x='daily_return', y='sentiment_score', by='ticker'):
+    """
+    Per-group count, means and centered sums of squares and products for
+    Pearson r, so rows can be added or removed later. Centering keeps the
+    merges exact where raw sums of squares would cancel catastrophically.
+    """
+    groups = df.groupby(by)
+    dx = df[x] - groups[x].transform('mean')
+    dy = df[y] - groups[y].transform('mean')
+    centered = pd.DataFrame({by: df[by], 'mxx': dx ** 2, 'myy': dy ** 2, 'mxy': dx * dy}).groupby(by).sum()
+    sums = pd.DataFrame({'n': groups[x].size().astype(float), 'mx': groups[x].mean(), 'my': groups[y].mean()})
+    return sums.join(centered)[MOMENT_COLUMNS]
+
+
+def _combine_sums(a, b, sign=1):
+    """
+    Chan et al.'s pairwise update of _pearson_sums: adds b's rows to a, or
+    with sign=-1 removes them (b must be a subset of a's rows).
+    """
+    index = a.index.union(b.index)
+    a = a.reindex(index).fillna(0.0)
+    b = b.reindex(index).fillna(0.0)
+    n = a['n'] + sign * b['n']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = pd.DataFrame({'n': n,
+                            'mx': ((a['n'] * a['mx'] + sign * b['n'] * b['mx']) / n).fillna(0.0),
+                            'my': ((a['n'] * a['my'] + sign * b['n'] * b['my']) / n).fillna(0.0)})
+        # Correction for the gap between b's mean and the mean of the part b is not in
+        rest_n, rest = (a['n'], a) if sign > 0 else (n, out)
+        weight = (rest_n * b['n'] / (rest_n + b['n'])).fillna(0.0)
+    dx, dy = b['mx'] - rest['mx'], b['my'] - rest['my']
+    for col, d in (('mxx', dx * dx), ('myy', dy * dy), ('mxy', dx * dy)):
+        out[col] = a[col] + sign * (b[col] + weight * d)
+    out = out[out['n'] > 0]
+    out.loc[:, ['mxx', 'myy']] = out[['mxx', 'myy']].clip(lower=0)
+    return out[MOMENT_COLUMNS]
+
+
+def _pearson_from_sums(sums):
+    r = sums['mxy'] / np.sqrt(sums['mxx'] * sums['myy'])
+    return r.where(sums['n'] > 1).to_dict()
+
+
+def _news_source(news_file):
+    """Size, mtime and content hash of the news file, stored with a sentiment state built from it."""
+    return dict(_source_stat(news_file), sha256=_file_hash(news_file))
+
+
+def _same_source(source, news_file):
+    """Like is_cache_fresh: size and mtime are trusted when they match, otherwise the content hash decides."""
+    if not source:
+        return False
+    stat = _source_stat(news_file)
+    if stat['size'] != source.get('size'):
+        return False
+    return stat['mtime_ns'] == source.get('mtime_ns') or _file_hash(news_file) == source.get('sha256')
 
 
 class StockSentimentAnalyzer:
-    def __init__(self, stock_files: List[str], news_file: str):
+    def __init__(self, stock_files: List[str], news_file: str, n_jobs: int = 1, engine: str = "textblob",
+                 chunksize: int = None, state_path: str = None):
         self.stock_files = stock_files
         self.news_file = news_file
+        self.n_jobs = n_jobs
+        self.engine = engine
+        # When set, news is streamed in chunks of this many rows instead of loaded whole
+        self.chunksize = chunksize
+        # When set, the daily sentiment state is persisted here and reused for incremental updates
+        self.state_path = state_path
+        self.news_state = None
+        self._returns_df = None
+        self._merged_df = None
+        self._corr_sums = None
         
         self.stock_df = self._load_stock_data()
         self.sentiment_df = self._analyze_news_sentiment()
     
-    def _detect_encoding(self, file_path):
+    def _detect_encoding(self, file_path, sample_size=-1):
         with open(file_path, 'rb') as f:
-            result = chardet.detect(f.read())
+            result = chardet.detect(f.read(sample_size))
         return result['encoding']
     
     def _load_stock_data(self):
-        dfs = []
-        for file in self.stock_files:
-            # Detect encoding first
-            encoding = self._detect_encoding(file)
-            df = pd.read_csv(file, encoding=encoding)
-            # Convert to datetime and extract just the date part
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce').dt.date
-            df = df[['Date', 'Close']].dropna()
-            ticker = file.split("/")[-1].split("_")[0].upper()
-            df['ticker'] = ticker
-            dfs.append(df)
-        combined = pd.concat(dfs, ignore_index=True)
-        return combined
+        # The memory-mapped panel only re-reads the CSVs when one of them changes
+        self.price_panel = load_price_panel(self.stock_files)
+        df = self.price_panel.to_frame(['Close'])
+        # Keep just the date part
+        df['Date'] = df['Date'].dt.date
+        df['ticker'] = df['ticker'].str.upper()
+        return df[['Date', 'Close', 'ticker']]
 
     def _analyze_news_sentiment(self):
-        # Detect encoding first
-        encoding = self._detect_encoding(self.news_file)
-        df = pd.read_csv(self.news_file, encoding=encoding)
+        if self.state_path and os.path.exists(self.state_path):
+            state = DailySentimentState.load(self.state_path)
+            if state.meta.get('engine') == self.engine and _same_source(state.meta.get('source'), self.news_file):
+                self.news_state = state
+                return self._daily_from_state()
+            print(f"Warning: sentiment state in {self.state_path} was built from another news file or engine; "
+                  f"rebuilding it.")
+            return self._stream_news_sentiment()
+        if self.chunksize or self.state_path:
+            return self._stream_news_sentiment()
+
+        # Encoding detection reads the whole file, so only do it when the cache must be rebuilt
+        encoding = None if is_cache_fresh(self.news_file) else self._detect_encoding(self.news_file)
+        df = load_news(self.news_file, encoding=encoding)
         df = df[['date', 'headline']].dropna()
-        # Convert to datetime, handle timezone, then extract just the date part
-        df['Date'] = pd.to_datetime(df['date'], errors='coerce')
-        # Remove timezone if present
-        if pd.api.types.is_datetime64tz_dtype(df['Date']):
-            df['Date'] = df['Date'].dt.tz_convert(None)
-        # Extract just the date component
-        df['Date'] = df['Date'].dt.date
+        # Dates are already timezone-naive UTC; extract just the date component
+        df['Date'] = df['date'].dt.date
         df.dropna(subset=['Date'], inplace=True)
 
         # Handle potential encoding issues in text processing
-        df['polarity'] = df['headline'].apply(
-            lambda x: TextBlob(str(x).encode('ascii', errors='ignore').decode('ascii')).sentiment.polarity
-        )
+        ascii_headlines = df['headline'].astype(str).str.encode('ascii', errors='ignore').str.decode('ascii')
+        df['polarity'] = headline_polarity(ascii_headlines, n_jobs=self.n_jobs, engine=self.engine)
         daily_sentiment = df.groupby('Date')['polarity'].mean().reset_index()
         daily_sentiment.rename(columns={'polarity': 'sentiment_score'}, inplace=True)
         return daily_sentiment
 
+    def _stream_news_sentiment(self):
+        # Detect the encoding from the first MB only, so memory stays bounded
+        encoding = self._detect_encoding(self.news_file, sample_size=1 << 20)
+        self.news_state = stream_daily_sentiment(self.news_file, chunksize=self.chunksize or DEFAULT_CHUNKSIZE,
+                                                 encoding=encoding, **self._ingest_options())
+        self.news_state.meta = {'engine': self.engine, 'source': _news_source(self.news_file)}
+        if self.state_path:
+            self.news_state.save(self.state_path)
+        return self._daily_from_state()
+
+    def _ingest_options(self):
+        return dict(engine=self.engine, n_jobs=self.n_jobs, ascii_only=True, dropna_headlines=True)
+
+    def _daily_from_state(self, dates=None):
+        daily_sentiment = self.news_state.daily(by_ticker=False, dates=dates)[['date', 'mean']]
+        daily_sentiment.columns = ['Date', 'sentiment_score']
+        return daily_sentiment
+
+    def add_headlines(self, news_df):
+        """
+        Incremental mode: folds a batch of new headlines ('headline', 'date',
+        'stock') into the daily sentiment state and refreshes only the days it
+        touches, in sentiment_df, the merged table and the correlations.
+        Rows already passed in by an earlier call are skipped.
+        Returns (correlations, merged_df) like merge_and_correlate.
+        """
+        if self.news_state is None:
+            raise ValueError("Incremental updates need the analyzer to be built with chunksize or state_path.")
+        # Delta batches are deduplicated, so passing the same rows twice does not count them twice
+        affected = ingest_news(self.news_state, news_df, dedupe=True, **self._ingest_options())
+        if self.state_path:
+            self.news_state.save(self.state_path)
+
+        fresh = self._daily_from_state(dates=affected)
+        affected_days = set(fresh['Date'])
+        unchanged = self.sentiment_df[~self.sentiment_df['Date'].isin(affected_days)]
+        self.sentiment_df = pd.concat([unchanged, fresh]).sort_values('Date').reset_index(drop=True)
+
+        if self._merged_df is None:
+            return self.merge_and_correlate()
+
+        # Swap the affected days' rows in the merged table and their Pearson sums
+        stale = self._merged_df['Date'].isin(affected_days)
+        fresh_merged = pd.merge(self._returns_df[self._returns_df['Date'].isin(affected_days)], fresh,
+                                on='Date', how='inner')
+        without_stale = _combine_sums(self._corr_sums, _pearson_sums(self._merged_df[stale]), sign=-1)
+        self._corr_sums = _combine_sums(without_stale, _pearson_sums(fresh_merged))
+        self._merged_df = (pd.concat([self._merged_df[~stale], fresh_merged])
+                           .sort_values(['ticker', 'Date']).reset_index(drop=True))
+        return _pearson_from_sums(self._corr_sums), self._merged_df
+
     def calculate_daily_returns(self):
-        df = self.stock_df.copy()
-        df = df.sort_values(['ticker', 'Date'])
-        df['daily_return'] = df.groupby('ticker')['Close'].pct_change()
-        return df.dropna(subset=['daily_return'])
+        df = self.price_panel.to_frame(['Close'], returns='Close', return_name='daily_return')
+        df['Date'] = df['Date'].dt.date
+        df['ticker'] = df['ticker'].str.upper()
+        return df[['Date', 'Close', 'ticker', 'daily_return']]
 
     def merge_and_correlate(self):
         returns_df = self.calculate_daily_returns()
@@ -75,30 +203,70 @@ class StockSentimentAnalyzer:
         correlations = merged_df.groupby('ticker').apply(
             lambda group: group['daily_return'].corr(group['sentiment_score'])
         ).to_dict()
+
+        # Kept so add_headlines can refresh just the affected days
+        self._returns_df = returns_df
+        self._merged_df = merged_df
+        self._corr_sums = _pearson_sums(merged_df)
         return correlations, merged_df
 
-    def plot_results(self):
+    def correlation_significance(self, n_resamples=2000, block_size=5, ci=0.95):
+        """
+        Per-ticker correlations with permutation p-values and block-bootstrap
+        confidence intervals, which do not assume normal returns.
+        """
+        if self._merged_df is None:
+            self.merge_and_correlate()
+        return correlation_significance(self._merged_df, 'daily_return', 'sentiment_score', by='ticker',
+                                        date_col='Date', n_permutations=n_resamples, n_bootstrap=n_resamples,
+                                        block_size=block_size, ci=ci, n_jobs=self.n_jobs)
+
+    def sentiment_return_panel(self):
+        """Market-wide daily sentiment and each ticker's Close returns on one (ticker, day) grid."""
+        panel = SentimentReturnPanel.from_frames(self.sentiment_df, self.price_panel, field='Close',
+                                                 date_col='Date', value_col='sentiment_score')
+        panel.tickers = [t.upper() for t in panel.tickers]
+        return panel
+
+    def lagged_correlations(self, lags=range(-5, 6)):
+        """Sentiment on day t vs return on day t + lag, for every ticker and lag."""
+        return self.sentiment_return_panel().lagged(lags)
+
+    def rolling_correlations(self, window=60, lag=0, min_periods=None):
+        """Rolling sentiment/return correlation per ticker as a (date x ticker) DataFrame."""
+        return self.sentiment_return_panel().rolling(window, lag=lag, min_periods=min_periods)
+
+    def plot_results(self, path=None, out_dir=None, n_jobs=1, max_points=DEFAULT_MAX_POINTS):
+        """
+        Return and sentiment lines per ticker, each downsampled (LTTB) to
+        max_points. One combined figure is shown, or saved to path; with
+        out_dir, one image per ticker is written instead, rendered on n_jobs
+        headless processes, and ({ticker: path}, {ticker: error}) is returned.
+        """
         correlations, merged_df = self.merge_and_correlate()
         print("Correlation coefficients between stock returns and sentiment scores:\n")
         for ticker, corr in correlations.items():
             print(f"{ticker}: {corr:.4f}")
 
         # Convert back to datetime for plotting
-        merged_df['Date'] = pd.to_datetime(merged_df['Date'])
-        
+        merged_df = merged_df.assign(Date=pd.to_datetime(merged_df['Date']))
+        columns = {'daily_return': 'Daily Return', 'sentiment_score': 'Sentiment Score'}
+        if out_dir is not None:
+            return render_series_reports(merged_df, columns, out_dir, n_jobs=n_jobs, max_points=max_points)
+
         tickers = merged_df['ticker'].unique()
         n = len(tickers)
-        fig, axs = plt.subplots(n, 2, figsize=(14, 4 * n), sharex=True)
+        fig, axs = plt.subplots(n, 2, figsize=(14, 4 * n), sharex=True, squeeze=False)
 
         for i, ticker in enumerate(tickers):
-            df = merged_df[merged_df['ticker'] == ticker]
-            sns.lineplot(data=df, x='Date', y='daily_return', ax=axs[i, 0])
+            df = merged_df[merged_df['ticker'] == ticker].sort_values('Date').set_index('Date')
+            plot_line(axs[i, 0], df, 'daily_return', max_points)
             axs[i, 0].set_title(f'{ticker} Daily Return')
             axs[i, 0].set_ylabel('Return')
 
-            sns.lineplot(data=df, x='Date', y='sentiment_score', ax=axs[i, 1], color='orange')
+            plot_line(axs[i, 1], df, 'sentiment_score', max_points, color='orange')
             axs[i, 1].set_title(f'{ticker} Sentiment Score')
             axs[i, 1].set_ylabel('Sentiment Score')
 
         plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        return finish(fig, path)
\ No newline at end of file
@@ -0,0 +1,166 @@
+# src/synthetic_data.py
+
+import os
+import numpy as np
+import pandas as pd
+from src.correlation_analysis import STOCK_MAP
+from src.date_parsing import EXCHANGE_TZ
+
+# Bumped whenever a change to the generator changes its output for the same arguments
+GENERATOR_VERSION = 1
+DEFAULT_TICKERS = list(STOCK_MAP.values())
+DEFAULT_START = "2015-01-02"
+# Share of headlines written as "2020-06-05 10:30:54-04:00", "2020-06-05 00:00:00" and "06/05/2020 10:30"
+DATE_FORMAT_MIX = (0.10, 0.85, 0.05)
+
+NAMED_PUBLISHERS = ["Paul Quintaro", "Lisa Levin", "Benzinga Newsdesk", "Charles Gross", "Monica Gerson",
+                    "Eddie Staley", "Hal Lindon", "ETF Professor", "Juan Carlos Ramos", "Benzinga Insights"]
+EMAIL_DOMAINS = ["benzinga.com", "gmail.com", "zacks.com", "investdiva.com"]
+
+PREFIXES = ["", "", "", "Shares Of ", "Why ", "Analysts Say ", "Report: "]
+ACTIONS = ["Is Trading Higher", "Is Trading Lower", "Shares Rise After Strong Earnings Beat",
+           "Shares Fall On Weak Guidance", "Hits New 52-Week High", "Hits New 52-Week Low",
+           "Upgraded To Buy", "Downgraded To Sell", "Price Target Raised", "Price Target Cut",
+           "Reports Record Quarterly Sales", "Misses Q3 Estimates", "Announces Great New Product",
+           "Faces Bad Regulatory News", "Initiated With Neutral Rating", "Declares Quarterly Dividend"]
+SUFFIXES = ["", "", "", " Amid Market Rally", " In Premarket Session", " After Analyst Day",
+            " Despite Slightly Disappointing Outlook", " On Very Good Volume"]
+GENERIC = ["Benzinga's Top Upgrades, Downgrades For The Day", "Stocks That Hit 52-Week Highs Today",
+           "Mid-Day Market Update: Nasdaq Up, Dow Lower", "Earnings Scheduled For The Week",
+           "US Stock Futures Slightly Higher Ahead Of Jobs Data"]
+
+
+def _rng(seed, *key):
+    """Independent, reproducible stream per component (e.g. per ticker), whatever else is generated."""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=tuple(key)))
+
+
+def publisher_names(n_publishers, seed=0):
+    """The named publishers first, then generated names and e-mail addresses (as in the real file)."""
+    rng = _rng(seed, 1)
+    names = NAMED_PUBLISHERS[:n_publishers]
+    extra = np.arange(len(names), n_publishers)
+    emails = rng.random(len(extra)) < 0.2
+    domains = rng.choice(EMAIL_DOMAINS, size=len(extra))
+    names += [f"writer{i}@{d}" if e else f"Contributor {i:04d}" for i, e, d in zip(extra, emails, domains)]
+    return names
+
+
+def other_symbols(n, seed=0):
+    """Random 1-4 letter symbols outside the price universe, like the thousands of tickers in the real file."""
+    rng = _rng(seed, 2)
+    letters = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    lengths = rng.integers(1, 5, n)
+    symbols = {"".join(rng.choice(letters, size=k)) for k in lengths}
+    return sorted(symbols - set(STOCK_MAP) - set(STOCK_MAP.values()))
+
+
+def format_news_dates(local_times, kinds):
+    """Exchange-local timestamps as the mixed string formats of raw_analyst_ratings.csv."""
+    aware = local_times.tz_localize(EXCHANGE_TZ, nonexistent="shift_forward",
+                                   ambiguous=np.ones(len(local_times), dtype=bool))
+    offsets = pd.Series(aware.strftime("%z"), dtype=object)
+    iso = pd.Series(local_times.strftime("%Y-%m-%d %H:%M:%S")) + offsets.str[:3] + ":" + offsets.str[3:]
+    midnight = pd.Series(local_times.strftime("%Y-%m-%d 00:00:00"))
+    us = pd.Series(local_times.strftime("%m/%d/%Y %H:%M"))
+    return np.where(kinds == 0, iso, np.where(kinds == 1, midnight, us))
+
+
+def synthetic_news(n_rows, tickers=None, start=DEFAULT_START, n_days=1_250, n_publishers=1_000,
+                   publisher_skew=1.2, duplicate_rate=0.1, mapped_share=0.5, format_mix=DATE_FORMAT_MIX, seed=0):
+    """
+    A raw_analyst_ratings-style frame ('headline', 'url', 'publisher',
+    'date', 'stock'). Publishers follow a Zipf-like distribution (weight
+    1 / rank ** publisher_skew); mapped_share of the headlines name a ticker
+    of the price universe (by its news symbol, e.g. 'A' for AAPL), the rest
+    other symbols; duplicate_rate of the rows are syndicated copies of
+    another headline, re-published up to half an hour later; dates mix
+    the file's three string formats in format_mix proportions. The same
+    arguments always give the same frame.
+    """
+    rng = _rng(seed, 0)
+    tickers = DEFAULT_TICKERS if tickers is None else list(tickers)
+    news_symbols = {v: k for k, v in STOCK_MAP.items()}
+    symbols = np.array([news_symbols.get(t, t) for t in tickers] + other_symbols(max(len(tickers) * 20, 50), seed),
+                       dtype=object)
+    n_original = n_rows - int(n_rows * duplicate_rate)
+
+    mapped = rng.random(n_original) < mapped_share
+    stock = np.where(mapped, rng.integers(0, len(tickers), n_original),
+                     rng.integers(len(tickers), len(symbols), n_original))
+    stock = symbols[stock]
+    generic = rng.random(n_original) < 0.05
+    headline = (pd.Series(rng.choice(PREFIXES, n_original)) + pd.Series(stock) + " "
+                + pd.Series(rng.choice(ACTIONS, n_original)) + pd.Series(rng.choice(SUFFIXES, n_original)))
+    headline = headline.where(~generic, pd.Series(rng.choice(GENERIC, n_original)))
+
+    # Calendar days (weekends included) from the day after the first trading day to the eve of the last one,
+    # so every headline maps to a session of the price history, even date-only stamps read as midnight UTC;
+    # mostly market hours, with pre-market and evening tails
+    span = (pd.bdate_range(start, periods=n_days)[-1] - pd.Timestamp(start)).days
+    days = pd.Timestamp(start) + pd.to_timedelta(rng.integers(1, max(span, 2), n_original), unit="D")
+    minutes = np.clip(rng.normal(12.5 * 60, 3.5 * 60, n_original), 0, 24 * 60 - 1).astype(np.int64)
+    times = days + pd.to_timedelta(minutes, unit="min")
+
+    # Syndicated copies: same headline and stock, up to half an hour later; publishers are drawn for every row
+    source = rng.integers(0, n_original, n_rows - n_original)
+    headline = pd.concat([headline, headline.iloc[source]], ignore_index=True)
+    stock = np.concatenate([stock, stock[source]])
+    times = times.append(times[source] + pd.to_timedelta(rng.integers(0, 30, len(source)), unit="min"))
+
+    publishers = np.array(publisher_names(n_publishers, seed), dtype=object)
+    weights = 1.0 / np.arange(1, n_publishers + 1) ** publisher_skew
+    kinds = rng.choice(3, size=n_rows, p=np.asarray(format_mix) / np.sum(format_mix))
+    order = np.argsort(times.to_numpy(), kind="stable")[::-1]  # newest first, like the real file
+    df = pd.DataFrame({
+        "headline": headline.to_numpy(),
+        "url": [f"https://www.benzinga.com/news/{i}" for i in range(n_rows)],
+        "publisher": rng.choice(publishers, size=n_rows, p=weights / weights.sum()),
+        "date": format_news_dates(times, kinds),
+        "stock": stock,
+    })
+    return df.iloc[order].reset_index(drop=True)
+
+
+def synthetic_prices(ticker, start=DEFAULT_START, n_days=1_250, seed=0):
+    """
+    A yfinance-style daily history (Date, Open, High, Low, Close, Adj Close,
+    Volume, Dividends, Stock Splits) over n_days business days: geometric
+    Brownian motion with a per-ticker drift and volatility and a small
+    quarterly dividend.
+    """
+    rng = _rng(seed, 3, *ticker.encode())
+    dates = pd.bdate_range(start, periods=n_days)
+    drift, vol = rng.normal(0.0004, 0.0003), rng.uniform(0.01, 0.03)
+    close = rng.uniform(20, 300) * np.exp(np.cumsum(rng.normal(drift, vol, n_days)))
+    open_ = close * np.exp(rng.normal(0, vol / 2, n_days))
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, vol / 2, n_days)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, vol / 2, n_days)))
+    dividends = np.where(np.arange(n_days) % 63 == 62, np.round(close * 0.002, 2), 0.0)
+    return pd.DataFrame({
+        "Date": dates.strftime("%Y-%m-%d"),
+        "Open": open_, "High": high, "Low": low, "Close": close, "Adj Close": close,
+        "Volume": rng.lognormal(15, 0.5, n_days).astype(np.int64),
+        "Dividends": dividends, "Stock Splits": 0.0,
+    })
+
+
+def write_dataset(out_dir, n_rows=100_000, tickers=None, n_days=1_250, start=DEFAULT_START, seed=0, **news_options):
+    """
+    Writes out_dir/raw_analyst_ratings.csv and
+    out_dir/yfinance/<TICKER>_historical_data.csv in the layout of the real
+    data. Returns (news_file, stock_files).
+    """
+    tickers = DEFAULT_TICKERS if tickers is None else list(tickers)
+    price_dir = os.path.join(out_dir, "yfinance")
+    os.makedirs(price_dir, exist_ok=True)
+    stock_files = []
+    for ticker in tickers:
+        path = os.path.join(price_dir, f"{ticker}_historical_data.csv")
+        synthetic_prices(ticker, start=start, n_days=n_days, seed=seed).to_csv(path, index=False)
+        stock_files.append(path)
+
+    news_file = os.path.join(out_dir, "raw_analyst_ratings.csv")
+    # The real file carries an unnamed index column
+    synthetic_news(n_rows, tickers, start=start, n_days=n_days, seed=seed, **news_options).to_csv(news_file)
+    return news_file, stock_files
@@ -1,37 +1,143 @@
 # src/technical_indicators.py
 
 import pandas as pd
-import talib
 import os
+from functools import partial
+from src.indicators import sma, rsi, macd, add_indicators, DEFAULT_BACKEND
+from src.indicator_state import IndicatorSet
+from src.indicator_cache import get_default_cache
+from src.price_panel import load_price_panel
+from src.ticker_pool import map_tickers
 
 class TechnicalIndicatorAnalyzer:
-    def __init__(self, file_path):
+    def __init__(self, file_path, cache=None, use_cache=True, sma_periods=(20, 50), rsi_period=14,
+                 macd_periods=(12, 26, 9)):
         self.file_path = file_path
         self.symbol = os.path.basename(file_path).split("_")[0]
-        self.df = pd.read_csv(file_path)
+        # Parsed prices and each computed indicator are cached per file version and parameters
+        self.cache = (cache if cache is not None else get_default_cache()) if use_cache else None
+        self.sma_periods = tuple(sma_periods)
+        self.rsi_period = rsi_period
+        self.macd_periods = tuple(macd_periods)
+        # Incremental indicator state, seeded on the first append_bar call
+        self.state = None
+        # Bars appended in memory make df differ from the file the cache is keyed on
+        self.appended_bars = 0
+        # Appended rows wait here and are concatenated onto df in one go the next time df is read
+        self._pending_rows = []
+        self._pending_dates = []
+        if self.cache is None:
+            self.df = self._read_prices()
+        else:
+            self.df = self.cache.get_or_compute(file_path, "prices", {}, self._read_prices)
+
+    @property
+    def df(self):
+        if self._pending_rows:
+            new_rows = pd.DataFrame(self._pending_rows, index=pd.DatetimeIndex(self._pending_dates, name='Date'))
+            self._df = pd.concat([self._df, new_rows])
+            self._pending_rows, self._pending_dates = [], []
+        return self._df
+
+    @df.setter
+    def df(self, value):
+        self._df = value
+        self._pending_rows, self._pending_dates = [], []
+
+    def _read_prices(self):
+        self.df = pd.read_csv(self.file_path)
         self.prepare_data()
+        return self.df
 
     def prepare_data(self):
         self.df['Date'] = pd.to_datetime(self.df['Date'])
         self.df = self.df.sort_values('Date')
         self.df.set_index('Date', inplace=True)
 
-    def add_indicators(self):
-        close = self.df['Close'].values
-
-        # Simple Moving Averages
-        self.df['SMA_20'] = talib.SMA(close, timeperiod=20)
-        self.df['SMA_50'] = talib.SMA(close, timeperiod=50)
+    def _indicator(self, name, params, compute):
+        """Indicator columns as a frame on self.df's index, from the cache when possible."""
+        def run():
+            close = self.df['Close'].values
+            return pd.DataFrame(compute(close), index=self.df.index)
+        if self.cache is None or self.appended_bars:
+            return run()
+        return self.cache.get_or_compute(self.file_path, name, dict(params, backend=DEFAULT_BACKEND), run)
 
-        # Relative Strength Index
-        self.df['RSI'] = talib.RSI(close, timeperiod=14)
-
-        # MACD
-        macd, macdsignal, macdhist = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
-        self.df['MACD'] = macd
-        self.df['MACD_Signal'] = macdsignal
-        self.df['MACD_Hist'] = macdhist
+    def add_indicators(self):
+        # SMA 20/50, RSI 14 and MACD 12/26/9 by default; talib when installed, otherwise the NumPy backend
+        frames = [self._indicator("SMA", {"timeperiod": p}, lambda c, p=p: {f"SMA_{p}": sma(c, p)})
+                  for p in self.sma_periods]
+        frames.append(self._indicator("RSI", {"timeperiod": self.rsi_period},
+                                      lambda c: {"RSI": rsi(c, self.rsi_period)}))
+        fast, slow, signal = self.macd_periods
+        frames.append(self._indicator("MACD", {"fastperiod": fast, "slowperiod": slow, "signalperiod": signal},
+                                      lambda c: dict(zip(("MACD", "MACD_Signal", "MACD_Hist"),
+                                                         macd(c, fast, slow, signal)))))
+        for frame in frames:
+            for name in frame.columns:
+                self.df[name] = frame[name].to_numpy()
 
     def get_indicated_data(self):
         self.add_indicators()
         return self.df
+
+    def append_bar(self, bar):
+        """
+        Appends one new daily bar (a mapping with 'Date', 'Close' and any other
+        price columns) and fills its indicator columns in constant time from
+        the incremental state, instead of recomputing the whole history. The
+        row is buffered and joined onto df the next time df is read, so a
+        run of appends costs one concat. Returns the new row.
+        """
+        if self.state is None:
+            self.state, _ = IndicatorSet.from_history(self.df['Close'].values, dates=self.df.index,
+                                                      **self._state_options())
+        date = pd.to_datetime(bar['Date'])
+        row = {k: v for k, v in dict(bar).items() if k != 'Date'}
+        row.update(self.state.update(row['Close'], date=date))
+        self._pending_rows.append(row)
+        self._pending_dates.append(date)
+        self.appended_bars += 1
+        return pd.Series(row, name=date)
+
+    def _state_options(self):
+        return dict(sma_periods=self.sma_periods, rsi_period=self.rsi_period, macd_periods=self.macd_periods)
+
+    def save_state(self, path):
+        """Persists the incremental indicator state so appends can resume after a restart."""
+        if self.state is None:
+            self.state, _ = IndicatorSet.from_history(self.df['Close'].values, dates=self.df.index,
+                                                      **self._state_options())
+        self.state.save(path)
+
+    def load_state(self, path):
+        """
+        Restores a state saved by save_state. It must have been saved at the
+        last bar of this analyzer's data; otherwise it is ignored and rebuilt.
+        """
+        state = IndicatorSet.load(path)
+        if len(self.df) and state.last_date != str(self.df.index[-1]):
+            print(f"Warning: indicator state in {path} ends at {state.last_date}, "
+                  f"data ends at {self.df.index[-1]}; rebuilding from history.")
+            return None
+        self.state = state
+        return state
+
+
+def _analyze_ticker(ticker, shared, **options):
+    """Indicator frame of one ticker of the shared PricePanel, like get_indicated_data; runs in worker processes."""
+    df = shared.panel.to_frame(tickers=[ticker], dropna=False).drop(columns="ticker")
+    df = df.dropna(subset=["Close"]).set_index("Date")
+    return add_indicators(df, "Close", **options)
+
+
+def analyze_files(stock_files, n_jobs=1, **options):
+    """
+    get_indicated_data for every stock file. The files are packed into one
+    memory-mapped PricePanel, shared with a process pool, and each worker
+    computes one ticker's indicators from it instead of re-reading its CSV.
+    options are compute_indicators' (sma_periods, rsi_period, macd_periods).
+    Returns ({symbol: DataFrame}, {symbol: error}), in stock_files order.
+    """
+    panel = load_price_panel(stock_files)
+    return map_tickers(partial(_analyze_ticker, **options), panel.tickers, panel=panel, n_jobs=n_jobs)
@@ -1,51 +1,92 @@
 # src/text_analysis.py
 
 import pandas as pd
-import re
 import nltk
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, ENGLISH_STOP_WORDS
 from sklearn.decomposition import LatentDirichletAllocation
 from sklearn.feature_extraction.text import CountVectorizer
 
 from nltk.corpus import stopwords
+from src.keyword_ranking import column_scores, keywords_by_group, top_k
+from src.text_cleaning import KEYWORD_TOKEN_PATTERN, clean_headlines, keyword_stop_words
+from src.topic_model import DEFAULT_CHUNKSIZE, OnlineTopicModel, build_vocabulary, series_chunks
 
 class TextAnalyzer:
-    def __init__(self, texts):
+    def __init__(self, texts, stop_words=None):
         self.raw_texts = texts
+        self.stop_words = keyword_stop_words(stop_words if stop_words is not None else stopwords.words('english'))
         self.cleaned_texts = self._clean_texts(texts)
         self.vectorizer = None
         self.tfidf_matrix = None
+        self.tfidf_vectorizer = None
 
     def _clean_texts(self, texts):
-        stop_words = set(stopwords.words('english'))
-        cleaned = []
-        for text in texts:
-            text = re.sub(r'[^a-zA-Z\s]', '', str(text))  # Remove punctuation/numbers
-            tokens = text.lower().split()
-            tokens = [w for w in tokens if w not in stop_words and len(w) > 2]
-            cleaned.append(" ".join(tokens))
-        return cleaned
+        # Stopwords and words under three letters are dropped at tokenization (see _token_options)
+        return clean_headlines(texts).tolist()
+
+    def _token_options(self, *extra_stop_words):
+        return {"token_pattern": KEYWORD_TOKEN_PATTERN,
+                "stop_words": keyword_stop_words(self.stop_words, *extra_stop_words)}
+
+    def _fit_tfidf(self):
+        """Fits the keyword TF-IDF once; extract_keywords and the per-group rankings share it."""
+        if self.tfidf_matrix is None:
+            self.tfidf_vectorizer = TfidfVectorizer(max_df=0.8, min_df=5, max_features=1000, **self._token_options())
+            self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(self.cleaned_texts)
+        self.vectorizer = self.tfidf_vectorizer
+        return self.tfidf_matrix
 
     def extract_keywords(self, top_n=20):
-        self.vectorizer = TfidfVectorizer(max_df=0.8, min_df=5, max_features=1000)
-        self.tfidf_matrix = self.vectorizer.fit_transform(self.cleaned_texts)
-        feature_array = self.vectorizer.get_feature_names_out()
-        tfidf_sorting = self.tfidf_matrix.toarray().sum(axis=0).argsort()[::-1]
+        # Column sums straight off the sparse matrix; densifying it does not fit in memory on the full corpus
+        scores = column_scores(self._fit_tfidf())
+        feature_array = self.tfidf_vectorizer.get_feature_names_out()
+        return list(feature_array[top_k(scores, top_n)])
+
+    def keywords_by(self, labels, top_n=20, group_name="group"):
+        """
+        Top keywords per label (e.g. the ticker of every text) from the same
+        TF-IDF fit as extract_keywords: one sparse group-indicator product
+        sums the rows of each group. Returns [group_name, 'rank', 'keyword', 'score'].
+        """
+        labels = pd.Series(labels).reset_index(drop=True)
+        if len(labels) != len(self.cleaned_texts):
+            raise ValueError("Expected one label per text.")
+        return keywords_by_group(labels, self._fit_tfidf(), self.tfidf_vectorizer.get_feature_names_out(),
+                                 top_n, group_name)
+
+    def keywords_by_period(self, dates, freq="M", top_n=20):
+        """Top keywords per calendar period (pandas period alias, e.g. 'W', 'M', 'Q') of the text dates."""
+        dates = pd.to_datetime(pd.Series(dates).reset_index(drop=True), errors="coerce")
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        return self.keywords_by(dates.dt.to_period(freq), top_n, group_name="period")
 
-        top_keywords = [feature_array[i] for i in tfidf_sorting[:top_n]]
-        return top_keywords
+    def perform_topic_modeling(self, num_topics=5, num_words=10, online=False, chunksize=DEFAULT_CHUNKSIZE,
+                               n_jobs=None):
+        """
+        With online=True, minibatch LDA is fitted chunk by chunk over a
+        streamed vocabulary; the model is kept as self.topic_model so new
+        texts can be assigned topics without refitting.
+        """
+        options = self._token_options(ENGLISH_STOP_WORDS)
+        if online:
+            texts = pd.Series(self.cleaned_texts, dtype=object)
+            vocabulary = build_vocabulary(series_chunks(texts, chunksize), max_features=5000, **options)
+            self.topic_model = OnlineTopicModel(n_topics=num_topics, vocabulary=vocabulary, n_jobs=n_jobs, **options)
+            self.topic_model.fit_stream(series_chunks(texts, chunksize))
+            return [f"Topic #{idx}: " + ", ".join(words) for idx, words in self.topic_model.topics(num_words)]
 
-    def perform_topic_modeling(self, num_topics=5, num_words=10):
-        self.vectorizer = CountVectorizer(stop_words='english', max_df=0.9, min_df=10, max_features=5000)
+        self.vectorizer = CountVectorizer(max_df=0.9, min_df=10, max_features=5000, **options)
         X = self.vectorizer.fit_transform(self.cleaned_texts)
 
-        lda = LatentDirichletAllocation(n_components=num_topics, random_state=42, learning_method='batch')
+        lda = LatentDirichletAllocation(n_components=num_topics, random_state=42, learning_method='batch',
+                                        n_jobs=n_jobs)
         lda.fit(X)
 
+        feature_names = self.vectorizer.get_feature_names_out()
         topics = []
         for topic_idx, topic in enumerate(lda.components_):
             top_features = topic.argsort()[::-1][:num_words]
-            topic_keywords = [self.vectorizer.get_feature_names_out()[i] for i in top_features]
-            topics.append(f"Topic #{topic_idx + 1}: " + ", ".join(topic_keywords))
+            topics.append(f"Topic #{topic_idx + 1}: " + ", ".join(feature_names[top_features]))
 
         return topics
\ No newline at end of file
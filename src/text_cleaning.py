@@ -0,0 +1,25 @@
+# src/text_cleaning.py
+
+import re
+import pandas as pd
+
+# Everything but lowercase letters and whitespace, applied after lowercasing
+NON_LETTERS = re.compile(r"[^a-z\s]")
+# Keyword tokens: runs of three or more lowercase letters
+KEYWORD_TOKEN_PATTERN = r"(?u)\b[a-z]{3,}\b"
+
+
+def clean_headlines(texts):
+    """
+    Lowercases headlines and strips everything but letters and whitespace,
+    as one vectorized pass over the column instead of a per-row re.sub.
+    Stopwords and short words are left for the vectorizer to drop (see
+    KEYWORD_TOKEN_PATTERN and keyword_stop_words).
+    """
+    return pd.Series(texts, dtype=object).astype(str).str.lower().str.replace(NON_LETTERS, "", regex=True)
+
+
+def keyword_stop_words(*word_lists):
+    """Union of stopword lists, reduced to the plain lowercase words a keyword token can match."""
+    words = {str(w).lower() for words in word_lists for w in words}
+    return sorted(w for w in words if w.isalpha() and w.isascii())
@@ -0,0 +1,123 @@
+# src/ticker_pool.py
+
+import traceback
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from src.parallel_sentiment import resolve_n_jobs
+from src.price_panel import PricePanel
+
+PANEL_VALUES = "_panel_values"
+PANEL_DATES = "_panel_dates"
+
+
+class SharedData:
+    """
+    Read-only data every task sees: named NumPy arrays and, optionally, a
+    PricePanel. In worker processes the arrays are views onto shared memory
+    blocks created once by the parent, so nothing is pickled per task.
+    """
+
+    def __init__(self, arrays=None, panel=None):
+        self.arrays = dict(arrays or {})
+        self.panel = panel
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+
+def _publish(arrays, blocks):
+    """Copies arrays into new shared memory blocks (appended to blocks); returns the specs to attach them."""
+    specs = {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        if array.dtype == object:
+            raise TypeError(f"Array '{name}' has dtype object; share codes or numbers instead.")
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        blocks.append(block)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        specs[name] = (block.name, array.shape, array.dtype.str)
+    return specs
+
+
+# Worker-side state, set by the pool initializer
+_worker_blocks = []
+_worker_shared = None
+
+
+def _attach(specs, panel_meta):
+    global _worker_shared
+    arrays = {}
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        # Keep the handle alive for as long as the views are used
+        _worker_blocks.append(block)
+        view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        view.flags.writeable = False
+        arrays[name] = view
+    panel = None
+    if panel_meta is not None:
+        tickers, fields = panel_meta
+        panel = PricePanel(tickers, arrays.pop(PANEL_DATES), fields, arrays.pop(PANEL_VALUES))
+    _worker_shared = SharedData(arrays, panel)
+
+
+def _run_task(func, key, shared=None):
+    """Runs one task; failures come back as formatted tracebacks instead of breaking the pool."""
+    try:
+        return True, func(key, shared if shared is not None else _worker_shared)
+    except Exception:
+        return False, traceback.format_exc()
+
+
+def map_tickers(func, keys, arrays=None, panel=None, n_jobs=1, verbose=True):
+    """
+    Runs func(key, shared) for every key (typically a ticker) and returns
+    (results, failures): results maps each successful key to its output, in
+    the order of keys whatever order workers finish in; failures maps each
+    failed key to its traceback text. shared is a SharedData holding arrays
+    and panel.
+
+    With n_jobs != 1 the keys are spread over a process pool. arrays and the
+    panel are copied into shared memory once and attached by every worker,
+    so tasks only carry their key. func must be a module-level function.
+    """
+    keys = list(keys)
+    n_jobs = min(resolve_n_jobs(n_jobs), max(len(keys), 1))
+    if n_jobs == 1:
+        shared = SharedData(arrays, panel)
+        outcomes = [_run_task(func, key, shared) for key in keys]
+    else:
+        to_share = dict(arrays or {})
+        panel_meta = None
+        if panel is not None:
+            to_share[PANEL_VALUES] = np.asarray(panel.values)
+            to_share[PANEL_DATES] = panel.dates
+            panel_meta = (list(panel.tickers), list(panel.fields))
+        blocks = []
+        try:
+            specs = _publish(to_share, blocks)
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_attach,
+                                     initargs=(specs, panel_meta)) as executor:
+                futures = [executor.submit(_run_task, func, key) for key in keys]
+                outcomes = []
+                for future in futures:
+                    try:
+                        outcomes.append(future.result())
+                    except Exception:
+                        # A worker died (e.g. out of memory), which breaks the pool; report the keys it took down
+                        outcomes.append((False, traceback.format_exc()))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    results, failures = {}, {}
+    for key, (ok, value) in zip(keys, outcomes):
+        if ok:
+            results[key] = value
+        else:
+            failures[key] = value
+            if verbose:
+                print(f"Warning: [{key}] failed: {value.strip().splitlines()[-1]}")
+    return results, failures
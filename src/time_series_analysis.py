@@ -1,39 +1,49 @@
 import pandas as pd
 import matplotlib.pyplot as plt
+from src.date_parsing import NewsDateParser
+from src.news_dataset import read_news
+from src.charts import DEFAULT_MAX_POINTS, downsample, finish
 
 class TimeSeriesAnalyzer:
     def __init__(self, df):
         self.df = df.copy()
         if not pd.api.types.is_datetime64_any_dtype(self.df["date"]):
-            self.df["date"] = pd.to_datetime(self.df["date"], errors='coerce')
+            self.df["date"] = NewsDateParser().parse(self.df["date"])
         self.df = self.df.dropna(subset=["date"])
 
+    @classmethod
+    def from_dataset(cls, file_path, tickers=None, start=None, end=None, tz=None):
+        # Only the 'date' column is read, from the partitions the filters select
+        return cls(read_news(file_path, tickers=tickers, start=start, end=end, columns=["date"], tz=tz))
+
     def articles_per_day(self):
         daily_counts = self.df.groupby(self.df["date"].dt.date).size()
         return daily_counts
 
-    def plot_articles_per_day(self):
+    def plot_articles_per_day(self, path=None, max_points=DEFAULT_MAX_POINTS):
         daily_counts = self.articles_per_day()
-        plt.figure(figsize=(14, 5))
+        daily_counts.index = pd.to_datetime(daily_counts.index)
+        daily_counts = downsample(daily_counts.to_frame("count"), "count", max_points)["count"]
+        fig = plt.figure(figsize=(14, 5))
         daily_counts.plot()
         plt.title("Articles Published per Day")
         plt.xlabel("Date")
         plt.ylabel("Number of Articles")
         plt.grid(True)
         plt.tight_layout()
-        plt.show()
+        return finish(fig, path)
 
     def publishing_hours_distribution(self):
         self.df["hour"] = self.df["date"].dt.hour
         return self.df["hour"].value_counts().sort_index()
 
-    def plot_publishing_hours_distribution(self):
+    def plot_publishing_hours_distribution(self, path=None):
         hour_counts = self.publishing_hours_distribution()
-        plt.figure(figsize=(10, 4))
+        fig = plt.figure(figsize=(10, 4))
         hour_counts.plot(kind='bar')
         plt.title("Distribution of Publishing Hours")
         plt.xlabel("Hour of Day")
         plt.ylabel("Number of Articles")
         plt.xticks(rotation=0)
         plt.tight_layout()
-        plt.show()
+        return finish(fig, path)
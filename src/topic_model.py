@@ -0,0 +1,156 @@
+# src/topic_model.py
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from src.text_cleaning import clean_headlines
+
+DEFAULT_N_FEATURES = 2 ** 16
+DEFAULT_BATCH_SIZE = 4096
+DEFAULT_CHUNKSIZE = 100_000
+# scikit-learn's default: words of two or more characters
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+
+def build_vocabulary(chunks, min_df=10, max_df=0.9, max_features=None, stop_words="english",
+                     token_pattern=TOKEN_PATTERN):
+    """
+    One streaming pass over text chunks that keeps the terms found in at least
+    min_df documents and at most a max_df share of them (fractions, as in
+    CountVectorizer). Memory grows with the vocabulary, not the corpus.
+    Returns a sorted term list to pass as OnlineTopicModel(vocabulary=...).
+    """
+    counter = CountVectorizer(stop_words=stop_words, token_pattern=token_pattern, binary=True)
+    doc_freq = pd.Series(dtype=float)
+    n_docs = 0
+    for chunk in chunks:
+        cleaned = clean_headlines(chunk)
+        try:
+            X = counter.fit_transform(cleaned)
+        except ValueError:  # chunk with no usable terms
+            n_docs += len(cleaned)
+            continue
+        counts = pd.Series(np.asarray(X.sum(axis=0)).ravel(), index=counter.get_feature_names_out())
+        doc_freq = doc_freq.add(counts, fill_value=0)
+        n_docs += len(cleaned)
+
+    upper = max_df * n_docs if isinstance(max_df, float) else max_df
+    lower = min_df * n_docs if isinstance(min_df, float) else min_df
+    doc_freq = doc_freq[(doc_freq >= lower) & (doc_freq <= upper)]
+    if max_features is not None:
+        doc_freq = doc_freq.sort_values(ascending=False, kind="stable").head(max_features)
+    return sorted(doc_freq.index)
+
+
+class OnlineTopicModel:
+    """
+    Minibatch (online variational Bayes) LDA over headlines.
+
+    Chunks are fed to partial_fit one at a time, so memory depends on the
+    vocabulary and number of topics, never on the corpus length. The term
+    space is fixed up front: either a pre-built vocabulary (see
+    build_vocabulary) or, by default, a hashed space of n_features buckets.
+    For hashed features the first word seen in each bucket is remembered so
+    topics can still be shown as words.
+    """
+
+    def __init__(self, n_topics=5, vocabulary=None, n_features=DEFAULT_N_FEATURES, batch_size=DEFAULT_BATCH_SIZE,
+                 total_samples=1e6, n_jobs=None, random_state=42, stop_words="english", token_pattern=TOKEN_PATTERN):
+        self.n_topics = n_topics
+        if vocabulary is not None:
+            self.vectorizer = CountVectorizer(stop_words=stop_words, token_pattern=token_pattern,
+                                              vocabulary=list(vocabulary))
+            self.feature_names = np.asarray(list(vocabulary), dtype=object)
+        else:
+            self.vectorizer = HashingVectorizer(stop_words=stop_words, token_pattern=token_pattern,
+                                                n_features=n_features, alternate_sign=False, norm=None)
+            self.feature_names = np.full(n_features, None, dtype=object)
+        self.hashed = vocabulary is None
+        self.batch_size = batch_size
+        self.lda = LatentDirichletAllocation(n_components=n_topics, learning_method="online",
+                                             batch_size=batch_size, total_samples=total_samples,
+                                             n_jobs=n_jobs, random_state=random_state)
+        self.n_documents = 0
+
+    def _vectorize(self, texts):
+        return self.vectorizer.transform(clean_headlines(texts))
+
+    def _remember_words(self, cleaned):
+        """Fills hashed buckets that have no word yet from this chunk's tokens."""
+        analyzer = self.vectorizer.build_analyzer()
+        words = pd.unique(np.fromiter((w for doc in cleaned for w in analyzer(doc)), dtype=object))
+        if not len(words):
+            return
+        buckets = self.vectorizer.transform(words).tocsr()
+        has_bucket = np.diff(buckets.indptr) > 0
+        idx = buckets.indices
+        words = words[has_bucket]
+        empty = pd.isna(self.feature_names[idx])
+        # Only the first word per bucket is kept, in order of appearance
+        idx, first = np.unique(idx[empty], return_index=True)
+        self.feature_names[idx] = words[empty][first]
+
+    def partial_fit(self, texts):
+        """Updates the topics with one chunk of headlines."""
+        cleaned = clean_headlines(texts)
+        X = self.vectorizer.transform(cleaned)
+        if self.hashed:
+            self._remember_words(cleaned)
+        # Feed the chunk in minibatches so each update sees batch_size documents
+        for start in range(0, X.shape[0], self.batch_size):
+            self.lda.partial_fit(X[start:start + self.batch_size])
+        self.n_documents += X.shape[0]
+        return self
+
+    def fit_stream(self, chunks):
+        """Runs partial_fit over an iterable of headline chunks."""
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self
+
+    def transform(self, texts):
+        """(n, n_topics) topic distribution of new headlines, without refitting."""
+        return self.lda.transform(self._vectorize(texts))
+
+    def assign(self, texts):
+        """Most likely topic number (1-based, as in topics()) for each headline."""
+        return self.transform(texts).argmax(axis=1) + 1
+
+    def topics(self, n_words=10):
+        """[(topic number, [top words, strongest first]), ...]"""
+        components = self.lda.components_
+        if self.hashed:
+            # Buckets that never held a word cannot be shown
+            components = np.where(pd.isna(self.feature_names), -np.inf, components)
+        n_words = min(n_words, components.shape[1])
+        top = np.argpartition(-components, n_words - 1, axis=1)[:, :n_words]
+        order = np.take_along_axis(components, top, axis=1).argsort(axis=1)[:, ::-1]
+        top = np.take_along_axis(top, order, axis=1)
+        return [(k + 1, [w for w in self.feature_names[row] if w is not None]) for k, row in enumerate(top)]
+
+    def save(self, path):
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
+
+
+def series_chunks(series, chunksize=DEFAULT_CHUNKSIZE):
+    """Yields consecutive slices of an in-memory headline Series."""
+    for start in range(0, len(series), chunksize):
+        yield series.iloc[start:start + chunksize]
+
+
+def read_headline_chunks(news_file, chunksize=DEFAULT_CHUNKSIZE, encoding=None):
+    """Yields the 'headline' column of the news CSV chunk by chunk."""
+    for chunk in pd.read_csv(news_file, usecols=["headline"], chunksize=chunksize, encoding=encoding):
+        yield chunk["headline"].dropna()
+
+
+def fit_topic_model(news_file, n_topics=5, chunksize=DEFAULT_CHUNKSIZE, encoding=None, **options):
+    """Fits an OnlineTopicModel by streaming the news CSV in chunks."""
+    return OnlineTopicModel(n_topics=n_topics, **options).fit_stream(
+        read_headline_chunks(news_file, chunksize=chunksize, encoding=encoding))
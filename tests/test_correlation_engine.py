@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from src.correlation_engine import SentimentReturnPanel, pearson_by_group
+
+
+def random_panel(n_days=120, seed=0):
+    rng = np.random.default_rng(seed)
+    sentiment = rng.normal(0, 0.2, (3, n_days))
+    returns = 0.3 * sentiment + rng.normal(0, 0.02, (3, n_days))
+    # Days without news, and a ticker whose first month has no prices
+    sentiment[rng.random(sentiment.shape) < 0.2] = np.nan
+    returns[2, :30] = np.nan
+    return SentimentReturnPanel(["AAPL", "MSFT", "TSLA"], pd.bdate_range("2020-01-01", periods=n_days),
+                                sentiment, returns)
+
+
+def pandas_rolling(panel, window, lag, min_periods):
+    out = {}
+    for j, ticker in enumerate(panel.tickers):
+        x = pd.Series(panel.sentiment[j], index=panel.dates)
+        y = pd.Series(panel.returns[j], index=panel.dates).shift(-lag)
+        out[ticker] = x.rolling(window, min_periods=min_periods).corr(y)
+    return pd.DataFrame(out)
+
+
+@pytest.mark.parametrize("window, lag, min_periods", [(20, 0, None), (20, 2, None), (20, -1, 5), (60, 0, 30)])
+def test_rolling_matches_pandas(window, lag, min_periods):
+    panel = random_panel()
+    expected = pandas_rolling(panel, window, lag, min_periods)
+    actual = panel.rolling(window, lag=lag, min_periods=min_periods)
+    pd.testing.assert_frame_equal(actual, expected, check_names=False, atol=1e-9)
+
+
+def test_rolling_needs_a_full_window_by_default():
+    panel = random_panel()
+    panel.sentiment[:] = np.arange(panel.sentiment.shape[1], dtype=float)
+    rolling = panel.rolling(20)
+    assert rolling["AAPL"].iloc[:19].isna().all()
+    assert rolling["AAPL"].iloc[19:].notna().all()
+
+
+def test_pearson_by_group_matches_scipy():
+    rng = np.random.default_rng(1)
+    sizes = {"AAPL": 200, "MSFT": 30, "TSLA": 3, "AMZN": 1}
+    df = pd.DataFrame({"ticker": np.repeat(list(sizes), list(sizes.values()))})
+    df["sentiment"] = rng.normal(0, 1, len(df))
+    df["Return"] = 0.2 * df["sentiment"] + rng.normal(0, 1, len(df))
+    df.loc[df.sample(frac=0.1, random_state=0).index, "sentiment"] = np.nan
+
+    results = pearson_by_group(df, "sentiment", "Return", "ticker").set_index("ticker")
+    for ticker, group in df.dropna().groupby("ticker"):
+        row = results.loc[ticker]
+        assert row["n"] == len(group)
+        if len(group) < 2:
+            assert np.isnan(row["correlation"]) and np.isnan(row["p_value"])
+            continue
+        expected = stats.pearsonr(group["sentiment"], group["Return"])
+        assert row["correlation"] == pytest.approx(expected.statistic, rel=1e-10)
+        assert row["p_value"] == pytest.approx(expected.pvalue, rel=1e-8)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import src.correlation_significance as significance
+from src.correlation_significance import correlation_significance
+
+
+def pairs(n_days=80, seed=0):
+    """AAPL's sentiment drives its return; MSFT's two series are independent."""
+    rng = np.random.default_rng(seed)
+    sentiment = rng.normal(0, 1, (2, n_days))
+    returns = np.vstack([0.8 * sentiment[0] + rng.normal(0, 0.3, n_days), rng.normal(0, 1, n_days)])
+    dates = pd.bdate_range("2020-01-01", periods=n_days)
+    return pd.DataFrame({"ticker": np.repeat(["AAPL", "MSFT"], n_days), "Date": np.tile(dates, 2),
+                         "Return": returns.ravel(), "sentiment": sentiment.ravel()})
+
+
+def run(df, **options):
+    return correlation_significance(df, date_col="Date", n_permutations=999, n_bootstrap=500, **options)
+
+
+def test_results_do_not_depend_on_n_jobs():
+    df = pairs()
+    pd.testing.assert_frame_equal(run(df, n_jobs=1), run(df, n_jobs=2))
+
+
+def test_strong_correlation_has_a_small_permutation_p_value_and_a_ci_around_r():
+    results = run(pairs()).set_index("ticker")
+    strong = results.loc["AAPL"]
+    assert strong["perm_p_value"] == 1 / 1000
+    assert results.loc["MSFT", "perm_p_value"] > 0.05
+    for _, row in results.iterrows():
+        assert row["ci_low"] <= row["correlation"] <= row["ci_high"]
+
+
+def test_failed_groups_are_reported(monkeypatch, capsys):
+    def fail_on_msft(x, y, seed, **options):
+        if seed.spawn_key == (1,):
+            raise RuntimeError("resampling broke")
+        return original(x, y, seed, **options)
+
+    original = significance._group_significance
+    monkeypatch.setattr(significance, "_group_significance", fail_on_msft)
+    results = run(pairs()).set_index("ticker")
+    assert "Warning: [MSFT] significance failed: RuntimeError: resampling broke" in capsys.readouterr().out
+    assert list(results.attrs["failures"]) == ["MSFT"]
+    assert results.loc["MSFT", ["perm_p_value", "ci_low", "ci_high"]].isna().all()
+    assert not np.isnan(results.loc["AAPL", "perm_p_value"])
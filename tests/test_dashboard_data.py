@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from src.dashboard_data import daily_aggregates
+from src.date_alignment import TradingCalendar
+from src.event_study import sentiment_buckets
+from src.price_panel import PricePanel
+
+TICKERS = ["AAPL", "MSFT", "TSLA"]
+
+
+def random_inputs(n_days=40, n_events=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range("2020-01-01", periods=n_days)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(TICKERS), n_days)), axis=1))
+    closes[2, :10] = np.nan  # TSLA lists late
+    closes[1, 20] = np.nan   # MSFT misses a bar
+    panel = PricePanel(TICKERS, days.asi8, ["Close"], closes[:, :, None])
+    events = pd.DataFrame({
+        "stock": rng.choice(TICKERS + ["ZZZ"], n_events),
+        "date": days[0] - pd.Timedelta(days=2) + pd.to_timedelta(rng.integers(0, (n_days + 4) * 24 * 60, n_events),
+                                                                unit="min"),
+        "sentiment": rng.normal(0, 0.2, n_events),
+    })
+    events.loc[events.index[::7], "sentiment"] = np.nan
+    return panel, events
+
+
+def groupby_reference(panel, events):
+    days = pd.DatetimeIndex(panel.dates.view("datetime64[ns]"))
+    sessions = TradingCalendar(days).sessions(events["date"])
+    keep = (sessions >= 0) & events["stock"].isin(TICKERS).to_numpy()
+    placed = events[keep].assign(Date=days[sessions[keep]], bucket=sentiment_buckets(events["sentiment"][keep]))
+    grouped = placed.groupby(["stock", "Date"])
+    stats = pd.DataFrame({
+        "news_count": grouped.size(),
+        "positive": grouped["bucket"].agg(lambda b: (b == "positive").sum()),
+        "negative": grouped["bucket"].agg(lambda b: (b == "negative").sum()),
+        "mean_sentiment": grouped["sentiment"].mean(),
+    }).rename_axis(["ticker", "Date"]).reset_index()
+    frame = panel.to_frame(["Close"], returns="Close", dropna=False)
+    merged = frame.merge(stats, on=["ticker", "Date"], how="left")
+    merged[["news_count", "positive", "negative"]] = merged[["news_count", "positive", "negative"]].fillna(0)
+    return merged[merged["Close"].notna()].reset_index(drop=True)
+
+
+def test_bincount_totals_match_a_groupby():
+    panel, events = random_inputs()
+    actual = daily_aggregates(panel, events)
+    expected = groupby_reference(panel, events)
+
+    assert actual[["ticker", "Date"]].equals(expected[["ticker", "Date"]])
+    for column in ["news_count", "positive", "negative"]:
+        np.testing.assert_array_equal(actual[column].to_numpy(), expected[column].to_numpy(dtype=np.int64))
+    np.testing.assert_allclose(actual["mean_sentiment"], expected["mean_sentiment"], rtol=1e-12)
+    np.testing.assert_allclose(actual["Return"], expected["Return"], rtol=1e-12)
+    # Every placed headline for a priced day is counted once
+    assert actual["news_count"].sum() == expected["news_count"].sum() > 0
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from src.date_alignment import DateAligner, TradingCalendar
+
+# Thursday 2020-06-04 to Wednesday 2020-06-10
+DAYS = pd.bdate_range("2020-06-04", "2020-06-10")
+
+
+def stock_frame():
+    return pd.DataFrame({"Date": DAYS, "Close": np.arange(len(DAYS), dtype=float)})
+
+
+def test_sessions_roll_after_close_and_weekend_news_forward():
+    calendar = TradingCalendar(DAYS)
+    stamps = pd.Series(pd.to_datetime([
+        "2020-06-04 15:59",  # before the close: same day
+        "2020-06-04 16:00",  # at the close: next session
+        "2020-06-06 12:00",  # Saturday: Monday
+        "2020-06-10 16:30",  # after the last close: outside the calendar
+        "2020-06-03 12:00",  # before the first day: outside the calendar
+    ])).dt.tz_localize("America/New_York")
+    positions = calendar.sessions(stamps)
+    assert positions.tolist() == [0, 1, 2, -1, -1]
+
+
+def test_aggregate_counts_and_means_per_session():
+    news = pd.DataFrame({
+        "date": pd.to_datetime(["2020-06-04 14:00", "2020-06-04 20:00", "2020-06-05 13:00", "2020-06-05 15:00"]),
+        "sentiment": [0.5, -0.5, 0.25, np.nan],
+    })
+    out = TradingCalendar(DAYS).aggregate(news, value_cols=["sentiment"])
+    assert out["Date"].tolist() == [pd.Timestamp("2020-06-04"), pd.Timestamp("2020-06-05")]
+    assert out["news_count"].tolist() == [1, 3]
+    assert out["first_headline"].tolist() == [0, 1]
+    assert out["mean_sentiment"].tolist() == [0.5, -0.125]
+
+
+def test_align_with_no_headlines_returns_empty_frame():
+    news = pd.DataFrame({"date": pd.Series([], dtype="datetime64[ns]"), "sentiment": pd.Series([], dtype=float)})
+    aligned = DateAligner(news, stock_frame(), value_cols=["sentiment"]).align()
+    assert aligned.empty
+    assert list(aligned.columns) == ["Date", "Close", "news_count", "first_headline", "mean_sentiment"]
+
+
+def test_align_with_every_headline_outside_the_calendar():
+    news = pd.DataFrame({"date": ["2019-01-02 10:00:00"], "sentiment": [0.1]})
+    calendar = TradingCalendar(DAYS)
+    out = calendar.aggregate(news, value_cols=["sentiment"])
+    assert out.empty and calendar.unassigned == 1
+    assert list(out.columns) == ["Date", "news_count", "first_headline", "mean_sentiment"]
+
+
+def test_cutoffs_on_dst_edges_do_not_raise(capsys):
+    days = pd.to_datetime(["2020-03-06", "2020-03-08", "2020-10-30", "2020-11-01", "2020-11-02"])
+    # 02:30 is skipped on 2020-03-08 and moves to 03:00; 01:30 repeats on 2020-11-01 and is left out
+    calendar = TradingCalendar(days, cutoff="01:30")
+    assert list(calendar.days) == list(days.drop(pd.Timestamp("2020-11-01")))
+    assert "Warning:" in capsys.readouterr().out
+    skipped = TradingCalendar(days, cutoff="02:30")
+    # 03:00 EDT is 07:00 UTC
+    assert skipped.sessions(pd.Series(pd.to_datetime(["2020-03-08 06:59", "2020-03-08 07:00"]))).tolist() == [1, 2]
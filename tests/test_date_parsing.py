@@ -0,0 +1,63 @@
+import pandas as pd
+from src.date_parsing import NewsDateParser
+from src.date_alignment import TradingCalendar
+
+RAW = pd.Series([
+    "2020-06-05 10:30:54-04:00",  # offset: always the same instant
+    "2020-06-05 10:30:54",        # naive time
+    "2020-06-05",                 # date only
+    "06/05/2020 10:30",           # US format with time
+    None,
+])
+
+
+def test_naive_values_default_to_utc_without_tz():
+    parser = NewsDateParser()
+    parsed = parser.parse(RAW)
+    assert parsed.tolist()[:4] == [pd.Timestamp("2020-06-05 14:30:54"), pd.Timestamp("2020-06-05 10:30:54"),
+                                   pd.Timestamp("2020-06-05"), pd.Timestamp("2020-06-05 10:30")]
+    assert parsed.isna().tolist()[4]
+    assert parser.report["missing"] == 1 and parser.report["failed"] == 0
+
+
+def test_naive_values_are_read_in_tz_when_one_is_given():
+    parsed = NewsDateParser(tz="America/New_York").parse(RAW)
+    # Wall-clock values stay as written; the offset one is converted to New York time
+    assert parsed.tolist()[:4] == [pd.Timestamp("2020-06-05 10:30:54"), pd.Timestamp("2020-06-05 10:30:54"),
+                                   pd.Timestamp("2020-06-05"), pd.Timestamp("2020-06-05 10:30")]
+
+
+def test_date_only_values_keep_their_calendar_day_in_tz():
+    dates = pd.Series(["2020-06-05", "2020-06-08"])
+    parsed = NewsDateParser(tz="America/New_York").parse(dates)
+    assert parsed.dt.normalize().tolist() == [pd.Timestamp("2020-06-05"), pd.Timestamp("2020-06-08")]
+    assert (parsed == parsed.dt.normalize()).all()
+
+
+def test_explicit_naive_tz_overrides_tz():
+    parsed = NewsDateParser(tz="America/New_York", naive_tz="UTC").parse(pd.Series(["2020-06-05"]))
+    assert parsed.tolist() == [pd.Timestamp("2020-06-04 20:00")]
+
+
+def test_naive_datetime_input_is_read_in_tz():
+    dates = pd.Series(pd.to_datetime(["2020-06-05 09:00"]))
+    assert NewsDateParser(tz="America/New_York").parse(dates).tolist() == [pd.Timestamp("2020-06-05 09:00")]
+    assert NewsDateParser().parse(dates).tolist() == [pd.Timestamp("2020-06-05 09:00")]
+
+
+def test_dst_edges_in_tz_do_not_raise():
+    # 02:30 does not exist on 2020-03-08 in New York; 01:30 happens twice on 2020-11-01
+    raw = pd.Series(["2020-03-08 02:30:00", "2020-11-01 01:30:00", "03/08/2020 02:30", "Nov 1 2020 01:30"])
+    parser = NewsDateParser(tz="America/New_York")
+    parsed = parser.parse(raw)
+    assert parsed[0] == pd.Timestamp("2020-03-08 03:00") and parsed[2] == pd.Timestamp("2020-03-08 03:00")
+    assert parsed[[1, 3]].isna().all()
+    assert parser.report["failed"] == 2
+
+
+def test_dst_edges_reach_session_alignment_without_raising():
+    calendar = TradingCalendar(pd.to_datetime(["2020-03-06", "2020-03-09", "2020-10-30", "2020-11-02"]))
+    sessions = calendar.sessions(pd.Series(["2020-03-08 02:30:00", "2020-11-01 01:30:00"]),
+                                 news_tz="America/New_York")
+    # The skipped time lands in Monday's session; the repeated one cannot be placed
+    assert sessions.tolist() == [1, -1]
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+from src.event_study import EventStudy
+from src.price_panel import PricePanel
+
+DAYS = pd.bdate_range("2020-06-01", periods=5)
+CLOSES = np.array([
+    [100.0, 110.0, 121.0, 121.0, 133.1],  # AAPL returns: -, +10%, +10%, 0, +10%
+    [100.0, 100.0, 110.0, 99.0, 99.0],    # MSFT returns: -, 0, +10%, -10%, 0
+])
+NAN = np.nan
+
+
+def test_run_matches_hand_computed_abnormal_returns():
+    panel = PricePanel(["AAPL", "MSFT"], DAYS.asi8, ["Close"], CLOSES[:, :, None])
+    events = pd.DataFrame({
+        "stock": ["AAPL", "MSFT", "MSFT", "ZZZ", "AAPL"],
+        "date": pd.to_datetime(["2020-06-03 10:00", "2020-06-04 17:00", "2020-06-01 12:00",
+                                "2020-06-03 10:00", "2020-05-29 10:00"]),
+        "sentiment": [0.5, -0.3, 0.0, 0.2, 0.2],
+    })
+    results = EventStudy(panel, window=1).run(events, news_tz="America/New_York")
+
+    # Unknown ticker and news before the first session are dropped
+    assert results.index.tolist() == [0, 1, 2]
+    assert results["ticker"].tolist() == ["AAPL", "MSFT", "MSFT"]
+    # After-close news moves to the next session
+    assert results["Date"].tolist() == [DAYS[2], DAYS[4], DAYS[0]]
+    assert results["bucket"].tolist() == ["positive", "negative", "neutral"]
+
+    # Market = equal-weighted mean: -, 5%, 10%, -5%, 5%; AAPL AR: -, 5%, 0, 5%, 5%; MSFT AR: -, -5%, 0, -5%, -5%
+    expected = np.array([
+        # AR[-1], AR[+0], AR[+1], CAR_pre, CAR_post, CAR
+        [0.05, 0.0, 0.05, 0.05, 0.05, 0.10],
+        [-0.05, -0.05, NAN, -0.05, NAN, NAN],  # window runs past the last panel day
+        [NAN, NAN, -0.05, NAN, NAN, NAN],      # no return on the first day, nothing before it
+    ])
+    columns = ["AR[-1]", "AR[+0]", "AR[+1]", "CAR_pre", "CAR_post", "CAR"]
+    np.testing.assert_allclose(results[columns].to_numpy(), expected, atol=1e-12)
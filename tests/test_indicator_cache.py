@@ -0,0 +1,61 @@
+import os
+import time
+import pandas as pd
+from src.indicator_cache import IndicatorCache
+
+
+def frame():
+    return pd.DataFrame({"SMA_20": [1.0, 2.0, 3.0]})
+
+
+def write_prices(path, closes):
+    pd.DataFrame({"Close": closes}).to_csv(path, index=False)
+
+
+def test_hits_and_misses_are_counted(tmp_path):
+    prices = tmp_path / "AAPL_historical_data.csv"
+    write_prices(prices, [1.0, 2.0])
+    cache = IndicatorCache(str(tmp_path / "cache"))
+    calls = []
+    compute = lambda: calls.append(1) or frame()
+
+    first = cache.get_or_compute(str(prices), "sma", {"period": 20}, compute)
+    second = cache.get_or_compute(str(prices), "sma", {"period": 20}, compute)
+    cache.get_or_compute(str(prices), "sma", {"period": 50}, compute)
+    pd.testing.assert_frame_equal(first, second)
+    assert len(calls) == 2
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+
+def test_changing_the_source_file_invalidates_its_entries(tmp_path):
+    prices = tmp_path / "AAPL_historical_data.csv"
+    write_prices(prices, [1.0, 2.0])
+    cache = IndicatorCache(str(tmp_path / "cache"))
+    cache.put(str(prices), "sma", {"period": 20}, frame())
+    assert cache.get(str(prices), "sma", {"period": 20}) is not None
+
+    write_prices(prices, [1.0, 2.0, 3.0])
+    assert cache.get(str(prices), "sma", {"period": 20}) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entries_are_evicted_over_the_size_cap(tmp_path):
+    prices = tmp_path / "AAPL_historical_data.csv"
+    write_prices(prices, [1.0, 2.0])
+    cache = IndicatorCache(str(tmp_path / "cache"))
+    for period in (1, 2, 3):
+        cache.put(str(prices), "sma", {"period": period}, frame())
+    # Give the entries distinct ages: period 1 oldest, period 3 newest
+    now = time.time()
+    for age, period in ((30, 1), (20, 2), (10, 3)):
+        path = cache._path(cache.key(str(prices), "sma", {"period": period}))
+        os.utime(path, (now - age, now - age))
+    cache.max_bytes = cache.stats()["bytes"]
+
+    # Reading period 1 makes it the most recently used, so period 2 is the one evicted
+    assert cache.get(str(prices), "sma", {"period": 1}) is not None
+    cache.put(str(prices), "sma", {"period": 4}, frame())
+    kept = [p for p in (1, 2, 3, 4) if os.path.exists(cache._path(cache.key(str(prices), "sma", {"period": p})))]
+    assert kept == [1, 3, 4]
+    assert cache.stats()["bytes"] <= cache.max_bytes
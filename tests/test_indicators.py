@@ -0,0 +1,227 @@
+import numpy as np
+import pytest
+from src import indicators
+from src.price_panel import PricePanel
+from src.indicators import TA_EPSILON
+
+# Relative tolerance: the vectorized recurrences reorder a few floating-point operations
+TOL = 1e-9
+
+
+def _begin(x):
+    valid = np.flatnonzero(~np.isnan(x))
+    return valid[0] if len(valid) else len(x)
+
+
+def ref_sma(x, n):
+    out = np.full(len(x), np.nan)
+    b = _begin(x)
+    if b + n - 1 >= len(x):
+        return out
+    total = sum(x[b:b + n - 1])
+    trailing = b
+    for i in range(b + n - 1, len(x)):
+        total += x[i]
+        out[i] = total / n
+        total -= x[trailing]
+        trailing += 1
+    return out
+
+
+def _int_ema(x, start, n, k):
+    """TA_INT_EMA on x[0:], output from index max(start, n - 1)."""
+    out = np.full(len(x), np.nan)
+    start = max(start, n - 1)
+    if start >= len(x):
+        return out
+    today = start - (n - 1)
+    prev = sum(x[today:today + n]) / n
+    today += n
+    out[start] = prev
+    while today < len(x):
+        prev = ((x[today] - prev) * k) + prev
+        out[today] = prev
+        today += 1
+    return out
+
+
+def ref_ema(x, n):
+    b = _begin(x)
+    out = np.full(len(x), np.nan)
+    out[b:] = _int_ema(x[b:], n - 1, n, 2.0 / (n + 1))
+    return out
+
+
+def ref_rsi(x, n):
+    b = _begin(x)
+    out = np.full(len(x), np.nan)
+    x = x[b:]
+    if n >= len(x):
+        return out
+    prev_value, prev_gain, prev_loss = x[0], 0.0, 0.0
+    for today in range(1, n + 1):
+        change = x[today] - prev_value
+        prev_value = x[today]
+        if change < 0:
+            prev_loss -= change
+        else:
+            prev_gain += change
+    prev_gain /= n
+    prev_loss /= n
+
+    def value():
+        total = prev_gain + prev_loss
+        return 100.0 * (prev_gain / total) if not (-TA_EPSILON < total < TA_EPSILON) else 0.0
+
+    out[b + n] = value()
+    for today in range(n + 1, len(x)):
+        change = x[today] - prev_value
+        prev_value = x[today]
+        prev_loss *= n - 1
+        prev_gain *= n - 1
+        if change < 0:
+            prev_loss -= change
+        else:
+            prev_gain += change
+        prev_loss /= n
+        prev_gain /= n
+        out[b + today] = value()
+    return out
+
+
+def ref_macd(x, fast, slow, signal):
+    if slow < fast:
+        fast, slow = slow, fast
+    b = _begin(x)
+    out = [np.full(len(x), np.nan) for _ in range(3)]
+    x = x[b:]
+    start = slow - 1
+    slow_ema = _int_ema(x, start, slow, 2.0 / (slow + 1))
+    fast_ema = _int_ema(x, start, fast, 2.0 / (fast + 1))
+    line = fast_ema - slow_ema
+    signal_line = np.full(len(x), np.nan)
+    signal_line[start:] = _int_ema(line[start:], signal - 1, signal, 2.0 / (signal + 1))
+    first = start + signal - 1
+    out[0][b + first:] = line[first:]
+    out[1][b + first:] = signal_line[first:]
+    out[2][b + first:] = line[first:] - signal_line[first:]
+    return tuple(out)
+
+
+def random_walks(days, tickers, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(days, tickers)), axis=0))
+    # Staggered listing dates, one flat stretch (RSI 0/0) and one series too short for any output
+    for j, start in enumerate(rng.integers(0, days // 3, size=tickers)):
+        prices[:start, j] = np.nan
+    prices[days // 2:days // 2 + 30, 0] = prices[days // 2, 0]
+    prices[:-10, -1] = np.nan
+    return prices
+
+
+
+def assert_matches(actual, expected):
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    both = ~np.isnan(expected)
+    scale = np.maximum(np.abs(expected[both]), 1.0)
+    assert (np.abs(actual[both] - expected[both]) / scale).max(initial=0.0) <= TOL
+
+
+def columns(prices):
+    return [prices[:, j] for j in range(prices.shape[1])]
+
+
+@pytest.fixture(scope="module")
+def prices():
+    return random_walks(600, 12)
+
+
+# talib is not installed in every environment (requirements.txt only pins a
+# Windows wheel), so the numpy backend is checked against reference loops that
+# transcribe talib's C code; test_numpy_matches_talib compares with talib itself
+def expected(name, prices, *args):
+    loops = {"sma": ref_sma, "ema": ref_ema, "rsi": ref_rsi, "macd": ref_macd}
+    outputs = [loops[name](column, *args) for column in columns(prices)]
+    if isinstance(outputs[0], tuple):
+        return tuple(np.column_stack(parts) for parts in zip(*outputs))
+    return np.column_stack(outputs)
+
+
+@pytest.mark.skipif(indicators.talib is None, reason="talib is not installed")
+@pytest.mark.parametrize("name, args", [("sma", (20,)), ("ema", (12,)), ("rsi", (14,)), ("macd", (12, 26, 9))])
+def test_numpy_matches_talib(prices, name, args):
+    actual = getattr(indicators, name)(prices, *args, backend="numpy")
+    reference = getattr(indicators, name)(prices, *args, backend="talib")
+    if not isinstance(actual, tuple):
+        actual, reference = (actual,), (reference,)
+    for part, ref in zip(actual, reference):
+        assert_matches(part, ref)
+
+
+@pytest.mark.parametrize("period", [2, 20, 50])
+def test_sma(prices, period):
+    assert_matches(indicators.sma(prices, period, backend="numpy"), expected("sma", prices, period))
+
+
+@pytest.mark.parametrize("period", [2, 12, 30])
+def test_ema(prices, period):
+    assert_matches(indicators.ema(prices, period, backend="numpy"), expected("ema", prices, period))
+
+
+@pytest.mark.parametrize("period", [2, 14])
+def test_rsi(prices, period):
+    assert_matches(indicators.rsi(prices, period, backend="numpy"), expected("rsi", prices, period))
+
+
+@pytest.mark.parametrize("periods", [(12, 26, 9), (26, 12, 9), (3, 5, 2)])
+def test_macd(prices, periods):
+    actual = indicators.macd(prices, *periods, backend="numpy")
+    for part, reference in zip(actual, expected("macd", prices, *periods)):
+        assert_matches(part, reference)
+
+
+def test_leading_nans_are_skipped(prices):
+    # The staggered series start at different rows; each one's first SMA_20 lands 19 prices after its start
+    sma = indicators.sma(prices, 20, backend="numpy")
+    for column, values in zip(columns(prices), columns(sma)):
+        start = np.flatnonzero(~np.isnan(column))[0]
+        if start + 19 >= len(column):
+            assert np.isnan(values).all()
+            continue
+        assert np.isnan(values[:start + 19]).all() and not np.isnan(values[start + 19])
+
+
+@pytest.mark.parametrize("length", [0, 1, 13, 14, 15, 25])
+def test_short_series(length):
+    series = 100 + np.arange(length, dtype=float) % 7
+    outputs = indicators.compute_indicators(series, backend="numpy")
+    assert all(len(values) == length for values in outputs.values())
+    assert_matches(outputs["SMA_20"], ref_sma(series, 20))
+    assert_matches(outputs["RSI"], ref_rsi(series, 14))
+    for name, reference in zip(["MACD", "MACD_Signal", "MACD_Hist"], ref_macd(series, 12, 26, 9)):
+        assert_matches(outputs[name], reference)
+
+
+def test_single_series_keeps_its_shape(prices):
+    single = indicators.sma(prices[:, 0], 20, backend="numpy")
+    assert single.shape == (len(prices),)
+    assert_matches(single, indicators.sma(prices, 20, backend="numpy")[:, 0])
+
+
+def test_universe_indicators_skip_a_tickers_missing_bars():
+    prices = random_walks(200, 3, seed=1)
+    prices[:, 1] = 100 + np.cumsum(np.random.default_rng(2).normal(0, 1, 200))
+    prices[[60, 61, 120], 1] = np.nan
+    dates = np.arange(200, dtype=np.int64) * 86_400 * 10 ** 9
+    panel = PricePanel(["A", "B", "C"], dates, ["Close"], prices.T[:, :, None])
+    frame = indicators.universe_indicators(panel)
+
+    for j, ticker in enumerate(panel.tickers):
+        rows = frame[frame["ticker"] == ticker]
+        own_days = prices[~np.isnan(prices[:, j]), j]
+        np.testing.assert_array_equal(rows["Close"], own_days)
+        assert_matches(rows["RSI"].to_numpy(), ref_rsi(own_days, 14))
+        for name, reference in zip(["MACD", "MACD_Signal", "MACD_Hist"], ref_macd(own_days, 12, 26, 9)):
+            assert_matches(rows[name].to_numpy(), reference)
+    # The gapped ticker keeps producing values after its missing bars
+    assert not frame.loc[frame["ticker"] == "B", "RSI"].iloc[-50:].isna().any()
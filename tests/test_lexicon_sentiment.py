@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from textblob import TextBlob
+from src.lexicon_sentiment import LexiconSentimentEngine
+
+HEADLINES = [
+    # Plain polarity
+    "Apple Reports Great Quarter",
+    "Stocks fall on weak guidance",
+    "52-week high for U.S. stocks",
+    "",
+    # Negation
+    "Apple stock is not good",
+    "Not bad at all",
+    "NEVER a good sign for Tesla",
+    "It's really not terrible",
+    # Intensifiers and adverbs
+    "Apple stock is very good",
+    "Shares are extremely bad...",
+    "Apple stock is not very good!",
+    "Q3 earnings beat; outlook slightly disappointing",
+    # Punctuation, repetition, emoticons and quotes
+    "Great, great, GREAT results!!!",
+    "Never a dull moment :)",
+    "Stocks fall :-( on weak guidance",
+    "“Amazing” quarter? Hardly",
+    "Mr. Market is happy <3",
+    "Why AMZN Is Moving Lower Today (!)",
+    # Emoticons and (!) spread over whitespace tokens, which pattern joins
+    "Report: S Upgraded To Buy",
+    "Report: P Downgraded To Sell…",
+    "Update: D Beats Estimates",
+    "Report:S Upgraded",
+    "Apple : ) rises",
+    "Wow ( ! ) stocks",
+]
+
+FILLER = ["stocks", "shares", "Apple", "Q3", "52-week", "U.S.", "Mr.", "a", "is", "the", "on", "to",
+          "it's", "don't", "isn't", "(!)", ":)", ":-(", "<3", "...", "!", "?", ",", "\"", "“quote”",
+          ":", "S", "P", "D", "(", ")"]
+NEGATIONS = ["not", "no", "never", "Not", "NEVER"]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return LexiconSentimentEngine()
+
+
+def textblob_scores(texts):
+    return np.array([tuple(TextBlob(t).sentiment) for t in texts]).reshape(len(texts), 2)
+
+
+def random_headlines(n, engine, seed=0):
+    """Lexicon words, adverbs, negations and punctuation mixed so every pattern rule is exercised."""
+    rng = np.random.default_rng(seed)
+    lexicon_words = [w for w in dict.keys(engine.lexicon) if " " not in w]
+    adverbs = [w for w in lexicon_words if "RB" in engine.lexicon[w]]
+    pools = [lexicon_words, adverbs, NEGATIONS, FILLER]
+    headlines = []
+    for length in rng.integers(1, 16, n):
+        pool_ids = rng.choice(len(pools), size=length, p=[0.35, 0.2, 0.1, 0.35])
+        words = [pools[k][rng.integers(len(pools[k]))] for k in pool_ids]
+        words = [w.capitalize() if rng.random() < 0.2 else w for w in words]
+        headlines.append(" ".join(w + rng.choice(["", "", "", ",", "!", ".", "?"]) for w in words))
+    return headlines
+
+
+@pytest.mark.parametrize("headline", HEADLINES)
+def test_matches_textblob_exactly(engine, headline):
+    np.testing.assert_array_equal(engine.score([headline]), textblob_scores([headline]))
+
+
+def test_matches_textblob_on_random_headlines(engine):
+    texts = random_headlines(2_000, engine)
+    np.testing.assert_array_equal(engine.score(texts), textblob_scores(texts))
+
+
+def test_batch_scores_match_one_by_one(engine):
+    batch = engine.score(HEADLINES)
+    single = np.vstack([engine.score([h]) for h in HEADLINES])
+    np.testing.assert_array_equal(batch, single)
+
+
+def test_split_cache_is_bounded(engine, monkeypatch):
+    monkeypatch.setattr("src.lexicon_sentiment.SPLIT_CACHE_SIZE", 10)
+    engine.score([f"token{i}..." for i in range(50)])
+    assert len(engine._split_cache) <= 10
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.news_loader import load_news
+from src.news_dataset import read_news
+
+
+@pytest.fixture
+def news_file(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 400
+    dates = (pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 120 * 24, n), unit="h"))
+    dates = pd.Series(dates.strftime("%Y-%m-%d %H:%M:%S"))
+    dates[::25] = "not a date"
+    path = tmp_path / "news.csv"
+    pd.DataFrame({"headline": [f"headline {i}" for i in range(n)], "date": dates,
+                  "stock": rng.choice(["AAPL", "MSFT", "TSLA", "A", "NVDA"], n)}).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize("tickers, start, end", [
+    (["AAPL"], None, None),
+    ("MSFT", None, None),
+    (["A", "TSLA", "ZZZ"], None, None),
+    (None, "2020-02-10", "2020-03-15"),
+    (None, "2020-03-01 12:00", None),
+    (None, None, "2020-01-20"),
+    (["NVDA"], "2020-01-15", "2020-04-01"),
+])
+def test_pushdown_matches_filtering_the_full_frame(news_file, tickers, start, end):
+    full = load_news(news_file)
+    mask = pd.Series(True, index=full.index)
+    if tickers is not None:
+        mask &= full["stock"].isin([tickers] if isinstance(tickers, str) else tickers)
+    # A date bound drops rows whose date did not parse
+    if start is not None:
+        mask &= full["date"] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= full["date"] < pd.Timestamp(end)
+    expected = full[mask].reset_index(drop=True)
+    pd.testing.assert_frame_equal(read_news(news_file, tickers=tickers, start=start, end=end), expected)
+
+
+def test_rows_with_unparsed_dates_are_kept_without_date_bounds(news_file):
+    df = read_news(news_file, tickers=["AAPL", "MSFT", "TSLA", "A", "NVDA"], columns=["headline", "date"])
+    assert df["date"].isna().sum() == 16
+    assert df["headline"].tolist() == [f"headline {i}" for i in range(400)]
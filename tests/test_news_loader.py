@@ -0,0 +1,61 @@
+import os
+import pandas as pd
+import src.news_loader as news_loader
+from src.news_loader import date_report, load_news
+from src.news_dataset import read_news
+
+NY = "America/New_York"
+
+
+def write_news(path, dates):
+    pd.DataFrame({"headline": [f"headline {i}" for i in range(len(dates))], "date": dates,
+                  "stock": "AAPL"}).to_csv(path, index=False)
+
+
+def test_tz_reads_naive_dates_as_wall_clock_and_converts_offset_ones(tmp_path):
+    path = tmp_path / "news.csv"
+    write_news(path, ["2020-06-05 00:00:00", "2020-06-05 04:00:00+00:00", "2020-06-05"])
+    expected = [pd.Timestamp("2020-06-05 00:00")] * 3
+
+    first = load_news(str(path), tz=NY)    # parses the CSV and writes the cache
+    cached = load_news(str(path), tz=NY)   # reads the cache
+    assert first["date"].tolist() == expected and cached["date"].tolist() == expected
+    assert list(cached.columns) == ["headline", "date", "stock"]
+    # Without a tz naive dates stay UTC
+    assert load_news(str(path))["date"].tolist() == [pd.Timestamp("2020-06-05 00:00"),
+                                                     pd.Timestamp("2020-06-05 04:00"),
+                                                     pd.Timestamp("2020-06-05 00:00")]
+
+
+def test_read_news_filters_naive_dates_on_their_instant_in_tz(tmp_path):
+    path = tmp_path / "news.csv"
+    write_news(path, ["2020-06-04 21:00:00", "2020-06-05 01:00:00+00:00", "2020-06-05 09:00:00"])
+    # 21:00 New York is 01:00 UTC the next day; the offset row is 21:00 New York the day before
+    df = read_news(str(path), start="2020-06-05", end="2020-06-06", tz=NY)
+    assert df["headline"].tolist() == ["headline 0", "headline 1", "headline 2"]
+    assert df["date"].tolist() == [pd.Timestamp("2020-06-04 21:00"), pd.Timestamp("2020-06-04 21:00"),
+                                   pd.Timestamp("2020-06-05 09:00")]
+    assert read_news(str(path), start="2020-06-05 02:00", tz=NY, columns=["headline"]).columns.tolist() == ["headline"]
+    assert len(read_news(str(path), start="2020-06-05 02:00", tz=NY)) == 1
+
+
+def test_cache_is_reused_until_the_csv_changes(tmp_path, monkeypatch):
+    path = tmp_path / "news.csv"
+    write_news(path, ["2020-06-05 10:00:00", "2020-06-08 10:00:00"])
+    parses = []
+    parse = news_loader.parse_news_csv
+    monkeypatch.setattr(news_loader, "parse_news_csv", lambda *a, **k: parses.append(1) or parse(*a, **k))
+
+    load_news(str(path))
+    assert load_news(str(path))["headline"].tolist() == ["headline 0", "headline 1"]
+    assert len(parses) == 1
+
+    # Touched but unchanged: the content hash keeps the cache
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+    load_news(str(path))
+    assert len(parses) == 1
+
+    write_news(path, ["2020-06-05 10:00:00", "2020-06-08 10:00:00", "2020-06-09 10:00:00"])
+    assert len(load_news(str(path))) == 3
+    assert len(parses) == 2
+    assert date_report(str(path))["formats"] == {"%Y-%m-%d %H:%M:%S": 3}
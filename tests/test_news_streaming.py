@@ -0,0 +1,28 @@
+import pandas as pd
+import src.sentiment_store as sentiment_store
+from src.news_streaming import stream_daily_sentiment
+
+NEWS = pd.DataFrame({
+    "headline": ["Apple reports great quarter", "Stocks fall on weak guidance", "Shares are extremely bad",
+                 "Tesla is not good", "Amazon beats estimates", "A quiet day"],
+    "date": ["2020-06-04 10:00:00", "2020-06-04 11:00:00", "2020-06-05 09:00:00",
+             "2020-06-05 12:00:00", "2020-06-08 10:00:00", "2020-06-08 15:00:00"],
+    "stock": ["AAPL", "AAPL", "TSLA", "TSLA", "AMZN", "AMZN"],
+})
+
+
+def test_streaming_matches_whole_file_and_skips_the_store(tmp_path, monkeypatch):
+    path = tmp_path / "news.csv"
+    NEWS.to_csv(path, index=False)
+    # Any use of a default store would land here
+    monkeypatch.setattr(sentiment_store, "DEFAULT_STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setattr(sentiment_store, "_default_stores", {})
+
+    chunked = stream_daily_sentiment(str(path), chunksize=2, engine="lexicon").daily()
+    whole = stream_daily_sentiment(str(path), chunksize=len(NEWS), engine="lexicon").daily()
+    pd.testing.assert_frame_equal(chunked, whole)
+    assert chunked["count"].tolist() == [2, 2, 2]
+    assert not (tmp_path / "store").exists() and not sentiment_store._default_stores
+
+    stream_daily_sentiment(str(path), chunksize=2, engine="lexicon", use_store=True)
+    assert (tmp_path / "store").exists()
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+from src.lexicon_sentiment import lexicon_scores
+from src.parallel_sentiment import parallel_scores
+from src.sentiment_store import textblob_scores
+
+WORDS = "stocks rise fall strong weak beat miss great bad good very not slightly record high".split()
+
+
+def headlines(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [" ".join(rng.choice(WORDS, size=k)) for k in rng.integers(1, 12, n)]
+
+
+@pytest.mark.parametrize("scorer", [textblob_scores, lexicon_scores])
+def test_parallel_scores_equal_serial_scores_in_order(scorer):
+    texts = headlines(1_000)
+    serial = scorer(texts)
+    parallel = parallel_scores(texts, scorer, n_jobs=2, chunk_size=97, min_parallel=0, progress=False)
+    np.testing.assert_array_equal(parallel, serial)
+
+
+def test_empty_input_is_scored_without_a_pool():
+    scores = parallel_scores([], textblob_scores, n_jobs=2, min_parallel=0, progress=False)
+    assert scores.shape == (0, 2)
@@ -0,0 +1,57 @@
+import numpy as np
+import src.pipeline as pipeline_module
+from src.indicators import sma
+from src.pipeline import Pipeline, package_modules
+
+calls = []
+
+
+def numbers(n):
+    calls.append("numbers")
+    return np.arange(n, dtype=float)
+
+
+def smoothed(numbers):
+    calls.append("smoothed")
+    return sma(numbers, timeperiod=3)
+
+
+def build(cache_dir, n=10):
+    pipeline = Pipeline(cache_dir=str(cache_dir), max_workers=2)
+    pipeline.add("numbers", numbers, params={"n": n})
+    pipeline.add("smoothed", smoothed, deps=["numbers"])
+    return pipeline
+
+
+def test_second_run_is_served_from_cache(tmp_path):
+    calls.clear()
+    first = build(tmp_path).run(["smoothed"])["smoothed"]
+    pipeline = build(tmp_path)
+    second = pipeline.run(["smoothed"])["smoothed"]
+    np.testing.assert_array_equal(first, second)
+    assert calls == ["numbers", "smoothed"]
+    assert {info["status"] for info in pipeline.report.values()} == {"cached"}
+
+
+def test_param_change_reruns_the_stage_and_its_dependents(tmp_path):
+    build(tmp_path).run()
+    calls.clear()
+    build(tmp_path, n=12).run()
+    assert calls == ["numbers", "smoothed"]
+
+
+def test_stages_track_the_package_code_they_call():
+    assert "src.indicators" in [module.__name__ for module in package_modules(smoothed)]
+    assert package_modules(numbers) == []
+
+
+def test_editing_called_package_code_invalidates_the_stage(tmp_path, monkeypatch):
+    build(tmp_path).run()
+    digest = pipeline_module._file_digest
+    monkeypatch.setattr(pipeline_module, "_file_digest",
+                        lambda path: "edited" if path.endswith("indicators.py") else digest(path))
+    calls.clear()
+    pipeline = build(tmp_path)
+    pipeline.run()
+    assert calls == ["smoothed"]
+    assert pipeline.report["numbers"]["status"] == "cached"
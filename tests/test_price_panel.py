@@ -0,0 +1,44 @@
+import os
+import numpy as np
+import pandas as pd
+from src.price_panel import load_price_panel
+
+
+def write_prices(path, closes, start="2020-01-02"):
+    dates = pd.bdate_range(start, periods=len(closes))
+    pd.DataFrame({"Date": dates.strftime("%Y-%m-%d"), "Close": closes}).to_csv(path, index=False)
+
+
+def generations(cache_dir):
+    prices_dir = os.path.join(cache_dir, "prices")
+    return [entry for panel in os.listdir(prices_dir) for entry in os.listdir(os.path.join(prices_dir, panel))
+            if entry.startswith("gen-")]
+
+
+def test_panel_is_packed_once_and_mapped_on_later_calls(tmp_path):
+    path = tmp_path / "AAPL_historical_data.csv"
+    write_prices(path, [1.0, 2.0, 3.0])
+    first = load_price_panel([str(path)], cache_dir=str(tmp_path / "cache"))
+    second = load_price_panel([str(path)], cache_dir=str(tmp_path / "cache"))
+    assert isinstance(second.values, np.memmap)
+    np.testing.assert_array_equal(first.field("Close"), [[1.0, 2.0, 3.0]])
+    assert len(generations(str(tmp_path / "cache"))) == 1
+
+
+def test_repack_while_the_old_panel_is_mapped_writes_a_new_generation(tmp_path):
+    path = tmp_path / "AAPL_historical_data.csv"
+    cache_dir = str(tmp_path / "cache")
+    write_prices(path, [1.0, 2.0, 3.0])
+    old = load_price_panel([str(path)], cache_dir=cache_dir)
+
+    write_prices(path, [4.0, 5.0, 6.0, 7.0])
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1))
+    new = load_price_panel([str(path)], cache_dir=cache_dir)
+
+    # The mapped arrays the old panel reads were not overwritten in place
+    np.testing.assert_array_equal(old.field("Close"), [[1.0, 2.0, 3.0]])
+    np.testing.assert_array_equal(new.field("Close"), [[4.0, 5.0, 6.0, 7.0]])
+    assert len(generations(cache_dir)) <= 2
+    del old, new
+    load_price_panel([str(path)], cache_dir=cache_dir, refresh=True)
+    assert len(generations(cache_dir)) == 1
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from collections import Counter
+from sklearn.feature_extraction.text import CountVectorizer
+from src.publisher_analysis import PublisherAnalyzer
+from src.synthetic_data import synthetic_news
+
+
+def reference_profiles(data, top_n):
+    """Per-publisher term counts with a Counter; ties in vocabulary (alphabetical) order."""
+    analyzer = CountVectorizer(stop_words="english").build_analyzer()
+    out = {}
+    for publisher, group in data.dropna(subset=["publisher", "headline"]).groupby("publisher"):
+        counts = Counter(w for h in group["headline"] for w in analyzer(h))
+        out[publisher] = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top_n]
+    return out
+
+
+def test_count_profiles_match_a_per_publisher_count():
+    data = synthetic_news(1_500, n_publishers=20, seed=4)[["publisher", "headline"]]
+    data.loc[data.index[::50], "publisher"] = np.nan
+    # A cap above the synthetic vocabulary size, so every term is counted
+    profiles = PublisherAnalyzer(data).keyword_profiles(top_n=5, max_features=100_000)
+
+    expected = reference_profiles(data, 5)
+    assert set(profiles["publisher"]) == set(expected)
+    for publisher, rows in profiles.groupby("publisher"):
+        assert rows["rank"].tolist() == list(range(1, len(rows) + 1))
+        assert list(zip(rows["keyword"], rows["score"])) == expected[publisher]
+
+
+def test_tfidf_down_weights_terms_every_publisher_uses():
+    data = pd.DataFrame({
+        "publisher": ["A", "A", "A", "B", "B", "C"],
+        "headline": ["stocks merger", "stocks merger", "stocks", "stocks dividend", "stocks", "stocks lawsuit"],
+    })
+    analyzer = PublisherAnalyzer(data)
+    counts = analyzer.keyword_profiles(top_n=1).set_index("publisher")["keyword"]
+    tfidf = analyzer.keyword_profiles(top_n=1, weighting="tfidf").set_index("publisher")["keyword"]
+    assert counts.to_dict() == {"A": "stocks", "B": "stocks", "C": "lawsuit"}
+    # A uses "stocks" 3 times and "merger" twice; B uses "stocks" twice and "dividend" once
+    assert tfidf.to_dict() == {"A": "merger", "B": "stocks", "C": "lawsuit"}
+
+
+def test_compare_publisher_content_lists_keywords_per_publisher():
+    data = pd.DataFrame({"publisher": ["A", "B", "A"], "headline": ["great merger", "weak outlook", "merger talks"]})
+    result = PublisherAnalyzer(data).compare_publisher_content(top_n=2)
+    assert result.to_dict("list") == {"publisher": ["A", "B"], "Top Keywords": [["merger", "great"],
+                                                                                ["outlook", "weak"]]}
+
+
+def test_unknown_weighting_is_rejected():
+    with pytest.raises(ValueError):
+        PublisherAnalyzer(pd.DataFrame({"publisher": ["A"], "headline": ["x"]})).keyword_profiles(weighting="bm25")
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+from src.sentiment_store import SentimentStore, textblob_scores
+
+
+class CountingScorer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return textblob_scores(texts)
+
+
+def test_only_unseen_headlines_are_scored(tmp_path):
+    scorer = CountingScorer()
+    store = SentimentStore(str(tmp_path), scorer=scorer, version="test")
+    first = store.score(["Great quarter", "Weak  guidance", "Great quarter"])
+    # Duplicates and whitespace variants are scored once
+    assert len(scorer.calls) == 1 and sorted(scorer.calls[0]) == ["Great quarter", "Weak guidance"]
+    np.testing.assert_array_equal(first.to_numpy(), textblob_scores(["Great quarter", "Weak guidance",
+                                                                     "Great quarter"]))
+
+    second = store.score(pd.Series(["Weak guidance", "Strong demand"], index=[10, 11]))
+    assert scorer.calls[1:] == [["Strong demand"]]
+    assert second.index.tolist() == [10, 11]
+
+    # A new store over the same directory reads the scores back instead of recomputing them
+    reopened_scorer = CountingScorer()
+    reopened = SentimentStore(str(tmp_path), scorer=reopened_scorer, version="test")
+    pd.testing.assert_frame_equal(reopened.score(["Great quarter", "Strong demand"]),
+                                  store.score(["Great quarter", "Strong demand"]))
+    assert reopened_scorer.calls == [] and len(reopened) == 3
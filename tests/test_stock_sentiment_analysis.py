@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+import src.sentiment_store as sentiment_store
+from src.synthetic_data import write_dataset
+from src.stock_sentiment_analysis import StockSentimentAnalyzer, _combine_sums, _pearson_from_sums, _pearson_sums
+
+DAYS = pd.bdate_range("2020-06-01", periods=10)
+HEADLINES = ["Apple reports great quarter", "Stocks fall on weak guidance", "Shares are extremely bad",
+             "Tesla is not good", "Amazon beats estimates", "Great results again", "Weak demand hurts sales",
+             "Strong growth ahead", "Terrible outlook for retail", "Good news for investors"]
+
+
+def corr_frame(n, seed, offset=0.0):
+    rng = np.random.default_rng(seed)
+    x = offset + rng.normal(0, 1e-3, n)
+    return pd.DataFrame({"ticker": rng.choice(["AAPL", "MSFT"], n), "daily_return": x,
+                         "sentiment_score": x - offset + rng.normal(0, 1e-3, n)})
+
+
+def expected_r(df):
+    return {t: np.corrcoef(g["daily_return"], g["sentiment_score"])[0, 1] for t, g in df.groupby("ticker")}
+
+
+@pytest.mark.parametrize("offset", [0.0, 1e3])
+def test_pearson_sums_merge_and_remove_exactly(offset):
+    whole = corr_frame(400, seed=0, offset=offset)
+    first, second = whole.iloc[:250], whole.iloc[250:]
+    merged = _combine_sums(_pearson_sums(first), _pearson_sums(second))
+    removed = _combine_sums(_pearson_sums(whole), _pearson_sums(second), sign=-1)
+    for sums, df in ((merged, whole), (removed, first)):
+        r = _pearson_from_sums(sums)
+        for ticker, value in expected_r(df).items():
+            assert r[ticker] == pytest.approx(value, rel=1e-9)
+
+
+def write_inputs(tmp_path):
+    rng = np.random.default_rng(0)
+    stock_file = tmp_path / "AAPL_historical_data.csv"
+    pd.DataFrame({"Date": DAYS.strftime("%Y-%m-%d"),
+                  "Close": 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(DAYS))))}).to_csv(stock_file, index=False)
+    news_file = tmp_path / "raw_analyst_ratings.csv"
+    news = pd.DataFrame({"headline": HEADLINES, "date": [f"{d:%Y-%m-%d} 10:00:00" for d in DAYS],
+                         "stock": "AAPL"})
+    news.to_csv(news_file, index=False)
+    return [str(stock_file)], str(news_file), news
+
+
+def build(tmp_path, stock_files, news_file, engine="lexicon"):
+    return StockSentimentAnalyzer(stock_files, news_file, engine=engine, chunksize=4,
+                                  state_path=str(tmp_path / "state" / "daily.parquet"))
+
+
+def test_state_is_reused_only_for_the_same_news_file_and_engine(tmp_path, capsys):
+    stock_files, news_file, news = write_inputs(tmp_path)
+    first = build(tmp_path, stock_files, news_file)
+    assert first.news_state.meta["engine"] == "lexicon"
+
+    build(tmp_path, stock_files, news_file)
+    assert "Warning" not in capsys.readouterr().out
+
+    build(tmp_path, stock_files, news_file, engine="textblob")
+    assert "another news file or engine" in capsys.readouterr().out
+
+    news.iloc[:5].to_csv(news_file, index=False)
+    rebuilt = build(tmp_path, stock_files, news_file, engine="textblob")
+    assert "another news file or engine" in capsys.readouterr().out
+    assert rebuilt.sentiment_df["Date"].nunique() == 5
+
+
+def test_reingesting_a_delta_does_not_double_count(tmp_path):
+    stock_files, news_file, news = write_inputs(tmp_path)
+    analyzer = build(tmp_path, stock_files, news_file)
+    delta = pd.DataFrame({"headline": ["Great news", "Great news"], "publisher": ["Wire A", "Wire B"],
+                          "date": [f"{DAYS[2]:%Y-%m-%d} 11:00:00"] * 2, "stock": ["AAPL", "AAPL"]})
+    updated, merged = analyzer.add_headlines(delta)
+    # Syndicated copies from two publishers are two rows
+    assert analyzer.news_state.frame["count"].sum() == len(news) + 2
+    counts = analyzer.news_state.frame["count"].copy()
+
+    again, merged_again = analyzer.add_headlines(delta)
+    pd.testing.assert_series_equal(analyzer.news_state.frame["count"], counts)
+    pd.testing.assert_frame_equal(merged_again, merged)
+    assert again == pytest.approx(updated)
+    assert updated == pytest.approx(StockSentimentAnalyzer.merge_and_correlate(analyzer)[0])
+
+    # The delta keys survive a reload
+    reloaded = build(tmp_path, stock_files, news_file)
+    reloaded.add_headlines(delta)
+    pd.testing.assert_series_equal(reloaded.news_state.frame["count"], counts)
+
+
+def test_streaming_daily_means_equal_the_in_memory_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(sentiment_store, "DEFAULT_STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setattr(sentiment_store, "_default_stores", {})
+    news_file, stock_files = write_dataset(str(tmp_path / "data"), n_rows=3_000, n_days=60, duplicate_rate=0.1)
+    news = pd.read_csv(news_file)
+    # Same headline on the same day for the same stock, from another publisher and as date-only rows
+    assert news.duplicated(["headline", "stock"]).any()
+
+    in_memory = StockSentimentAnalyzer(stock_files, news_file, engine="lexicon").sentiment_df
+    streamed = StockSentimentAnalyzer(stock_files, news_file, engine="lexicon", chunksize=500).sentiment_df
+    pd.testing.assert_frame_equal(streamed.reset_index(drop=True), in_memory.reset_index(drop=True),
+                                  check_exact=False, rtol=1e-12)
+
+
+def test_plotting_leaves_the_merged_table_for_later_deltas(tmp_path):
+    stock_files, news_file, _ = write_inputs(tmp_path)
+    analyzer = build(tmp_path, stock_files, news_file)
+    analyzer.plot_results(path=str(tmp_path / "results.png"))
+    delta = pd.DataFrame({"headline": ["Terrible, awful quarter"], "date": [f"{DAYS[3]:%Y-%m-%d} 11:00:00"],
+                          "stock": ["AAPL"]})
+    correlations, merged = analyzer.add_headlines(delta)
+    expected_correlations, expected_merged = StockSentimentAnalyzer.merge_and_correlate(analyzer)
+    pd.testing.assert_frame_equal(merged, expected_merged)
+    assert correlations == pytest.approx(expected_correlations)
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.indicators import compute_indicators
+from src.indicator_state import IndicatorSet
+from src.technical_indicators import TechnicalIndicatorAnalyzer, analyze_files
+
+INDICATORS = ["SMA_20", "SMA_50", "RSI", "MACD", "MACD_Signal", "MACD_Hist"]
+
+
+def random_walk(days, seed, leading_nans=0):
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    prices[:leading_nans] = np.nan
+    return prices
+
+
+def assert_close(actual, expected):
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    both = ~np.isnan(expected)
+    np.testing.assert_allclose(actual[both], expected[both], rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("days, seed_bars, leading_nans", [
+    (300, 0, 0),
+    (300, 120, 0),
+    (300, 299, 0),
+    (300, 30, 40),
+    (300, 150, 100),
+    (40, 10, 0),
+])
+def test_streaming_matches_batch_after_a_save_and_load(tmp_path, days, seed_bars, leading_nans):
+    prices = random_walk(days, seed=seed_bars, leading_nans=leading_nans)
+    expected = compute_indicators(prices)
+    indicator_set, rows = IndicatorSet.from_history(prices[:seed_bars])
+
+    # Round-trip through disk, as if the process restarted between bars
+    path = str(tmp_path / "state.json")
+    indicator_set.save(path)
+    indicator_set = IndicatorSet.load(path)
+    rows += [indicator_set.update(p) for p in prices[seed_bars:]]
+
+    for name, values in expected.items():
+        assert_close(np.array([row[name] for row in rows]), values)
+
+
+def write_prices(path, prices, dates):
+    pd.DataFrame({"Date": dates.strftime("%Y-%m-%d"), "Open": prices, "Close": prices,
+                  "Volume": 1_000}).to_csv(path, index=False)
+
+
+def test_append_bar_matches_a_full_recompute(tmp_path):
+    prices = random_walk(200, seed=1)
+    dates = pd.bdate_range("2020-01-01", periods=len(prices))
+    path = tmp_path / "AAPL_historical_data.csv"
+    write_prices(path, prices[:150], dates[:150])
+
+    analyzer = TechnicalIndicatorAnalyzer(str(path), use_cache=False)
+    for date, price in zip(dates[150:], prices[150:]):
+        row = analyzer.append_bar({"Date": date, "Open": price, "Close": price, "Volume": 1_000})
+        assert row.name == date and row["Close"] == price
+    assert analyzer.appended_bars == 50
+
+    df = analyzer.df
+    assert len(df) == len(prices) and df.index[-1] == dates[-1]
+    expected = compute_indicators(prices)
+    for name in INDICATORS:
+        assert_close(df[name].to_numpy()[150:], expected[name][150:])
+
+    # A full recompute over the appended frame gives the same columns
+    recomputed = analyzer.get_indicated_data()
+    for name in INDICATORS:
+        assert_close(recomputed[name].to_numpy(), expected[name])
+
+
+def test_load_state_resumes_appends(tmp_path):
+    prices = random_walk(120, seed=2)
+    dates = pd.bdate_range("2021-01-01", periods=len(prices))
+    path = tmp_path / "MSFT_historical_data.csv"
+    write_prices(path, prices[:100], dates[:100])
+    state_path = str(tmp_path / "state.json")
+    TechnicalIndicatorAnalyzer(str(path), use_cache=False).save_state(state_path)
+
+    analyzer = TechnicalIndicatorAnalyzer(str(path), use_cache=False)
+    assert analyzer.load_state(state_path) is not None
+    rows = [analyzer.append_bar({"Date": d, "Close": p}) for d, p in zip(dates[100:], prices[100:])]
+    expected = compute_indicators(prices)
+    for name in INDICATORS:
+        assert_close(np.array([row[name] for row in rows]), expected[name][100:])
+
+    # A state saved at an earlier bar is ignored
+    write_prices(path, prices, dates)
+    assert TechnicalIndicatorAnalyzer(str(path), use_cache=False).load_state(state_path) is None
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_analyze_files_matches_the_per_file_analyzer(tmp_path, n_jobs):
+    dates = pd.bdate_range("2020-01-01", periods=120)
+    paths = []
+    for k, symbol in enumerate(["AAPL", "MSFT"]):
+        paths.append(str(tmp_path / f"{symbol}_historical_data.csv"))
+        # MSFT starts later, so the panel has days it did not trade
+        write_prices(paths[-1], random_walk(120 - 30 * k, seed=k), dates[30 * k:])
+
+    results, failures = analyze_files(paths, n_jobs=n_jobs, sma_periods=(5, 20))
+    assert not failures and list(results) == ["AAPL", "MSFT"]
+    for path, (symbol, df) in zip(paths, results.items()):
+        expected = TechnicalIndicatorAnalyzer(path, use_cache=False, sma_periods=(5, 20)).get_indicated_data()
+        pd.testing.assert_index_equal(df.index, expected.index)
+        for name in ["Close", "SMA_5", "SMA_20", "RSI", "MACD", "MACD_Signal", "MACD_Hist"]:
+            assert_close(df[name].to_numpy(), expected[name].to_numpy())
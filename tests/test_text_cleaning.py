@@ -0,0 +1,11 @@
+import re
+import pandas as pd
+from src.text_cleaning import clean_headlines
+
+
+def test_clean_headlines_matches_the_per_row_regex():
+    texts = pd.Series(["Apple's Q3: EPS $1.25 beats!", "TSLA  up 5% — Élan", None, 42, "  mixed\tCase  "])
+    expected = [re.sub(r"[^a-z\s]", "", str(t).lower()) for t in texts]
+    cleaned = clean_headlines(texts)
+    assert cleaned.tolist() == expected
+    assert cleaned.index.equals(texts.index)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from src.topic_model import OnlineTopicModel, build_vocabulary, series_chunks
+from src.synthetic_data import synthetic_news
+from src.text_cleaning import clean_headlines
+
+
+@pytest.fixture(scope="module")
+def headlines():
+    return synthetic_news(2_000, seed=3)["headline"]
+
+
+def fit(headlines, **options):
+    return OnlineTopicModel(n_topics=4, batch_size=256, **options).fit_stream(series_chunks(headlines, 500))
+
+
+@pytest.mark.parametrize("use_vocabulary", [False, True])
+def test_same_seed_and_chunks_give_the_same_topics(headlines, use_vocabulary):
+    vocabulary = build_vocabulary(series_chunks(headlines, 500), min_df=5) if use_vocabulary else None
+    first, second = fit(headlines, vocabulary=vocabulary), fit(headlines, vocabulary=vocabulary)
+    np.testing.assert_array_equal(first.lda.components_, second.lda.components_)
+    assert first.topics() == second.topics()
+    np.testing.assert_array_equal(first.assign(headlines[:50]), second.assign(headlines[:50]))
+
+
+def test_topic_shapes(headlines):
+    vocabulary = build_vocabulary(series_chunks(headlines, 500), min_df=5)
+    model = fit(headlines, vocabulary=vocabulary)
+    assert model.n_documents == len(headlines)
+    assert model.lda.components_.shape == (4, len(vocabulary))
+
+    topics = model.topics(n_words=6)
+    assert [number for number, _ in topics] == [1, 2, 3, 4]
+    assert all(len(words) == 6 and set(words) <= set(vocabulary) for _, words in topics)
+
+    weights = model.transform(headlines[:20])
+    assert weights.shape == (20, 4)
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+    assert set(model.assign(headlines[:20])) <= {1, 2, 3, 4}
+
+
+def test_hashed_topics_only_show_words_seen_in_the_corpus(headlines):
+    model = fit(headlines)
+    analyzer = model.vectorizer.build_analyzer()
+    seen = {word for text in clean_headlines(headlines) for word in analyzer(text)}
+    for _, words in model.topics(n_words=8):
+        assert words and set(words) <= seen